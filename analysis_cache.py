@@ -0,0 +1,283 @@
+"""
+AI 분석 결과 캐시 모듈
+Gemini 분석 결과(섹션별 파싱 결과)를 SQLite에 저장하고 동일 요청의 중복 호출을 방지
+(같은 프로세스는 진행 중인 계산을 공유하고, 워커 간에는 shared_cache의 임대 잠금 사용)
+"""
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from metrics import record_cache
+from shared_cache import CacheBackend, default_cache_backend
+
+# 조회 시각(LRU 순서) 갱신 간격(초), 적중할 때마다 쓰지 않도록 이보다 오래된 경우만 갱신
+ACCESS_TOUCH_SECONDS = 300
+
+
+class AnalysisCache:
+    """TTL, 크기 제한(LRU), 단일 실행(single-flight)을 지원하는 영구 분석 캐시"""
+
+    def __init__(self,
+                 db_path: str = "analysis_cache.db",
+                 ttl_seconds: int = 7 * 24 * 3600,
+                 max_entries: int = 5000,
+                 coordinator: Optional[CacheBackend] = None):
+        """
+        분석 캐시 초기화
+
+        Args:
+            db_path: SQLite 데이터베이스 파일 경로
+            ttl_seconds: 캐시 유효시간(초)
+            max_entries: 최대 보관 항목 수 (초과시 가장 오래 조회되지 않은 항목부터 삭제)
+            coordinator: 워커 간 단일 실행 잠금을 제공하는 저장소 (없으면 프로세스 기본 저장소)
+        """
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.coordinator = coordinator if coordinator is not None else default_cache_backend()
+
+        # 진행 중인 계산 (키 -> Future), 같은 키의 동시 요청은 하나의 계산 결과를 공유
+        self._in_flight: Dict[str, Future] = {}
+        self._in_flight_tasks: Dict[str, asyncio.Task] = {}
+        self._lock = threading.Lock()
+
+        self.init_database()
+
+    def init_database(self):
+        """캐시 테이블 초기화 (여러 워커가 함께 쓰므로 WAL 모드)"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS analysis_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    result TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            ''')
+
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_analysis_accessed_at
+                ON analysis_cache(accessed_at)
+            ''')
+
+            conn.commit()
+
+    @staticmethod
+    def make_key(model_name: str,
+                 prompt_version: int,
+                 company_name: str,
+                 metrics: Dict[str, Any],
+                 extra: Any = None) -> str:
+        """
+        캐시 키 생성 (모델명, 프롬프트 버전, 회사, 재무지표의 해시)
+
+        Args:
+            model_name: 모델 이름
+            prompt_version: 프롬프트 템플릿 버전
+            company_name: 회사명
+            metrics: 재무지표
+            extra: 프롬프트에 영향을 주는 추가 입력 (다년도 데이터 등)
+
+        Returns:
+            SHA-256 해시 문자열
+        """
+        raw = json.dumps(
+            [model_name, prompt_version, company_name, metrics, extra],
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str
+        )
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        캐시 조회
+
+        Args:
+            key: 캐시 키
+
+        Returns:
+            저장된 분석 결과 또는 None (없거나 만료된 경우)
+        """
+        result = self._lookup(key)
+        record_cache("analysis", result is not None)
+        return result
+
+    def _lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT result, created_at, accessed_at FROM analysis_cache
+                WHERE cache_key = ?
+            ''', (key,))
+
+            row = cursor.fetchone()
+            if not row:
+                return None
+
+            if now - row[1] > self.ttl_seconds:
+                cursor.execute("DELETE FROM analysis_cache WHERE cache_key = ?", (key,))
+                conn.commit()
+                return None
+
+            if now - row[2] > ACCESS_TOUCH_SECONDS:
+                cursor.execute('''
+                    UPDATE analysis_cache SET accessed_at = ?
+                    WHERE cache_key = ?
+                ''', (now, key))
+                conn.commit()
+
+            return json.loads(row[0])
+
+    def set(self, key: str, result: Dict[str, Any]):
+        """
+        분석 결과 저장 후 최대 항목 수를 넘으면 오래된 항목 삭제
+
+        Args:
+            key: 캐시 키
+            result: 섹션별로 파싱된 분석 결과
+        """
+        now = time.time()
+
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT OR REPLACE INTO analysis_cache
+                (cache_key, result, created_at, accessed_at)
+                VALUES (?, ?, ?, ?)
+            ''', (key, json.dumps(result, ensure_ascii=False), now, now))
+
+            cursor.execute('''
+                DELETE FROM analysis_cache
+                WHERE cache_key IN (
+                    SELECT cache_key FROM analysis_cache
+                    ORDER BY accessed_at DESC
+                    LIMIT -1 OFFSET ?
+                )
+            ''', (self.max_entries,))
+
+            conn.commit()
+
+    def get_or_compute(self, key: str, compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        캐시에 있으면 반환하고, 없으면 계산 후 저장
+        같은 키로 동시에 들어온 요청은 하나의 계산만 수행하고 결과를 공유 (single-flight, 다른 워커 포함)
+
+        Args:
+            key: 캐시 키
+            compute: 결과 계산 함수 (예외 발생시 캐시하지 않음)
+
+        Returns:
+            분석 결과
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            future = self._in_flight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._in_flight[key] = future
+
+        if not is_leader:
+            return future.result()
+
+        def compute_and_store() -> Dict[str, Any]:
+            computed = compute()
+            self.set(key, computed)
+            return computed
+
+        try:
+            result = self.coordinator.single_flight(
+                "analysis:" + key, lambda: self._lookup(key), compute_and_store,
+                lease_seconds=120, wait_seconds=120
+            )
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    async def get_or_compute_async(self,
+                                   key: str,
+                                   compute: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        get_or_compute의 비동기 버전 (SQLite 조회/저장은 스레드에서 실행)
+        같은 이벤트 루프에서 같은 키로 들어온 요청은 하나의 작업 결과를 기다리고,
+        다른 워커가 같은 키를 계산 중이면 그 결과가 저장되기를 기다림
+
+        Args:
+            key: 캐시 키
+            compute: 결과를 계산하는 코루틴 함수 (예외 발생시 캐시하지 않음)
+
+        Returns:
+            분석 결과
+        """
+        cached = await asyncio.to_thread(self.get, key)
+        if cached is not None:
+            return cached
+
+        task = self._in_flight_tasks.get(key)
+        if task is None:
+            async def compute_and_store():
+                result = await compute()
+                await asyncio.to_thread(self.set, key, result)
+                return result
+
+            task = asyncio.ensure_future(self.coordinator.single_flight_async(
+                "analysis:" + key, lambda: self._lookup(key), compute_and_store
+            ))
+            self._in_flight_tasks[key] = task
+            task.add_done_callback(lambda _: self._in_flight_tasks.pop(key, None))
+
+        # 한 요청이 취소되어도 같은 작업을 기다리는 다른 요청에는 영향이 없도록 shield
+        return await asyncio.shield(task)
+
+    async def claim_async(self, key: str, wait_seconds: float = 120.0) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        스트리밍 생성용 단일 실행 (get_or_compute_async와 같은 워커 간 임대 잠금 사용)
+        결과를 조금씩 내보내며 계산하는 쪽이 잠금을 잡고, 나머지는 결과가 저장되기를 기다림
+
+        Args:
+            key: 캐시 키
+            wait_seconds: 다른 쪽 계산을 기다리는 최대 시간(초), 지나면 직접 계산
+
+        Returns:
+            (저장된 결과, None) 또는 (None, 임대 토큰). 토큰을 받으면 계산 후 set_async로 저장하고
+            release_claim으로 반납 (토큰이 None이면 기다리다 시간이 지나 잠금 없이 계산)
+        """
+        cached = await asyncio.to_thread(self.get, key)
+        if cached is not None:
+            return cached, None
+        return await self.coordinator.lead_or_wait_async(
+            "analysis:" + key, lambda: self._lookup(key), lease_seconds=120, wait_seconds=wait_seconds
+        )
+
+    async def set_async(self, key: str, result: Dict[str, Any]):
+        """set을 스레드에서 실행 (오래된 항목 삭제까지 이벤트 루프 밖에서)"""
+        await asyncio.to_thread(self.set, key, result)
+
+    async def release_claim(self, key: str, token: Optional[str]):
+        """claim_async로 얻은 임대 잠금 반납"""
+        if token is not None:
+            await self.coordinator.release_lease_async("analysis:" + key, token)
+
+    def clear(self):
+        """캐시 전체 삭제"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("DELETE FROM analysis_cache")
+            conn.commit()
@@ -2,30 +2,252 @@
 재무제표 시각화 웹 애플리케이션
 FastAPI + Plotly를 사용한 대화형 재무제표 시각화
 """
-from fastapi import FastAPI, Request, HTTPException, Form
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import FastAPI, Request, HTTPException
+from fastapi.responses import HTMLResponse, ORJSONResponse, PlainTextResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.utils import PlotlyJSONEncoder
-import json
-from datetime import datetime
+from fastapi.concurrency import run_in_threadpool
+from contextlib import asynccontextmanager
+import asyncio
+import logging
+import orjson
+import os
+import threading
+import time
 from typing import Optional, List, Dict
 
 from dart_api import DartAPI
-from database import CompanyDatabase, Company
+from dart_cache import start_stale_tracking, stale_data_age
+from database import CompanyDatabase, Company, ARTIFACT_PATH
 from financial_analyzer import FinancialAnalyzer
+from financial_series import MAX_SERIES_YEARS, SERIES_FREQUENCIES, build_series
+from peer_comparison import MAX_PEER_COMPANIES, MAX_PEER_YEARS, PEER_CHART_METRICS, PEER_METRICS, metric_by_year, peer_matrix
+from chart_cache import ChartPayloadCache, etag_matches
+from search_cache import SearchResultCache, SearchSequencer
+from metrics import registry as metrics_registry, start_request_timings, server_timing_header
+from logging_utils import configure_logging, get_logger
+from glossary import COMMON_TERMS, GLOSSARY_TERMS, TermGlossary
+from industry import IndustryStore, compare_to_sector, describe_sector_comparison
+from static_pages import STATIC_PAGES_DIR, PAGE_CACHE_CONTROL, ImmutableStaticFiles, StaticPageStore
+from static_assets import ASSET_CACHE_CONTROL, STATIC_CACHE_CONTROL, StaticAssets, precompressed_response
+from compression import CompressionMiddleware
+import chart_specs
+
+# 로깅 설정 (LOG_LEVEL, LOG_SAMPLE_RATE 환경변수)
+configure_logging()
+logger = get_logger("app")
+
+# 이 시간(초)을 넘긴 요청은 단계별 소요 시간과 함께 경고 로그 출력
+SLOW_REQUEST_SECONDS = float(os.getenv("SLOW_REQUEST_SECONDS", "2.0"))
+
+HTTP_REQUEST_DURATION = metrics_registry.histogram(
+    "http_request_duration_seconds",
+    "API별 요청 처리 시간",
+    labelnames=("endpoint", "status")
+)
+
+
+def open_company_database() -> CompanyDatabase:
+    """빌드된 읽기 전용 회사 DB가 있으면 사용하고, 없으면 기존 쓰기 가능 DB 사용"""
+    if os.path.exists(ARTIFACT_PATH):
+        try:
+            company_db = CompanyDatabase(ARTIFACT_PATH, read_only=True)
+            logger.info("📦 빌드된 회사 DB 사용 (읽기 전용): %s", ARTIFACT_PATH)
+            return company_db
+        except Exception as e:
+            logger.warning("⚠️ 빌드된 회사 DB를 열 수 없어 기본 DB를 사용합니다: %s", e)
+    return CompanyDatabase()
+
+
+class AppServices:
+    """
+    DART API, 회사 DB, AI 분석기 지연 초기화
+    처음 사용할 때 생성하고 실패하면 None을 보관 (시작 시간에 영향 없음)
+    """
+    
+    def __init__(self):
+        self._instances = {}
+        self._lock = threading.Lock()
+        
+        # 회사 데이터 준비 상태 (loading / loaded / missing / failed)
+        self.company_data_status = "loading"
+        self.company_data_ready = threading.Event()
+    
+    def _get(self, name: str, factory):
+        if name not in self._instances:
+            with self._lock:
+                if name not in self._instances:
+                    try:
+                        self._instances[name] = factory()
+                        logger.info("✅ %s 초기화 완료", name)
+                    except Exception as e:
+                        logger.warning("⚠️ %s 초기화 실패: %s", name, e)
+                        self._instances[name] = None
+        return self._instances[name]
+    
+    @property
+    def dart_api(self) -> Optional[DartAPI]:
+        return self._get("dart_api", DartAPI)
+    
+    @property
+    def company_db(self) -> Optional[CompanyDatabase]:
+        return self._get("company_db", open_company_database)
+    
+    @property
+    def industry_store(self) -> Optional[IndustryStore]:
+        """기업개황과 업종 통계 (industry.py enrich/aggregate로 채움)"""
+        return self._get("industry_store", IndustryStore)
+    
+    @property
+    def static_pages(self) -> Optional[StaticPageStore]:
+        """미리 렌더링한 회사 페이지 (static_pages.py build/refresh로 생성)"""
+        return self._get("static_pages", StaticPageStore)
+    
+    @property
+    def glossary(self) -> Optional[TermGlossary]:
+        """재무용어 사전 (AI 분석기 없이도 저장된 설명 제공)"""
+        return self._get("glossary", TermGlossary)
+    
+    @property
+    def ai_analyzer(self) -> Optional[FinancialAnalyzer]:
+        """AI 분석기 (선택기능, google.generativeai는 이때 import)"""
+        return self._get("ai_analyzer", FinancialAnalyzer)
+
+    def override(self, name: str, instance):
+        """서비스 인스턴스 교체 (벤치마크에서 스텁 모델을 쓰는 분석기 등을 주입)"""
+        with self._lock:
+            self._instances[name] = instance
+
+    def load_company_data(self, json_path: str = "corpCodes.json"):
+        """데이터베이스가 비어있으면 JSON에서 로드 (백그라운드 스레드에서 실행)"""
+        try:
+            company_db = self.company_db
+            if company_db is None:
+                self.company_data_status = "failed"
+            elif company_db.read_only or company_db.get_company_count() > 0:
+                self.company_data_status = "loaded"
+            else:
+                logger.info("📂 데이터베이스가 비어있어 JSON에서 로드합니다...")
+                company_db.load_from_json(json_path)
+                logger.info("✅ 회사 데이터 로드 완료")
+                self.company_data_status = "loaded"
+        except FileNotFoundError:
+            logger.warning("❌ %s 파일을 찾을 수 없습니다.", json_path)
+            self.company_data_status = "missing"
+        except Exception as e:
+            logger.warning("❌ 데이터 로드 실패: %s", e)
+            self.company_data_status = "failed"
+        finally:
+            self.company_data_ready.set()
+
+
+# 전역 서비스 (지연 초기화)
+services = AppServices()
+
 
-# FastAPI 앱 생성 (lifespan 적용은 나중에)
-app = FastAPI(title="재무제표 시각화", description="DART API를 활용한 재무제표 시각화 웹앱")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """시작시 회사 데이터 로드만 백그라운드로 시작하고 바로 요청을 받음"""
+    threading.Thread(target=services.load_company_data, name="company-data-loader", daemon=True).start()
+    yield
+
+
+# FastAPI 앱 생성
+# 기본 응답 클래스로 orjson 사용 (NumPy 값도 바로 직렬화)
+app = FastAPI(
+    title="재무제표 시각화",
+    description="DART API를 활용한 재무제표 시각화 웹앱",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
+
+# 경로별 기본 Cache-Control (응답이 직접 정하지 않은 경우, 앞에서부터 처음 일치하는 접두어)
+# 차트 API는 차트 응답 캐시가, 스트리밍/정적 페이지/해시 주소는 각 응답이 직접 지정
+CACHE_CONTROL_POLICIES = (
+    ("/static/", STATIC_CACHE_CONTROL),
+    ("/api/search_companies", "private, max-age=60"),
+    ("/api/ai_analysis", "private, no-cache"),
+    ("/api/financial_terms", "public, max-age=86400"),
+    ("/api/", "public, max-age=300"),
+    ("/healthz", "no-store"),
+    ("/readyz", "no-store"),
+    ("/metrics", "no-store"),
+)
+# HTML 페이지 등 나머지는 매번 재검증
+DEFAULT_CACHE_CONTROL = "no-cache"
+
+def cache_control_for(path: str, status_code: int, stale: bool) -> str:
+    """응답 종류별 기본 Cache-Control (오류는 저장하지 않고, 지난 데이터는 매번 재검증)"""
+    if status_code >= 400:
+        return "no-store"
+    if stale:
+        return "no-cache"
+    for prefix, policy in CACHE_CONTROL_POLICIES:
+        if path.startswith(prefix):
+            return policy
+    return DEFAULT_CACHE_CONTROL
+
+# 응답 압축 (gzip, brotli 패키지가 있으면 br)
+# 아래 요청 시간 측정 미들웨어보다 안쪽에서 실행되므로 압축 시간도 요청 시간에 포함
+app.add_middleware(CompressionMiddleware)
+
+@app.middleware("http")
+async def record_request_timings(request: Request, call_next):
+    """
+    요청별 단계 소요 시간 집계
+    Server-Timing 헤더로 브라우저에 전달하고, 느린 요청은 단계별 내역을 로그로 남김
+    DART 장애 등으로 지난 데이터로 응답했으면 X-Data-Stale/X-Data-Age/Warning 헤더 추가
+    """
+    timings = start_request_timings()
+    stale = start_stale_tracking()
+    started = time.perf_counter()
+    
+    response = await call_next(request)
+    
+    total = time.perf_counter() - started
+    endpoint = request.scope.get("endpoint")
+    # 마운트된 앱(StaticFiles 등)은 함수가 아니므로 클래스 이름 사용
+    endpoint_name = getattr(endpoint, "__name__", type(endpoint).__name__) if endpoint else "unmatched"
+    HTTP_REQUEST_DURATION.observe(total, endpoint=endpoint_name, status=str(response.status_code))
+    
+    response.headers["Server-Timing"] = server_timing_header(timings, total)
+    if stale:
+        response.headers["X-Data-Stale"] = "true"
+        response.headers["X-Data-Age"] = str(int(stale["age"]))
+        response.headers["Warning"] = '110 - "Response is Stale"'
+    response.headers.setdefault("Cache-Control", cache_control_for(request.url.path, response.status_code, bool(stale)))
+    if total >= SLOW_REQUEST_SECONDS:
+        logger.warning("🐢 느린 요청 %s %.0fms: %s", request.url.path, total * 1000,
+                       ", ".join(f"{stage}={elapsed * 1000:.0f}ms" for stage, elapsed in timings.items()))
+    
+    return response
 
 # 정적 파일 및 템플릿 설정
-import os
 if os.path.exists("static"):
     app.mount("/static", StaticFiles(directory="static"), name="static")
+# 내용 해시가 붙은 정적 회사 페이지 (프록시/CDN이 오래 캐시할 수 있는 주소, /company 응답의 Content-Location)
+# 앱 시작 후에 생성한 페이지도 재시작 없이 제공하도록 디렉토리가 없으면 만들어 두고 마운트
+try:
+    os.makedirs(STATIC_PAGES_DIR, exist_ok=True)
+except OSError as e:
+    logger.warning("⚠️ 정적 페이지 디렉토리를 만들 수 없습니다: %s", e)
+app.mount("/pages", ImmutableStaticFiles(directory=STATIC_PAGES_DIR, check_dir=False), name="pages")
 templates = Jinja2Templates(directory="templates")
 
+# 정적 파일 내용 해시 (템플릿에서 {{ static_url('js/app.js') }}로 해시 주소 생성)
+static_assets = StaticAssets("static")
+templates.env.globals["static_url"] = static_assets.url
+
+# 차트 응답 캐시 (완성된 차트 JSON을 바이트로 보관, ETag/304 지원)
+chart_cache = ChartPayloadCache()
+
+# 회사 검색 결과 캐시 (접두어 후보 재사용)와 자동완성 요청 순번 추적
+search_cache = SearchResultCache()
+search_sequencer = SearchSequencer()
+
+# 회사 검색 API 최대 결과 수
+SEARCH_RESULT_LIMIT = 20
+
 # 안전한 숫자 변환 함수
 def safe_convert(value, default=0):
     try:
@@ -33,41 +255,45 @@ def safe_convert(value, default=0):
     except (ValueError, TypeError):
         return default
 
-# 전역 객체 초기화
-try:
-    dart_api = DartAPI()
-    company_db = CompanyDatabase()
-    
-    # 데이터베이스가 비어있으면 JSON에서 로드
-    if company_db.get_company_count() == 0:
-        print("📂 데이터베이스가 비어있어 JSON에서 로드합니다...")
-        try:
-            company_db.load_from_json("corpCodes.json")
-            print("✅ 회사 데이터 로드 완료")
-        except FileNotFoundError:
-            print("❌ corpCodes.json 파일을 찾을 수 없습니다.")
-        except Exception as e:
-            print(f"❌ 데이터 로드 실패: {e}")
-    
-    print("✅ API 및 데이터베이스 초기화 완료")
-    
-    # AI 분석기 초기화 (선택사항)
-    try:
-        ai_analyzer = FinancialAnalyzer()
-        print("✅ AI 분석기 초기화 완료")
-    except Exception as e:
-        print(f"⚠️ AI 분석기 초기화 실패 (선택기능): {e}")
-        ai_analyzer = None
-        
-except Exception as e:
-    print(f"❌ 초기화 실패: {e}")
-    dart_api = None
-    company_db = None
-    ai_analyzer = None
+# 재무용어 설명 API에서 한 번에 요청할 수 있는 최대 용어 수
+MAX_GLOSSARY_TERMS = 30
+
+# 차트 응답 형식: full(Plotly figure 전체) / compact(숫자 시리즈 + 템플릿 ID)
+CHART_RESPONSE_FORMATS = ("full", "compact")
+
+def check_chart_format(format: str):
+    """차트 응답 형식 검증"""
+    if format not in CHART_RESPONSE_FORMATS:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 응답 형식입니다: {format} (full/compact)")
+
+def cached_chart_response(request: Request, cache_key, payload: Dict) -> Response:
+    """
+    차트 응답을 캐시에 저장하고 반환
+    유효시간이 지난 DART 데이터로 만든 응답은 캐시하지 않고 stale 표시만 붙여 반환
+    (DART가 복구되어 갱신되면 다음 요청부터 최신 데이터로 응답)
+    """
+    if stale_data_age() is not None:
+        return ORJSONResponse(dict(payload, stale=True))
+    return chart_cache.to_response(request, chart_cache.set(cache_key, payload))
+
+@app.get("/healthz")
+async def liveness():
+    """생존 확인 (프로세스가 요청을 처리할 수 있으면 항상 200)"""
+    return {"status": "ok"}
+
+@app.get("/readyz")
+async def readiness():
+    """준비 상태 확인 (회사 데이터 로드가 끝나야 200)"""
+    ready = services.company_data_status == "loaded"
+    return ORJSONResponse(
+        {"status": "ready" if ready else "not_ready", "company_data": services.company_data_status},
+        status_code=200 if ready else 503
+    )
 
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
     """메인 페이지"""
+    company_db = services.company_db
     # 인기 회사 목록 가져오기
     popular_companies = company_db.get_popular_companies(20) if company_db else []
     
@@ -77,32 +303,51 @@ async def home(request: Request):
     })
 
 @app.get("/api/search_companies")
-async def search_companies(q: str):
-    """회사 검색 API"""
+async def search_companies(q: str, client: Optional[str] = None, seq: Optional[int] = None):
+    """
+    회사 검색 API
+    client(브라우저별 ID)와 seq(입력 순번)를 보내면 같은 클라이언트의 더 새로운 검색이
+    이미 도착한 요청은 검색하지 않고 204로 응답
+    """
+    company_db = services.company_db
     if not company_db:
         raise HTTPException(status_code=500, detail="데이터베이스가 초기화되지 않았습니다")
     
     if len(q) < 1:
         return {"companies": []}
     
+    sequenced = client is not None and seq is not None
+    if sequenced and not search_sequencer.begin(client, seq):
+        return Response(status_code=204)
+    
     try:
-        companies = company_db.search_companies(q, limit=20)
-        return {
-            "companies": [
-                {
-                    "corp_code": company.corp_code,
-                    "corp_name": company.corp_name,
-                    "stock_code": company.stock_code
-                }
-                for company in companies
-            ]
-        }
+        companies = await run_in_threadpool(
+            search_cache.search, q, SEARCH_RESULT_LIMIT, company_db.search_companies, company_db.data_version
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"검색 실패: {str(e)}")
+    
+    if sequenced and not search_sequencer.is_current(client, seq):
+        return Response(status_code=204)
+    
+    result = {
+        "companies": [
+            {
+                "corp_code": company.corp_code,
+                "corp_name": company.corp_name,
+                "stock_code": company.stock_code
+            }
+            for company in companies
+        ]
+    }
+    if seq is not None:
+        result["seq"] = seq
+    return result
 
 @app.get("/api/company/{corp_code}")
 async def get_company_info(corp_code: str):
     """회사 정보 조회 API"""
+    company_db = services.company_db
     if not company_db:
         raise HTTPException(status_code=500, detail="데이터베이스가 초기화되지 않았습니다")
     
@@ -110,11 +355,16 @@ async def get_company_info(corp_code: str):
     if not company:
         raise HTTPException(status_code=404, detail="회사를 찾을 수 없습니다")
     
+    # 기업개황을 수집한 회사는 법인구분/업종코드 등을 함께 반환
+    industry_store = services.industry_store
+    overview = industry_store.get_overview(corp_code) if industry_store else None
+    
     return {
         "corp_code": company.corp_code,
         "corp_name": company.corp_name,
         "stock_code": company.stock_code,
-        "modify_date": company.modify_date
+        "modify_date": company.modify_date,
+        "overview": {key: value for key, value in overview.items() if key != "corp_code"} if overview else None
     }
 
 @app.get("/api/financial/{corp_code}")
@@ -124,12 +374,13 @@ async def get_financial_data(
     report_type: str = "11011"
 ):
     """재무제표 데이터 조회 API"""
+    dart_api = services.dart_api
     if not dart_api:
         raise HTTPException(status_code=500, detail="DART API가 초기화되지 않았습니다")
     
     try:
-        # 재무제표 데이터 조회
-        result = dart_api.get_financial_statements(corp_code, str(year), report_type)
+        # 재무제표 데이터 조회 (DART 응답을 기다리는 동안 이벤트 루프를 막지 않도록 스레드에서 실행)
+        result = await run_in_threadpool(dart_api.get_financial_statements, corp_code, str(year), report_type)
         
         if result['status'] != '000':
             raise HTTPException(status_code=400, detail=f"데이터 조회 실패: {result['message']}")
@@ -145,38 +396,42 @@ async def get_financial_data(
             "data": parsed_data,
             "metrics": key_metrics,
             "year": year,
-            "report_type": report_type
+            "report_type": report_type,
+            "stale": stale_data_age() is not None
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"재무데이터 조회 실패: {str(e)}")
 
 @app.get("/api/financial_chart/{corp_code}")
 async def get_financial_chart(
+    request: Request,
     corp_code: str,
     start_year: int = 2020,
     end_year: int = 2023,
     chart_type: str = "revenue"
 ):
     """재무제표 차트 데이터 생성 API"""
+    dart_api = services.dart_api
     if not dart_api:
         raise HTTPException(status_code=500, detail="DART API가 초기화되지 않았습니다")
     
+    cache_key = ("financial_chart", corp_code, start_year, end_year, chart_type)
+    cached = chart_cache.get(cache_key)
+    if cached:
+        return chart_cache.to_response(request, cached)
+    
     try:
         # 여러 연도 데이터 조회
-        multi_year_data = dart_api.get_multiple_year_financials(
-            corp_code, start_year, end_year, '11011'
+        multi_year_data = await run_in_threadpool(
+            dart_api.get_multiple_year_financials, corp_code, start_year, end_year, '11011'
         )
         
-        # 디버깅: 실제 응답 데이터 확인
-        print(f"🔍 디버깅 - corp_code: {corp_code}, 연도: {start_year}-{end_year}")
-        print(f"🔍 multi_year_data keys: {list(multi_year_data.keys())}")
-        
-        for year, data in multi_year_data.items():
-            print(f"🔍 {year}년 데이터 길이: {len(data) if data else 0}")
-            if data and len(data) > 0:
-                print(f"🔍 {year}년 첫 번째 항목: {data[0]}")
-                break
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("🔍 %s %s-%s년 항목 수: %s", corp_code, start_year, end_year,
+                         {year: len(data) for year, data in multi_year_data.items()})
         
         # 연도별 지표 추출
         years = []
@@ -185,14 +440,8 @@ async def get_financial_chart(
         for year, data in multi_year_data.items():
             if data:  # 데이터가 있는 경우만
                 try:
-                    print(f"🔍 {year}년 데이터 파싱 시작...")
                     parsed = dart_api.parse_financial_data(data)
-                    print(f"🔍 {year}년 파싱 완료. parsed keys: {list(parsed.keys())}")
-                    
                     metrics = dart_api.get_key_financial_metrics(parsed)
-                    print(f"🔍 {year}년 지표 계산 완료. metrics: {list(metrics.keys())}")
-                    
-
                     
                     years.append(int(year))
                     
@@ -209,21 +458,10 @@ async def get_financial_chart(
                         value = 0
                     
                     values.append(round(value, 2))  # 소수점 2자리로 반올림
-                    # chart_type에 따른 실제 metrics 키 매핑
-                    metric_key_map = {
-                        'revenue': 'revenue',
-                        'profit': 'net_income', 
-                        'assets': 'total_assets',
-                        'equity': 'total_equity'
-                    }
-                    actual_key = metric_key_map.get(chart_type, 'revenue')
-                    print(f"🔍 {year}년 {chart_type} 값: {value} (metrics[{actual_key}]: {metrics.get(actual_key, 0)})")
+                    logger.debug("🔍 %s %s년 %s 값: %s억원", corp_code, year, chart_type, value)
                     
                 except Exception as e:
-                    print(f"❌ {year}년 데이터 처리 오류: {e}")
-                    print(f"❌ 에러 타입: {type(e).__name__}")
-                    import traceback
-                    print(f"❌ 상세 에러: {traceback.format_exc()}")
+                    logger.warning("❌ %s %s년 데이터 처리 오류: %s", corp_code, year, e, exc_info=True)
                     # 에러가 발생해도 연도는 추가하되 값은 0으로
                     years.append(int(year))
                     values.append(0)
@@ -238,29 +476,48 @@ async def get_financial_chart(
             }
         
         # 차트 생성
-        print(f"🔍 차트 생성 시작 - years: {years}, values: {values}, chart_type: {chart_type}")
         try:
-            fig = create_financial_chart(years, values, chart_type)
-            print(f"🔍 차트 생성 성공!")
-        except Exception as chart_error:
-            print(f"❌ 차트 생성 실패: {chart_error}")
-            import traceback
-            print(f"❌ 차트 생성 상세 에러: {traceback.format_exc()}")
-            raise chart_error
+            chart = chart_specs.financial_chart_spec(years, values, chart_type)
+        except Exception:
+            logger.exception("❌ %s %s 차트 생성 실패", corp_code, chart_type)
+            raise
         
-        return {
-            "chart": json.loads(fig.to_json()),
+        return cached_chart_response(request, cache_key, {
+            "chart": chart,
             "years": years,
             "values": values,
             "message": "성공"
-        }
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"차트 생성 실패: {str(e)}")
 
+@app.get("/assets/{asset_path:path}")
+async def get_static_asset(request: Request, asset_path: str):
+    """내용 해시가 붙은 정적 파일 (미리 압축한 파일 우선, 현재 해시면 immutable 캐시)"""
+    asset = static_assets.resolve(asset_path)
+    if asset is None:
+        raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다")
+    
+    path, digest, current = asset
+    headers = {"ETag": f'"{digest}"', "Cache-Control": ASSET_CACHE_CONTROL if current else STATIC_CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return precompressed_response(path, request.headers.get("accept-encoding", ""), headers)
+
 @app.get("/company/{corp_code}", response_class=HTMLResponse)
 async def company_detail(request: Request, corp_code: str):
-    """회사 상세 페이지"""
+    """회사 상세 페이지 (미리 렌더링한 정적 페이지가 있으면 파일 그대로 응답)"""
+    static_pages = services.static_pages
+    page = static_pages.lookup(corp_code) if static_pages else None
+    if page:
+        headers = {"ETag": page["etag"], "Cache-Control": PAGE_CACHE_CONTROL, "Content-Location": page["url"]}
+        if etag_matches(request.headers.get("if-none-match"), page["etag"]):
+            return Response(status_code=304, headers=headers)
+        return precompressed_response(page["path"], request.headers.get("accept-encoding", ""), headers,
+                                      media_type="text/html; charset=utf-8")
+    
+    company_db = services.company_db
     if not company_db:
         raise HTTPException(status_code=500, detail="데이터베이스가 초기화되지 않았습니다")
     
@@ -274,7 +531,8 @@ async def company_detail(request: Request, corp_code: str):
     })
 
 def create_financial_chart(years: List[int], values: List[float], chart_type: str):
-    """재무 차트 생성"""
+    """재무 차트 생성 (Plotly Figure 경로, API 응답은 chart_specs의 경량 경로 사용)"""
+    import plotly.graph_objects as go  # 참조/벤치마크용 경로에서만 사용하므로 지연 import
     
     # 입력 데이터 검증
     if not years or not values:
@@ -283,7 +541,7 @@ def create_financial_chart(years: List[int], values: List[float], chart_type: st
     if len(years) != len(values):
         raise ValueError(f"연도 개수({len(years)})와 값 개수({len(values)})가 일치하지 않습니다")
     
-    print(f"🔍 차트 생성 함수 - years: {years}, values: {values}, chart_type: {chart_type}")
+    logger.debug("🔍 차트 생성 함수 - years: %s, values: %s, chart_type: %s", years, values, chart_type)
     
     chart_configs = {
         "revenue": {"title": "매출액 추이", "color": "#2E86AB", "unit": "억원"},
@@ -293,13 +551,13 @@ def create_financial_chart(years: List[int], values: List[float], chart_type: st
     }
     
     config = chart_configs.get(chart_type, chart_configs["revenue"])
-    print(f"🔍 차트 설정: {config}")
+    logger.debug("🔍 차트 설정: %s", config)
     
     try:
         fig = go.Figure()
-        print(f"🔍 Figure 객체 생성 성공")
+        logger.debug("🔍 Figure 객체 생성 성공")
     except Exception as e:
-        print(f"❌ Figure 객체 생성 실패: {e}")
+        logger.warning("❌ Figure 객체 생성 실패: %s", e)
         raise
     
     # 선 그래프 추가
@@ -313,9 +571,9 @@ def create_financial_chart(years: List[int], values: List[float], chart_type: st
             marker=dict(size=8, color=config["color"]),
             hovertemplate=f'<b>%{{x}}년</b><br>{config["title"]}: %{{y:,.0f}}{config["unit"]}<extra></extra>'
         ))
-        print(f"🔍 Scatter trace 추가 성공")
+        logger.debug("🔍 Scatter trace 추가 성공")
     except Exception as e:
-        print(f"❌ Scatter trace 추가 실패: {e}")
+        logger.warning("❌ Scatter trace 추가 실패: %s", e)
         raise
     
     # 레이아웃 설정
@@ -336,25 +594,26 @@ def create_financial_chart(years: List[int], values: List[float], chart_type: st
             plot_bgcolor='rgba(0,0,0,0)',
             paper_bgcolor='rgba(0,0,0,0)'
         )
-        print(f"🔍 레이아웃 설정 성공")
+        logger.debug("🔍 레이아웃 설정 성공")
     except Exception as e:
-        print(f"❌ 레이아웃 설정 실패: {e}")
+        logger.warning("❌ 레이아웃 설정 실패: %s", e)
         raise
     
     # 축 스타일 설정
     try:
         fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='rgba(128,128,128,0.2)')
         fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='rgba(128,128,128,0.2)')
-        print(f"🔍 축 스타일 설정 성공")
+        logger.debug("🔍 축 스타일 설정 성공")
     except Exception as e:
-        print(f"❌ 축 스타일 설정 실패: {e}")
+        logger.warning("❌ 축 스타일 설정 실패: %s", e)
         raise
     
-    print(f"🔍 차트 생성 함수 완료!")
+    logger.debug("🔍 차트 생성 함수 완료!")
     return fig
 
 def create_financial_pie_chart(metrics: Dict[str, float], chart_type: str = "assets"):
     """재무 파이 차트 생성"""
+    import plotly.graph_objects as go  # 참조/벤치마크용 경로에서만 사용하므로 지연 import
     if chart_type == "assets":
         # 자산 구성 (자산 = 부채 + 자본)
         labels = ['부채', '자본']
@@ -390,14 +649,20 @@ def create_financial_pie_chart(metrics: Dict[str, float], chart_type: str = "ass
     return fig
 
 @app.get("/api/financial_pie/{corp_code}")
-async def get_financial_pie_chart(corp_code: str, year: int = 2023):
+async def get_financial_pie_chart(request: Request, corp_code: str, year: int = 2023):
     """재무 파이 차트 API"""
+    dart_api = services.dart_api
     if not dart_api:
         raise HTTPException(status_code=500, detail="DART API가 초기화되지 않았습니다")
     
+    cache_key = ("financial_pie", corp_code, year)
+    cached = chart_cache.get(cache_key)
+    if cached:
+        return chart_cache.to_response(request, cached)
+    
     try:
         # 재무제표 데이터 조회
-        result = dart_api.get_financial_statements(corp_code, str(year), '11011')
+        result = await run_in_threadpool(dart_api.get_financial_statements, corp_code, str(year), '11011')
         
         if result['status'] != '000':
             raise HTTPException(status_code=400, detail=f"데이터 조회 실패: {result['message']}")
@@ -411,19 +676,24 @@ async def get_financial_pie_chart(corp_code: str, year: int = 2023):
             metrics[key] = metrics[key] / 100000000
         
         # 파이 차트 생성
-        fig = create_financial_pie_chart(metrics, "assets")
+        chart = chart_specs.financial_pie_chart_spec(metrics)
         
-        return {
-            "chart": json.loads(fig.to_json()),
+        return cached_chart_response(request, cache_key, {
+            "chart": chart,
             "metrics": metrics
-        }
+        })
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"파이 차트 생성 실패: {str(e)}")
 
 @app.get("/api/ai_analysis/{corp_code}")
 async def get_ai_analysis(corp_code: str, year: int = 2023):
     """AI 재무분석 API"""
+    dart_api = services.dart_api
+    company_db = services.company_db
+    ai_analyzer = services.ai_analyzer
     if not ai_analyzer:
         raise HTTPException(status_code=503, detail="AI 분석 서비스를 사용할 수 없습니다. Gemini API 키를 확인해주세요.")
     
@@ -437,7 +707,7 @@ async def get_ai_analysis(corp_code: str, year: int = 2023):
             raise HTTPException(status_code=404, detail="회사를 찾을 수 없습니다.")
         
         # 재무데이터 조회
-        result = dart_api.get_financial_statements(corp_code, str(year), '11011')
+        result = await run_in_threadpool(dart_api.get_financial_statements, corp_code, str(year), '11011')
         if result['status'] != '000':
             raise HTTPException(status_code=400, detail=f"재무데이터 조회 실패: {result['message']}")
         
@@ -445,8 +715,8 @@ async def get_ai_analysis(corp_code: str, year: int = 2023):
         parsed_data = dart_api.parse_financial_data(result.get('list', []))
         metrics = dart_api.get_key_financial_metrics(parsed_data)
         
-        # AI 분석 실행
-        analysis_result = ai_analyzer.analyze_financial_data(
+        # AI 분석 실행 (비동기, 제한시간 초과시 기본 분석)
+        analysis_result = await ai_analyzer.analyze_financial_data_async(
             company_name=company.corp_name,
             financial_metrics=metrics
         )
@@ -456,13 +726,7 @@ async def get_ai_analysis(corp_code: str, year: int = 2023):
             "company_name": company.corp_name,
             "analysis_year": year,
             "analysis": analysis_result,
-            "metrics": {
-                "revenue_billions": round(metrics['revenue'] / 100000000, 1),
-                "profit_billions": round(metrics['net_income'] / 100000000, 1),
-                "assets_billions": round(metrics['total_assets'] / 100000000, 1),
-                "operating_margin": round(metrics['operating_margin'], 1),
-                "roe": round(metrics['roe'], 1)
-            }
+            "metrics": summarize_analysis_metrics(metrics)
         }
         
     except HTTPException:
@@ -470,31 +734,122 @@ async def get_ai_analysis(corp_code: str, year: int = 2023):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"AI 분석 실패: {str(e)}")
 
-@app.get("/api/financial_terms")
-async def explain_financial_terms():
-    """재무용어 설명 API"""
+def summarize_analysis_metrics(metrics: Dict) -> Dict:
+    """AI 분석 응답에 함께 내려주는 요약 지표 (억원 단위)"""
+    return {
+        "revenue_billions": round(metrics['revenue'] / 100000000, 1),
+        "profit_billions": round(metrics['net_income'] / 100000000, 1),
+        "assets_billions": round(metrics['total_assets'] / 100000000, 1),
+        "operating_margin": round(metrics['operating_margin'], 1),
+        "roe": round(metrics['roe'], 1)
+    }
+
+def sse_event(event: str, data: Dict) -> str:
+    """Server-Sent Events 메시지 포맷"""
+    return f"event: {event}\ndata: {orjson.dumps(data).decode('utf-8')}\n\n"
+
+@app.get("/api/ai_analysis_stream/{corp_code}")
+async def stream_ai_analysis(corp_code: str, year: int = 2023):
+    """AI 재무분석 스트리밍 API (Server-Sent Events로 섹션별 진행 결과 전달)"""
+    dart_api = services.dart_api
+    company_db = services.company_db
+    ai_analyzer = services.ai_analyzer
     if not ai_analyzer:
-        raise HTTPException(status_code=503, detail="AI 분석 서비스를 사용할 수 없습니다.")
+        raise HTTPException(status_code=503, detail="AI 분석 서비스를 사용할 수 없습니다. Gemini API 키를 확인해주세요.")
     
-    common_terms = [
-        "영업이익률", "순이익률", "부채비율", "자기자본이익률(ROE)", 
-        "매출액", "영업이익", "순이익", "총자산", "자본총계"
-    ]
+    if not dart_api or not company_db:
+        raise HTTPException(status_code=500, detail="시스템이 초기화되지 않았습니다.")
     
     try:
-        explanations = ai_analyzer.explain_financial_terms(common_terms)
-        return {
-            "status": "success",
-            "explanations": explanations
-        }
+        # 회사 정보 조회
+        company = company_db.get_company_by_code(corp_code)
+        if not company:
+            raise HTTPException(status_code=404, detail="회사를 찾을 수 없습니다.")
+        
+        # 재무데이터 조회
+        result = await run_in_threadpool(dart_api.get_financial_statements, corp_code, str(year), '11011')
+        if result['status'] != '000':
+            raise HTTPException(status_code=400, detail=f"재무데이터 조회 실패: {result['message']}")
+        
+        # 데이터 파싱 및 지표 계산
+        parsed_data = dart_api.parse_financial_data(result.get('list', []))
+        metrics = dart_api.get_key_financial_metrics(parsed_data)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"AI 분석 실패: {str(e)}")
+    
+    async def event_stream():
+        yield sse_event("meta", {
+            "company_name": company.corp_name,
+            "analysis_year": year,
+            "metrics": summarize_analysis_metrics(metrics)
+        })
+        # 모델 스트리밍은 /api/ai_analysis와 같은 동시 실행 제한과 제한시간 안에서 비동기로 실행
+        async for event in ai_analyzer.stream_financial_analysis(company.corp_name, metrics):
+            yield sse_event(event["event"], event["data"])
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/api/financial_terms")
+async def explain_financial_terms(terms: Optional[str] = None):
+    """재무용어 설명 API (용어 사전에 저장된 설명은 AI 호출 없이 반환)"""
+    # 쉼표로 구분된 용어 목록 (없으면 기본 용어)
+    term_list = [term.strip() for term in terms.split(",") if term.strip()] if terms else COMMON_TERMS
+    if len(term_list) > MAX_GLOSSARY_TERMS:
+        raise HTTPException(status_code=400, detail=f"용어는 최대 {MAX_GLOSSARY_TERMS}개까지 요청할 수 있습니다.")
+    # 용어 사전 목록에 있는 용어만 설명 (임의의 문자열마다 AI 호출과 사전 행이 생기지 않도록)
+    unknown = [term for term in term_list if term not in GLOSSARY_TERMS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"설명할 수 없는 용어입니다: {', '.join(unknown)}")
+    
+    term_list = list(dict.fromkeys(term_list))
+    ai_analyzer = services.ai_analyzer
+    try:
+        if ai_analyzer:
+            # 누락된 용어만 AI 분석과 같은 동시 실행 제한/제한시간 안에서 생성
+            explanations, missing = await ai_analyzer.explain_financial_terms_async(term_list)
+        else:
+            # AI 분석기 없이 용어 사전에 저장된 설명만 반환
+            glossary = services.glossary
+            if not glossary:
+                raise HTTPException(status_code=503, detail="AI 분석 서비스를 사용할 수 없습니다.")
+            explanations, missing = await run_in_threadpool(
+                glossary.lookup, term_list, FinancialAnalyzer.MODEL_NAME, FinancialAnalyzer.GLOSSARY_PROMPT_VERSION
+            )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"용어 설명 실패: {str(e)}")
+    
+    return financial_terms_response(explanations, missing)
+
+def financial_terms_response(explanations: Dict[str, Dict[str, str]], missing: List[str]):
+    """
+    용어 설명 응답 (모두 있으면 하루 캐시)
+    일부만 있으면 partial 표시와 누락 용어 목록을 저장하지 않는 응답으로, 하나도 없으면 503
+    (누락 용어는 다음 요청에서 다시 생성하므로 브라우저/CDN에 남지 않도록 함)
+    """
+    if not explanations:
+        raise HTTPException(status_code=503, detail=f"용어 설명을 만들 수 없습니다: {', '.join(missing)}")
+    if not missing:
+        return {"status": "success", "explanations": explanations}
+    return ORJSONResponse(
+        {"status": "success", "partial": True, "explanations": explanations, "missing": missing},
+        headers={"Cache-Control": "no-store"}
+    )
 
 
 def create_balance_sheet_box_chart(metrics: Dict, year: int):
     """재무상태표 박스 차트 생성 (통합형 구조)"""
+    import plotly.graph_objects as go  # 참조/벤치마크용 경로에서만 사용하므로 지연 import
     try:
-        print("🎯 통합형 재무상태표 박스 차트 함수 호출됨!")
+        logger.debug("🎯 통합형 재무상태표 박스 차트 함수 호출됨!")
         # 데이터 추출 (억원 단위)
         total_assets = metrics.get('total_assets', 0) / 100000000
         total_liabilities = metrics.get('total_liabilities', 0) / 100000000  
@@ -714,21 +1069,57 @@ def create_balance_sheet_box_chart(metrics: Dict, year: int):
         return fig
         
     except Exception as e:
-        print(f"❌ 재무상태표 박스 차트 생성 실패: {e}")
+        logger.warning("❌ 재무상태표 박스 차트 생성 실패: %s", e)
         raise
 
 
+def balance_box_payload(metrics: Dict, year: int, compact: bool) -> Dict:
+    """재무상태표 박스 차트 응답 (compact이면 balance_box 템플릿 ID와 지표만)"""
+    box_metrics = {
+        "total_assets": metrics.get('total_assets', 0),
+        "total_liabilities": metrics.get('total_liabilities', 0),
+        "total_equity": metrics.get('total_equity', 0),
+        "current_assets": metrics.get('current_assets', 0),
+        "non_current_assets": metrics.get('non_current_assets', 0),
+        "current_liabilities": metrics.get('current_liabilities', 0),
+        "non_current_liabilities": metrics.get('non_current_liabilities', 0)
+    }
+    
+    if compact:
+        # 브라우저가 balance_box 템플릿과 metrics로 차트를 조립
+        return {
+            "format": "compact",
+            "version": chart_specs.CHART_TEMPLATE_VERSION,
+            "template": "balance_box",
+            "metrics": box_metrics,
+            "year": year
+        }
+    
+    return {
+        "chart": chart_specs.balance_sheet_box_chart_spec(metrics, year),
+        "metrics": box_metrics,
+        "year": year
+    }
+
+
 @app.get("/api/balance_sheet_box/{corp_code}")
-async def get_balance_sheet_box(corp_code: str, year: int = 2023):
-    """재무상태표 박스 차트 API"""
+async def get_balance_sheet_box(request: Request, corp_code: str, year: int = 2023, format: str = "full"):
+    """재무상태표 박스 차트 API (format=compact이면 차트 대신 템플릿 ID만 반환)"""
+    dart_api = services.dart_api
     if not dart_api:
         raise HTTPException(status_code=500, detail="DART API가 초기화되지 않았습니다")
+    check_chart_format(format)
+    
+    cache_key = ("balance_sheet_box", corp_code, year, format)
+    cached = chart_cache.get(cache_key)
+    if cached:
+        return chart_cache.to_response(request, cached)
     
     try:
-        print(f"📊 재무상태표 박스 차트 요청: {corp_code}, {year}년")
+        logger.debug("📊 재무상태표 박스 차트 요청: %s, %s년", corp_code, year)
         
         # 재무제표 데이터 조회
-        result = dart_api.get_financial_statements(corp_code, str(year), '11011')
+        result = await run_in_threadpool(dart_api.get_financial_statements, corp_code, str(year), '11011')
         
         if result['status'] != '000':
             raise HTTPException(status_code=400, detail=f"데이터 조회 실패: {result['message']}")
@@ -737,162 +1128,609 @@ async def get_balance_sheet_box(corp_code: str, year: int = 2023):
         parsed_data = dart_api.parse_financial_data(result.get('list', []))
         metrics = dart_api.get_key_financial_metrics(parsed_data)
         
-        print(f"🔍 재무상태표 지표: 자산={metrics.get('total_assets', 0)/100000000:.0f}억, "
-              f"부채={metrics.get('total_liabilities', 0)/100000000:.0f}억, "
-              f"자본={metrics.get('total_equity', 0)/100000000:.0f}억")
-        print(f"🔍 세분화 지표: 유동자산={metrics.get('current_assets', 0)/100000000:.0f}억, "
-              f"비유동자산={metrics.get('non_current_assets', 0)/100000000:.0f}억, "
-              f"유동부채={metrics.get('current_liabilities', 0)/100000000:.0f}억, "
-              f"비유동부채={metrics.get('non_current_liabilities', 0)/100000000:.0f}억")
+        logger.debug("🔍 %s 재무상태표 지표: 자산=%.0f억, 부채=%.0f억, 자본=%.0f억", corp_code,
+                     metrics.get('total_assets', 0) / 100000000,
+                     metrics.get('total_liabilities', 0) / 100000000,
+                     metrics.get('total_equity', 0) / 100000000)
         
-        # 박스 차트 생성
-        fig = create_balance_sheet_box_chart(metrics, year)
-        
-        return {
-            "chart": json.loads(fig.to_json()),
-            "metrics": {
-                "total_assets": metrics.get('total_assets', 0),
-                "total_liabilities": metrics.get('total_liabilities', 0),
-                "total_equity": metrics.get('total_equity', 0),
-                "current_assets": metrics.get('current_assets', 0),
-                "non_current_assets": metrics.get('non_current_assets', 0),
-                "current_liabilities": metrics.get('current_liabilities', 0),
-                "non_current_liabilities": metrics.get('non_current_liabilities', 0)
-            },
-            "year": year
-        }
+        return cached_chart_response(request, cache_key, balance_box_payload(metrics, year, format == "compact"))
         
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"❌ 재무상태표 박스 차트 생성 실패: {e}")
+        logger.warning("❌ %s 재무상태표 박스 차트 생성 실패: %s", corp_code, e)
         raise HTTPException(status_code=500, detail=f"박스 차트 생성 실패: {str(e)}")
 
 
-@app.get("/api/financial_charts_batch/{corp_code}")
-async def get_financial_charts_batch(corp_code: str, start_year: int = 2019, end_year: int = 2023, base_year: int = 2023):
-    """모든 차트 데이터를 한 번에 반환"""
-    if not dart_api:
-        raise HTTPException(status_code=500, detail="DART API가 초기화되지 않았습니다")
+def load_yearly_metrics(dart_api: DartAPI, corp_code: str, years, reprt_code: str = '11011'):
+    """
+    연도별 주요 재무지표 조회 (스레드풀에서 실행)
+    사업보고서의 전기/전전기 금액을 이용해 연도 수의 1/3 정도만 조회
     
-    try:
-        print(f"📊 배치 차트 요청: {corp_code}, {start_year}-{end_year}년, 파이차트: {base_year}년")
-        
-        # 결과를 저장할 딕셔너리
-        result = {
-            "line_charts": {},
-            "pie_chart": None,
-            "success": True,
-            "message": "모든 차트 데이터를 성공적으로 로드했습니다."
-        }
-        
-        # 라인 차트들 (매출액, 순이익, 총자산)
-        chart_types = ['revenue', 'profit', 'assets']
+    Args:
+        dart_api: DART API 클라이언트
+        corp_code: 고유번호
+        years: 조회할 연도 목록
+        reprt_code: 보고서 코드
         
-        for chart_type in chart_types:
-            try:
-                print(f"🔍 {chart_type} 차트 생성 중...")
-                
-                years = []
-                values = []
-                
-                # 연도별 데이터 수집
-                for year in range(start_year, end_year + 1):
-                    try:
-                        # 재무제표 데이터 조회
-                        financial_result = dart_api.get_financial_statements(corp_code, str(year), '11011')
-                        
-                        if financial_result['status'] == '000' and financial_result.get('list'):
-                            # 데이터 파싱 및 지표 계산
-                            parsed_data = dart_api.parse_financial_data(financial_result.get('list', []))
-                            metrics = dart_api.get_key_financial_metrics(parsed_data)
-                            
-                            years.append(year)
-                            
-                            # 차트 타입에 따른 값 선택 (억원 단위)
-                            if chart_type == "revenue":
-                                value = safe_convert(metrics.get('revenue', 0)) / 100000000
-                            elif chart_type == "profit":
-                                value = safe_convert(metrics.get('net_income', 0)) / 100000000
-                            elif chart_type == "assets":
-                                value = safe_convert(metrics.get('total_assets', 0)) / 100000000
-                            else:
-                                value = 0
-                            
-                            values.append(round(value, 2))
-                            print(f"✅ {year}년 {chart_type}: {value}억원")
-                            
-                    except Exception as e:
-                        print(f"❌ {year}년 {chart_type} 데이터 처리 오류: {e}")
-                        continue
-                
-                # 데이터가 있으면 차트 생성
-                if years and values and not all(v == 0 for v in values):
-                    fig = create_financial_chart(years, values, chart_type)
+    Returns:
+        ({연도: 주요 재무지표}, 조회/처리 중 오류가 없었는지)
+    """
+    series, failed = dart_api.get_financial_series(corp_code, years, reprt_code)
+    complete = not failed
+    
+    yearly_metrics = {}
+    for year, rows in series.items():
+        try:
+            parsed_data = dart_api.parse_financial_data(rows)
+            yearly_metrics[year] = dart_api.get_key_financial_metrics(parsed_data)
+        except Exception as e:
+            logger.warning("❌ %s %s년 데이터 처리 오류: %s", corp_code, year, e)
+            complete = False
+    return yearly_metrics, complete
+
+
+def build_charts_batch(corp_code: str, yearly_metrics: Dict, start_year: int, end_year: int, base_year: int, compact: bool):
+    """
+    연도별 재무지표로 라인 차트(매출액, 순이익, 총자산)와 자산 구성 파이 차트 응답 생성
+    
+    Returns:
+        (응답 데이터, 차트 생성 중 오류가 없었는지)
+    """
+    cacheable = True
+    result = {
+        "line_charts": {},
+        "pie_chart": None,
+        "success": True,
+        "message": "모든 차트 데이터를 성공적으로 로드했습니다."
+    }
+    if compact:
+        result["format"] = "compact"
+        result["version"] = chart_specs.CHART_TEMPLATE_VERSION
+    
+    # 라인 차트들 (매출액, 순이익, 총자산)
+    chart_types = ['revenue', 'profit', 'assets']
+    metric_keys = {'revenue': 'revenue', 'profit': 'net_income', 'assets': 'total_assets'}
+    
+    for chart_type in chart_types:
+        try:
+            logger.debug("🔍 %s 차트 생성 중...", chart_type)
+            
+            years = []
+            values = []
+            
+            # 연도별 값 (억원 단위)
+            for year in range(start_year, end_year + 1):
+                if year in yearly_metrics:
+                    value = safe_convert(yearly_metrics[year].get(metric_keys[chart_type], 0)) / 100000000
+                    years.append(year)
+                    values.append(round(value, 2))
+                    logger.debug("✅ %s년 %s: %s억원", year, chart_type, value)
+            
+            # 데이터가 있으면 차트 생성
+            if years and values and not all(v == 0 for v in values):
+                if compact:
+                    # 브라우저가 line 템플릿으로 차트를 조립
                     result["line_charts"][chart_type] = {
-                        "chart": json.loads(fig.to_json()),
+                        "template": "line",
                         "years": years,
                         "values": values
                     }
-                    print(f"✅ {chart_type} 차트 생성 완료")
                 else:
                     result["line_charts"][chart_type] = {
-                        "chart": None,
-                        "message": f"{chart_type} 데이터를 찾을 수 없습니다."
+                        "chart": chart_specs.financial_chart_spec(years, values, chart_type),
+                        "years": years,
+                        "values": values
                     }
-                    print(f"❌ {chart_type} 데이터 없음")
-                    
-            except Exception as e:
-                print(f"❌ {chart_type} 차트 생성 실패: {e}")
+                logger.debug("✅ %s 차트 생성 완료", chart_type)
+            else:
                 result["line_charts"][chart_type] = {
                     "chart": None,
-                    "message": f"{chart_type} 차트 생성 중 오류가 발생했습니다."
+                    "message": f"{chart_type} 데이터를 찾을 수 없습니다."
                 }
+                logger.debug("❌ %s %s 데이터 없음", corp_code, chart_type)
+                
+        except Exception as e:
+            logger.warning("❌ %s %s 차트 생성 실패: %s", corp_code, chart_type, e, exc_info=True)
+            cacheable = False
+            result["line_charts"][chart_type] = {
+                "chart": None,
+                "message": f"{chart_type} 차트 생성 중 오류가 발생했습니다."
+            }
+    
+    # 파이 차트 (자산 구성)
+    try:
+        logger.debug("🥧 파이 차트 생성 중... (%s년)", base_year)
         
-        # 파이 차트 (자산 구성)
-        try:
-            print(f"🥧 파이 차트 생성 중... ({base_year}년)")
+        if base_year in yearly_metrics:
+            metrics = dict(yearly_metrics[base_year])
             
-            # 재무제표 데이터 조회
-            financial_result = dart_api.get_financial_statements(corp_code, str(base_year), '11011')
+            # 억원 단위로 변환
+            for key in ['total_assets', 'total_liabilities', 'total_equity']:
+                metrics[key] = metrics[key] / 100000000
             
-            if financial_result['status'] == '000' and financial_result.get('list'):
-                # 데이터 파싱 및 지표 계산
-                parsed_data = dart_api.parse_financial_data(financial_result.get('list', []))
-                metrics = dart_api.get_key_financial_metrics(parsed_data)
-                
-                # 억원 단위로 변환
-                for key in ['total_assets', 'total_liabilities', 'total_equity']:
-                    metrics[key] = metrics[key] / 100000000
-                
-                # 파이 차트 생성
-                fig = create_financial_pie_chart(metrics, "assets")
-                
+            # 파이 차트 생성
+            if compact:
                 result["pie_chart"] = {
-                    "chart": json.loads(fig.to_json()),
+                    "template": "pie",
+                    "values": [metrics['total_liabilities'], metrics['total_equity']],
                     "metrics": metrics
                 }
-                print(f"✅ 파이 차트 생성 완료")
             else:
                 result["pie_chart"] = {
-                    "chart": None, 
-                    "message": "자산 구성 데이터를 찾을 수 없습니다."
+                    "chart": chart_specs.financial_pie_chart_spec(metrics),
+                    "metrics": metrics
                 }
-                print(f"❌ 파이 차트 데이터 없음")
-                
-        except Exception as e:
-            print(f"❌ 파이 차트 생성 실패: {e}")
+            logger.debug("✅ 파이 차트 생성 완료")
+        else:
             result["pie_chart"] = {
                 "chart": None, 
-                "message": "파이 차트 생성 중 오류가 발생했습니다."
+                "message": "자산 구성 데이터를 찾을 수 없습니다."
             }
+            logger.debug("❌ %s 파이 차트 데이터 없음", corp_code)
+            
+    except Exception as e:
+        logger.warning("❌ %s 파이 차트 생성 실패: %s", corp_code, e, exc_info=True)
+        cacheable = False
+        result["pie_chart"] = {
+            "chart": None, 
+            "message": "파이 차트 생성 중 오류가 발생했습니다."
+        }
+    
+    return result, cacheable
+
+
+@app.get("/api/financial_charts_batch/{corp_code}")
+async def get_financial_charts_batch(request: Request, corp_code: str, start_year: int = 2019, end_year: int = 2023, base_year: int = 2023, format: str = "full"):
+    """모든 차트 데이터를 한 번에 반환 (format=compact이면 숫자 시리즈와 템플릿 ID만 반환)"""
+    dart_api = services.dart_api
+    if not dart_api:
+        raise HTTPException(status_code=500, detail="DART API가 초기화되지 않았습니다")
+    check_chart_format(format)
+    
+    cache_key = ("financial_charts_batch", corp_code, start_year, end_year, base_year, format)
+    cached = chart_cache.get(cache_key)
+    if cached:
+        return chart_cache.to_response(request, cached)
+    
+    try:
+        logger.debug("📊 배치 차트 요청: %s, %s-%s년, 파이차트: %s년", corp_code, start_year, end_year, base_year)
         
-        print(f"✅ 배치 차트 생성 완료!")
-        return result
+        # 연도별 재무지표 (라인 차트 기간 + 파이 차트 연도)
+        yearly_metrics, complete = await run_in_threadpool(
+            load_yearly_metrics, dart_api, corp_code, set(range(start_year, end_year + 1)) | {base_year}
+        )
+        result, charts_complete = build_charts_batch(
+            corp_code, yearly_metrics, start_year, end_year, base_year, format == "compact"
+        )
+        
+        logger.debug("✅ 배치 차트 생성 완료!")
+        # 조회 중 오류가 있었던 결과는 캐시하지 않음 (일시적 장애가 굳어지지 않도록)
+        if not (complete and charts_complete):
+            if stale_data_age() is not None:
+                result["stale"] = True
+            return ORJSONResponse(result)
+        return cached_chart_response(request, cache_key, result)
         
     except Exception as e:
-        print(f"❌ 배치 차트 생성 전체 실패: {e}")
+        logger.exception("❌ %s 배치 차트 생성 전체 실패: %s", corp_code, e)
         raise HTTPException(status_code=500, detail=f"차트 생성 중 오류가 발생했습니다: {str(e)}")
 
 
+def load_financial_series(dart_api: DartAPI, corp_code: str, freq: str, start_year: int, end_year: int):
+    """
+    분기/TTM 재무 시계열 조회 (스레드풀에서 실행)
+    
+    Returns:
+        (build_series 결과 + corp_code, 조회에 실패한 보고서가 있었는지)
+    """
+    # TTM은 첫 분기부터 직전 3개 분기가 필요하므로 한 해 앞선 보고서까지 조회
+    first_year = start_year - 1 if freq == "TTM" else start_year
+    statements, failed = dart_api.get_quarterly_statements(corp_code, range(first_year, end_year + 1))
+    
+    def metrics_of(rows):
+        return dart_api.get_key_financial_metrics(dart_api.parse_financial_data(rows))
+    
+    result = build_series(statements, metrics_of, freq, start_year, end_year)
+    result["corp_code"] = corp_code
+    return result, bool(failed)
+
+
+def validate_series_years(start_year: int, end_year: int):
+    """시계열 조회 연도 범위 검증 (순서와 최대 연도 수, 범위만큼 DART를 호출하므로 400으로 거절)"""
+    if start_year > end_year:
+        raise HTTPException(status_code=400, detail="시작 연도가 종료 연도보다 늦습니다.")
+    if end_year - start_year + 1 > MAX_SERIES_YEARS:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {MAX_SERIES_YEARS}개 연도까지 조회할 수 있습니다")
+
+
+@app.get("/api/financial_series/{corp_code}")
+async def get_financial_time_series(request: Request, corp_code: str, freq: str = "Q", start_year: int = 2019, end_year: int = 2023):
+    """분기별(freq=Q) 또는 최근 4분기 합계(freq=TTM) 재무 시계열 API (억원 단위 열 배열)"""
+    dart_api = services.dart_api
+    if not dart_api:
+        raise HTTPException(status_code=500, detail="DART API가 초기화되지 않았습니다")
+    if freq not in SERIES_FREQUENCIES:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 주기입니다: {freq} (Q/TTM)")
+    validate_series_years(start_year, end_year)
+    
+    cache_key = ("financial_series", corp_code, freq, start_year, end_year)
+    cached = chart_cache.get(cache_key)
+    if cached:
+        return chart_cache.to_response(request, cached)
+    
+    try:
+        result, failed = await run_in_threadpool(load_financial_series, dart_api, corp_code, freq, start_year, end_year)
+        
+        # 조회 중 오류가 있었던 결과는 캐시하지 않음 (일시적 장애가 굳어지지 않도록)
+        if failed:
+            if stale_data_age() is not None:
+                result["stale"] = True
+            return ORJSONResponse(result)
+        return cached_chart_response(request, cache_key, result)
+        
+    except Exception as e:
+        logger.exception("❌ %s 분기 시계열 생성 실패: %s", corp_code, e)
+        raise HTTPException(status_code=500, detail=f"분기 시계열 생성 중 오류가 발생했습니다: {str(e)}")
+
+
+# 회사 페이지 번들 전송 방식: NDJSON(한 줄에 섹션 하나) / Server-Sent Events(섹션 이름이 이벤트 이름)
+BUNDLE_TRANSPORTS = {"ndjson": "application/x-ndjson", "sse": "text/event-stream"}
+BUNDLE_FREQUENCIES = ("A",) + SERIES_FREQUENCIES
+
+def encode_bundle_section(section: str, body: bytes, transport: str) -> bytes:
+    """직렬화된 섹션 JSON을 NDJSON 한 줄 또는 SSE 이벤트로 감싸기 (캐시된 바이트를 다시 파싱하지 않음)"""
+    if transport == "sse":
+        return b"event: " + section.encode() + b"\ndata: " + body + b"\n\n"
+    return b'{"section":"' + section.encode() + b'","data":' + body + b"}\n"
+
+def bundle_company_section(company: Company, overview: Optional[Dict], sections: List[str]) -> Dict:
+    """번들 첫 섹션 (회사 정보, 기업개황, 이어서 보낼 섹션 목록, 차트 템플릿 버전)"""
+    return {
+        "corp_code": company.corp_code,
+        "corp_name": company.corp_name,
+        "stock_code": company.stock_code,
+        "overview": {key: value for key, value in overview.items() if key != "corp_code"} if overview else None,
+        "sections": sections,
+        "chart_template_version": chart_specs.CHART_TEMPLATE_VERSION
+    }
+
+def bundle_section_body(cache_key, payload: Dict, complete: bool = True) -> bytes:
+    """
+    번들 섹션 직렬화 (cached_chart_response와 같은 규칙)
+    오류 없이 만든 최신 데이터는 개별 차트 API와 같은 키로 캐시에 저장해 이후 요청과 공유
+    """
+    if cache_key is not None and complete and stale_data_age() is None:
+        return chart_cache.set(cache_key, payload).body
+    if stale_data_age() is not None:
+        payload = dict(payload, stale=True)
+    return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
+@app.get("/api/company_bundle/{corp_code}")
+async def get_company_bundle(
+    request: Request,
+    corp_code: str,
+    start_year: int = 2019,
+    end_year: int = 2023,
+    base_year: int = 2023,
+    report_type: str = "11011",
+    freq: str = "A",
+    ai: bool = False,
+    transport: Optional[str] = None
+):
+    """
+    회사 상세 페이지 번들 API
+    회사 정보, 주요 지표(metrics), 차트(charts), 재무상태표(balance_box), 분기 시계열(series, freq=Q/TTM),
+    AI 분석(ai=true)을 하나의 사업보고서 조회 계획으로 만들고 준비되는 섹션부터 스트리밍
+    (transport=ndjson/sse, 없으면 Accept 헤더가 text/event-stream일 때 SSE)
+    """
+    dart_api = services.dart_api
+    company_db = services.company_db
+    if not dart_api or not company_db:
+        raise HTTPException(status_code=500, detail="시스템이 초기화되지 않았습니다.")
+    if freq not in BUNDLE_FREQUENCIES:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 주기입니다: {freq} (A/Q/TTM)")
+    validate_series_years(start_year, end_year)
+    if transport is None:
+        transport = "sse" if "text/event-stream" in request.headers.get("accept", "") else "ndjson"
+    if transport not in BUNDLE_TRANSPORTS:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 전송 방식입니다: {transport} (ndjson/sse)")
+    
+    company = company_db.get_company_by_code(corp_code)
+    if not company:
+        raise HTTPException(status_code=404, detail="회사를 찾을 수 없습니다.")
+    
+    ai_analyzer = services.ai_analyzer if ai else None
+    industry_store = services.industry_store
+    overview = industry_store.get_overview(corp_code) if industry_store else None
+    
+    # 모든 섹션이 공유하는 사업보고서 조회 (처음 필요한 섹션이 시작하고, 캐시로 끝나는 섹션은 조회하지 않음)
+    annual_years = set(range(start_year, end_year + 1)) | {base_year}
+    annual_task: Optional[asyncio.Task] = None
+    
+    async def annual_metrics():
+        nonlocal annual_task
+        if annual_task is None:
+            annual_task = asyncio.ensure_future(
+                run_in_threadpool(load_yearly_metrics, dart_api, corp_code, annual_years)
+            )
+        # 한 섹션이 취소되어도 다른 섹션이 기다리는 조회는 계속되도록 shield
+        return await asyncio.shield(annual_task)
+    
+    async def base_year_metrics(reprt_code: str) -> Dict:
+        if reprt_code == '11011':
+            yearly_metrics, _ = await annual_metrics()
+            if base_year not in yearly_metrics:
+                raise HTTPException(status_code=404, detail=f"{base_year}년 재무데이터를 찾을 수 없습니다.")
+            return yearly_metrics[base_year]
+        
+        # 분기/반기 보고서는 사업보고서 계획과 별도로 조회
+        result = await run_in_threadpool(dart_api.get_financial_statements, corp_code, str(base_year), reprt_code)
+        if result['status'] != '000':
+            raise HTTPException(status_code=400, detail=f"데이터 조회 실패: {result['message']}")
+        return dart_api.get_key_financial_metrics(dart_api.parse_financial_data(result.get('list', [])))
+    
+    async def metrics_section() -> bytes:
+        metrics = await base_year_metrics(report_type)
+        return bundle_section_body(None, {
+            "metrics": metrics,
+            "year": base_year,
+            "report_type": report_type
+        })
+    
+    async def charts_section() -> bytes:
+        cache_key = ("financial_charts_batch", corp_code, start_year, end_year, base_year, "compact")
+        cached = chart_cache.get(cache_key)
+        if cached:
+            return cached.body
+        yearly_metrics, complete = await annual_metrics()
+        result, charts_complete = build_charts_batch(corp_code, yearly_metrics, start_year, end_year, base_year, True)
+        return bundle_section_body(cache_key, result, complete and charts_complete)
+    
+    async def balance_box_section() -> bytes:
+        cache_key = ("balance_sheet_box", corp_code, base_year, "compact")
+        cached = chart_cache.get(cache_key)
+        if cached:
+            return cached.body
+        metrics = await base_year_metrics('11011')
+        return bundle_section_body(cache_key, balance_box_payload(metrics, base_year, True))
+    
+    async def series_section() -> bytes:
+        cache_key = ("financial_series", corp_code, freq, start_year, end_year)
+        cached = chart_cache.get(cache_key)
+        if cached:
+            return cached.body
+        result, failed = await run_in_threadpool(load_financial_series, dart_api, corp_code, freq, start_year, end_year)
+        return bundle_section_body(cache_key, result, not failed)
+    
+    async def ai_section() -> bytes:
+        if not ai_analyzer:
+            raise HTTPException(status_code=503, detail="AI 분석 서비스를 사용할 수 없습니다. Gemini API 키를 확인해주세요.")
+        metrics = await base_year_metrics('11011')
+        analysis_result = await ai_analyzer.analyze_financial_data_async(
+            company_name=company.corp_name,
+            financial_metrics=metrics
+        )
+        return bundle_section_body(None, {
+            "status": "success",
+            "company_name": company.corp_name,
+            "analysis_year": base_year,
+            "analysis": analysis_result,
+            "metrics": summarize_analysis_metrics(metrics)
+        })
+    
+    sections = {
+        "metrics": metrics_section,
+        "charts": charts_section,
+        "balance_box": balance_box_section
+    }
+    if freq != "A":
+        sections["series"] = series_section
+    if ai:
+        sections["ai"] = ai_section
+    
+    async def run_section(name: str, build) -> bytes:
+        try:
+            body = await build()
+        except HTTPException as e:
+            body = orjson.dumps({"error": e.detail})
+        except Exception as e:
+            logger.warning("❌ %s 번들 %s 섹션 생성 실패: %s", corp_code, name, e, exc_info=True)
+            body = orjson.dumps({"error": f"{name} 데이터를 불러오지 못했습니다: {str(e)}"})
+        return encode_bundle_section(name, body, transport)
+    
+    async def bundle_stream():
+        started = time.perf_counter()
+        yield encode_bundle_section(
+            "company", orjson.dumps(bundle_company_section(company, overview, list(sections))), transport
+        )
+        
+        pending = {asyncio.ensure_future(run_section(name, build)) for name, build in sections.items()}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+            yield encode_bundle_section("done", orjson.dumps({
+                "stale": stale_data_age() is not None,
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)
+            }), transport)
+        finally:
+            # 클라이언트가 연결을 끊으면 남은 섹션 중단
+            for task in pending:
+                task.cancel()
+    
+    return StreamingResponse(
+        bundle_stream(),
+        media_type=BUNDLE_TRANSPORTS[transport],
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def parse_compare_params(corp_codes: str, years: str):
+    """기업 비교 요청의 고유번호/연도 목록 검증 (쉼표로 구분, 중복 제거)"""
+    codes = list(dict.fromkeys(code.strip() for code in corp_codes.split(",") if code.strip()))
+    if not codes:
+        raise HTTPException(status_code=400, detail="비교할 회사 고유번호를 입력해주세요")
+    if len(codes) > MAX_PEER_COMPANIES:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {MAX_PEER_COMPANIES}개 회사까지 비교할 수 있습니다")
+    if any(len(code) != 8 or not code.isdigit() for code in codes):
+        raise HTTPException(status_code=400, detail="회사 고유번호는 8자리 숫자입니다")
+    
+    try:
+        year_list = sorted({int(year) for year in years.split(",") if year.strip()})
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"연도 형식이 올바르지 않습니다: {years}")
+    if not year_list:
+        raise HTTPException(status_code=400, detail="비교할 연도를 입력해주세요")
+    if len(year_list) > MAX_PEER_YEARS:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {MAX_PEER_YEARS}개 연도까지 비교할 수 있습니다")
+    return codes, year_list
+
+@app.get("/api/compare")
+async def compare_companies(request: Request, corp_codes: str, years: str = "2021,2022,2023", format: str = "full"):
+    """
+    기업 비교 API (회사 × 연도 × 지표 행렬과 비교 차트)
+    format=compact이면 차트 대신 템플릿 ID(peer_bar)만 반환하고 브라우저가 행렬 값으로 차트를 조립
+    """
+    dart_api = services.dart_api
+    if not dart_api:
+        raise HTTPException(status_code=500, detail="DART API가 초기화되지 않았습니다")
+    check_chart_format(format)
+    codes, year_list = parse_compare_params(corp_codes, years)
+    
+    cache_key = ("compare", tuple(codes), tuple(year_list), format)
+    cached = chart_cache.get(cache_key)
+    if cached:
+        return chart_cache.to_response(request, cached)
+    
+    try:
+        # 캐시에 없는 회사는 다중회사 API로 한 번에 조회
+        financials, failed = await run_in_threadpool(dart_api.get_peer_financials, codes, year_list)
+        
+        def metrics_of(rows):
+            return dart_api.get_key_financial_metrics(dart_api.parse_financial_data(rows))
+        
+        matrix = peer_matrix(codes, year_list, financials, metrics_of)
+        
+        company_db = services.company_db
+        companies = []
+        for code in codes:
+            company = company_db.get_company_by_code(code) if company_db else None
+            companies.append({
+                "corp_code": code,
+                "corp_name": company.corp_name if company else code,
+                "has_data": bool(financials.get(code))
+            })
+        
+        result = {"companies": companies, "years": year_list}
+        result.update(matrix)
+        
+        names = [company["corp_name"] for company in companies]
+        metric_info = {key: (name, unit) for key, name, unit in PEER_METRICS}
+        if format == "compact":
+            result["format"] = "compact"
+            result["version"] = chart_specs.CHART_TEMPLATE_VERSION
+            result["charts"] = {key: {"template": "peer_bar"} for key in PEER_CHART_METRICS}
+        else:
+            result["charts"] = {
+                key: chart_specs.peer_comparison_chart_spec(names, year_list, metric_by_year(matrix, key),
+                                                            *metric_info[key])
+                for key in PEER_CHART_METRICS
+            }
+        
+        # 조회 중 오류가 있었던 결과는 캐시하지 않음 (일시적 장애가 굳어지지 않도록)
+        if failed:
+            result["failed"] = failed
+            if stale_data_age() is not None:
+                result["stale"] = True
+            return ORJSONResponse(result)
+        return cached_chart_response(request, cache_key, result)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("❌ 기업 비교 실패 (%d개사): %s", len(codes), e)
+        raise HTTPException(status_code=500, detail=f"기업 비교 중 오류가 발생했습니다: {str(e)}")
+
+
+@app.get("/api/industry/{code}")
+async def get_industry_benchmark(code: str, year: int = 2023, corp_code: Optional[str] = None):
+    """
+    업종 통계 API (미리 계산한 업종별 재무지표 사분위수)
+    corp_code를 주면 그 회사의 업종 내 백분위와 비교 설명을 함께 반환
+    """
+    industry_store = services.industry_store
+    if not industry_store:
+        raise HTTPException(status_code=500, detail="업종 통계 DB가 초기화되지 않았습니다")
+    if not code.isdigit():
+        raise HTTPException(status_code=400, detail=f"업종코드는 숫자입니다: {code}")
+    
+    # 세분 업종의 회사 수가 적으면 상위 업종 통계 사용
+    sector_code = industry_store.find_sector(code, year)
+    if sector_code is None:
+        raise HTTPException(status_code=404, detail=f"{year}년 업종 통계가 없습니다: {code}")
+    sector_metrics = industry_store.get_sector_metrics(sector_code, year)
+    
+    result = {
+        "industry_code": code,
+        "sector_code": sector_code,
+        "year": year,
+        "metrics": {
+            key: {
+                "name": name, "unit": unit,
+                **{field: sector_metrics[key][field] for field in ("count", "p25", "median", "p75")}
+            }
+            for key, name, unit in PEER_METRICS if key in sector_metrics
+        },
+        "computed_at": max(stats["computed_at"] for stats in sector_metrics.values())
+    }
+    
+    if corp_code:
+        dart_api = services.dart_api
+        if not dart_api:
+            raise HTTPException(status_code=500, detail="DART API가 초기화되지 않았습니다")
+        try:
+            statements = await run_in_threadpool(dart_api.get_financial_statements, corp_code, str(year), '11011')
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"재무데이터 조회 실패: {str(e)}")
+        if statements['status'] != '000':
+            raise HTTPException(status_code=400, detail=f"데이터 조회 실패: {statements['message']}")
+        
+        metrics = dart_api.get_key_financial_metrics(dart_api.parse_financial_data(statements.get('list', [])))
+        comparison = compare_to_sector(metrics, sector_metrics)
+        company_db = services.company_db
+        company = company_db.get_company_by_code(corp_code) if company_db else None
+        corp_name = company.corp_name if company else corp_code
+        
+        result["company"] = {
+            "corp_code": corp_code,
+            "corp_name": corp_name,
+            "percentiles": comparison,
+            "summary": describe_sector_comparison(corp_name, comparison, sector_code)
+        }
+        if stale_data_age() is not None:
+            result["stale"] = True
+    
+    return result
+
+
+@app.get("/api/chart_templates")
+async def get_chart_templates(request: Request):
+    """compact 차트 응답을 브라우저에서 렌더링하기 위한 레이아웃 템플릿 API"""
+    cache_key = ("chart_templates", chart_specs.CHART_TEMPLATE_VERSION)
+    cached = chart_cache.get(cache_key)
+    if not cached:
+        cached = chart_cache.set(cache_key, chart_specs.chart_templates())
+    return chart_cache.to_response(request, cached)
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus 형식 지표 (단계별 소요 시간, 캐시 적중, DART 상태코드별 호출 수, AI 분석 대기열 등)"""
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
+
+
 if __name__ == "__main__":
     import uvicorn
     import os
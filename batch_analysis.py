@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+AI 재무분석 일괄 생성 모듈
+여러 기업의 AI 분석 결과를 미리 생성하여 분석 캐시에 저장 (요청 시점 생성 대신 사전 계산)
+
+- 재무지표는 체크포인트에 저장된 값을 우선 사용하고, 없으면 DART에서 조회
+- Gemini 호출은 분당 요청 한도(rate budget) 안에서 동시에 실행
+- 기업별 진행 상황을 체크포인트 파일에 기록하여 중단 후 재실행시 이어서 진행
+
+실행:
+    python batch_analysis.py --year 2023 --listed 200
+    python batch_analysis.py --year 2023 --corp-codes 00126380 00164779 --stub
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from dart_api import DartAPI
+from database import CompanyDatabase
+from financial_analyzer import FinancialAnalyzer
+from analysis_cache import AnalysisCache
+
+
+class RateLimiter:
+    """분당 요청 수를 제한하는 토큰 버킷 (asyncio용)"""
+
+    def __init__(self, requests_per_minute: float, burst: int = 1):
+        """
+        Args:
+            requests_per_minute: 분당 허용 요청 수
+            burst: 한 번에 몰아서 보낼 수 있는 최대 요청 수
+        """
+        self.interval = 60.0 / requests_per_minute
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """요청 1건에 필요한 토큰을 얻을 때까지 대기"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) / self.interval)
+                self._updated_at = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) * self.interval)
+
+
+class BatchCheckpoint:
+    """일괄 분석 진행 상황 (JSON 파일, 원자적 교체로 저장)"""
+
+    def __init__(self, path: str, year: int):
+        """
+        Args:
+            path: 체크포인트 파일 경로
+            year: 분석 연도 (다른 연도의 체크포인트는 이어서 사용하지 않음)
+        """
+        self.path = path
+        self.year = year
+        self.completed: Dict[str, str] = {}
+        self.failed: Dict[str, str] = {}
+        self.metrics: Dict[str, Dict[str, Any]] = {}
+        self.load()
+
+    def load(self):
+        """기존 체크포인트 로드"""
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        if data.get('year') != self.year:
+            print(f"⚠️ 체크포인트 연도({data.get('year')})가 달라 새로 시작합니다: {self.path}")
+            return
+
+        self.completed = data.get('completed', {})
+        self.failed = data.get('failed', {})
+        self.metrics = data.get('metrics', {})
+
+    def save(self):
+        """임시 파일에 쓴 뒤 교체하여 중간에 중단되어도 파일이 깨지지 않도록 저장"""
+        data = {
+            'year': self.year,
+            'updated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'completed': self.completed,
+            'failed': self.failed,
+            'metrics': self.metrics
+        }
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def mark_completed(self, corp_code: str, corp_name: str):
+        self.completed[corp_code] = corp_name
+        self.failed.pop(corp_code, None)
+
+    def mark_failed(self, corp_code: str, reason: str):
+        self.failed[corp_code] = reason
+
+
+@dataclass
+class BatchReport:
+    """일괄 분석 실행 결과"""
+    total: int
+    skipped: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    elapsed_seconds: float = 0.0
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def processed(self) -> int:
+        return self.succeeded + self.failed
+
+    @property
+    def companies_per_minute(self) -> float:
+        """처리량 (분당 처리 기업 수, 건너뛴 기업 제외)"""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.processed / self.elapsed_seconds * 60
+
+
+class StubResponse:
+    """스텁 모델 응답 (Gemini 응답의 text 속성만 흉내냄)"""
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class StubModel:
+    """Gemini 대신 사용하는 테스트용 모델 (네트워크 호출 없이 고정 응답)"""
+
+    model_name = "stub"
+
+    def __init__(self, delay: float = 0.2):
+        """
+        Args:
+            delay: 응답 지연시간(초), 실제 API 응답 시간을 흉내냄
+        """
+        self.delay = delay
+        self.calls = 0
+
+    def _response(self, prompt: str, generation_config: Optional[Dict] = None):
+        self.calls += 1
+        if (generation_config or {}).get("response_mime_type") == "application/json":
+            # 용어 설명 요청: 프롬프트 두 번째 줄의 용어 목록으로 JSON 응답
+            lines = prompt.strip().splitlines()
+            terms = [term.strip() for term in lines[1].split(",")] if len(lines) > 1 else []
+            text = json.dumps({"terms": [
+                {"term": term, "definition": f"{term}의 테스트용 정의", "example": "테스트용 예시", "importance": "테스트용 설명"}
+                for term in terms if term
+            ]}, ensure_ascii=False)
+        else:
+            # 분석 프롬프트가 요구하는 섹션 제목 형식 그대로 응답 (실제 파싱 경로를 거치도록)
+            text = (
+                "### 한줄요약\n테스트용 분석 결과입니다.\n"
+                "### 강점\n재무구조가 안정적입니다.\n"
+                "### 주의점\n특이사항 없음.\n"
+                "### 투자의견\n추가 검토가 필요합니다.\n"
+            )
+        return StubResponse(text)
+
+    @staticmethod
+    def _chunks(text: str) -> List["StubResponse"]:
+        """스트리밍 응답 조각 (줄 단위)"""
+        return [StubResponse(line) for line in text.splitlines(keepends=True)]
+
+    def generate_content(self, prompt: str, generation_config: Optional[Dict] = None, stream: bool = False, **kwargs):
+        time.sleep(self.delay)
+        response = self._response(prompt, generation_config)
+        return iter(self._chunks(response.text)) if stream else response
+
+    async def generate_content_async(self, prompt: str, generation_config: Optional[Dict] = None,
+                                     stream: bool = False, **kwargs):
+        await asyncio.sleep(self.delay)
+        response = self._response(prompt, generation_config)
+        if not stream:
+            return response
+
+        # Gemini의 비동기 스트리밍 응답처럼 async for로 조각을 전달
+        async def chunks():
+            for chunk in self._chunks(response.text):
+                await asyncio.sleep(0)
+                yield chunk
+        return chunks()
+
+
+class BatchAnalysisRunner:
+    """여러 기업의 AI 분석을 동시에 실행하고 분석 캐시에 저장"""
+
+    def __init__(self,
+                 analyzer: FinancialAnalyzer,
+                 dart_api: DartAPI,
+                 company_db: CompanyDatabase,
+                 checkpoint_path: str = "batch_analysis_checkpoint.json",
+                 requests_per_minute: float = 60,
+                 concurrency: int = 4):
+        """
+        일괄 분석기 초기화
+
+        Args:
+            analyzer: 재무분석기 (분석 결과는 analyzer.cache에 저장됨)
+            dart_api: 재무지표 조회용 DART API 클라이언트
+            company_db: 회사명 조회용 데이터베이스
+            checkpoint_path: 진행 상황 체크포인트 파일 경로
+            requests_per_minute: Gemini 분당 요청 한도
+            concurrency: 동시에 처리할 기업 수
+        """
+        self.analyzer = analyzer
+        self.dart_api = dart_api
+        self.company_db = company_db
+        self.checkpoint_path = checkpoint_path
+        self.requests_per_minute = requests_per_minute
+        self.concurrency = concurrency
+
+    async def run(self, corp_codes: List[str], year: int, retry_failed: bool = False) -> BatchReport:
+        """
+        일괄 분석 실행
+
+        Args:
+            corp_codes: 분석할 기업 고유번호 목록
+            year: 분석 연도
+            retry_failed: 이전 실행에서 실패한 기업도 다시 시도할지 여부
+
+        Returns:
+            실행 결과 (처리량 포함)
+        """
+        checkpoint = BatchCheckpoint(self.checkpoint_path, year)
+        limiter = RateLimiter(self.requests_per_minute, burst=self.concurrency)
+
+        unique_codes = list(dict.fromkeys(corp_codes))
+        pending = []
+        for corp_code in unique_codes:
+            if corp_code in checkpoint.completed:
+                continue
+            if corp_code in checkpoint.failed and not retry_failed:
+                continue
+            pending.append(corp_code)
+
+        report = BatchReport(total=len(unique_codes), skipped=len(unique_codes) - len(pending))
+        print(f"🚀 일괄 분석 시작: {year}년, 대상 {len(pending)}개 (건너뜀 {report.skipped}개)")
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for corp_code in pending:
+            queue.put_nowait(corp_code)
+
+        started = time.perf_counter()
+
+        async def worker():
+            while True:
+                try:
+                    corp_code = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+
+                try:
+                    corp_name = await self._analyze_company(corp_code, year, checkpoint, limiter)
+                    checkpoint.mark_completed(corp_code, corp_name)
+                    report.succeeded += 1
+                except Exception as e:
+                    checkpoint.mark_failed(corp_code, str(e))
+                    report.failed += 1
+                    report.errors[corp_code] = str(e)
+
+                # 기업 1건 처리마다 저장하여 중단되어도 완료분은 다시 호출하지 않음
+                checkpoint.save()
+
+                elapsed = time.perf_counter() - started
+                rate = report.processed / elapsed * 60 if elapsed > 0 else 0
+                print(f"  [{report.processed}/{len(pending)}] {corp_code} "
+                      f"(성공 {report.succeeded}, 실패 {report.failed}, {rate:.1f}개/분)")
+
+        await asyncio.gather(*(worker() for _ in range(max(1, self.concurrency))))
+
+        report.elapsed_seconds = time.perf_counter() - started
+        print(f"✅ 일괄 분석 완료: 성공 {report.succeeded}개, 실패 {report.failed}개, "
+              f"{report.elapsed_seconds:.1f}초 ({report.companies_per_minute:.1f}개/분)")
+        return report
+
+    async def _analyze_company(self,
+                               corp_code: str,
+                               year: int,
+                               checkpoint: BatchCheckpoint,
+                               limiter: RateLimiter) -> str:
+        """기업 1건 분석 후 회사명 반환 (실패시 예외)"""
+        company = self.company_db.get_company_by_code(corp_code)
+        if not company:
+            raise ValueError("회사를 찾을 수 없습니다.")
+
+        metrics = checkpoint.metrics.get(corp_code)
+        if metrics is None:
+            metrics = await asyncio.to_thread(self._fetch_metrics, corp_code, year)
+            checkpoint.metrics[corp_code] = metrics
+
+        # 이미 캐시에 있으면 Gemini를 호출하지 않으므로 요청 한도도 소모하지 않음
+        cache_key = self.analyzer.analysis_cache_key(company.corp_name, metrics, None)
+        if self.analyzer.cache.get(cache_key) is not None:
+            return company.corp_name
+
+        await limiter.acquire()
+        result = await self.analyzer.analyze_financial_data_async(company.corp_name, metrics)
+
+        # 오류 결과와 시간 초과 기본 분석은 캐시되지 않으므로 실패로 기록하여 다음 실행에서 재시도
+        if 'error' in result:
+            raise RuntimeError(result['error'])
+        if 'notice' in result:
+            raise TimeoutError(result['notice'])
+
+        return company.corp_name
+
+    def _fetch_metrics(self, corp_code: str, year: int) -> Dict[str, Any]:
+        """DART에서 사업보고서 재무지표 조회 (API와 동일한 방식)"""
+        result = self.dart_api.get_financial_statements(corp_code, str(year), '11011')
+        if result['status'] != '000':
+            raise ValueError(f"재무데이터 조회 실패: {result['message']}")
+
+        parsed_data = self.dart_api.parse_financial_data(result.get('list', []))
+        return self.dart_api.get_key_financial_metrics(parsed_data)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="AI 재무분석 일괄 생성")
+    parser.add_argument("--year", type=int, default=2023, help="분석 연도")
+    parser.add_argument("--corp-codes", nargs="*", default=[], help="분석할 기업 고유번호 목록")
+    parser.add_argument("--listed", type=int, default=0, help="상장회사 중 앞에서부터 N개 분석")
+    parser.add_argument("--checkpoint", default="batch_analysis_checkpoint.json", help="체크포인트 파일 경로")
+    parser.add_argument("--rpm", type=float, default=60, help="Gemini 분당 요청 한도")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시 처리 기업 수")
+    parser.add_argument("--retry-failed", action="store_true", help="이전에 실패한 기업도 다시 시도")
+    parser.add_argument("--stub", action="store_true", help="Gemini 대신 테스트용 모델 사용")
+    args = parser.parse_args(argv)
+
+    company_db = CompanyDatabase()
+    if company_db.get_company_count() == 0:
+        company_db.load_from_json()
+
+    corp_codes = list(args.corp_codes)
+    if args.listed:
+        corp_codes.extend(company.corp_code for company in company_db.get_listed_companies(limit=args.listed))
+
+    if not corp_codes:
+        parser.error("--corp-codes 또는 --listed 중 하나를 지정해주세요.")
+
+    analyzer = FinancialAnalyzer(
+        cache=AnalysisCache(),
+        max_concurrency=args.concurrency,
+        model=StubModel() if args.stub else None
+    )
+
+    runner = BatchAnalysisRunner(
+        analyzer=analyzer,
+        dart_api=DartAPI(),
+        company_db=company_db,
+        checkpoint_path=args.checkpoint,
+        requests_per_minute=args.rpm,
+        concurrency=args.concurrency
+    )
+
+    report = asyncio.run(runner.run(corp_codes, args.year, retry_failed=args.retry_failed))
+    for corp_code, error in report.errors.items():
+        print(f"  ❌ {corp_code}: {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+"""
+부하 테스트용 앱 진입점 (bench_load.py가 uvicorn bench_app:app으로 실행)
+워커를 여러 개 띄우면 워커마다 이 모듈을 import하므로 스텁 Gemini 모델 주입도 워커마다 적용됨
+"""
+import os
+
+import app as app_module
+from batch_analysis import StubModel
+from financial_analyzer import FinancialAnalyzer
+
+app_module.services.override(
+    "ai_analyzer", FinancialAnalyzer(model=StubModel(delay=float(os.getenv("BENCH_AI_DELAY", "0.5"))))
+)
+app = app_module.app
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+차트 생성 경로 마이크로 벤치마크
+Plotly Figure 경로(app.create_*)와 경량 스펙 경로(chart_specs)를 차트 종류별로 비교
+
+실행: python benchmarks/bench_chart_specs.py [반복횟수]
+"""
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chart_specs
+from app import create_financial_chart, create_financial_pie_chart, create_balance_sheet_box_chart
+
+YEARS = [2019, 2020, 2021, 2022, 2023]
+VALUES = [2304008.81, 2368069.88, 2796048.0, 3022313.6, 2589354.94]
+PIE_METRICS = {'total_liabilities': 922281.0, 'total_equity': 3634677.0}
+BOX_METRICS = {
+    'total_assets': 455905980000000,
+    'total_liabilities': 92228115000000,
+    'total_equity': 363677865000000,
+    'current_assets': 195936557000000,
+    'non_current_assets': 259969423000000,
+    'current_liabilities': 75719452000000,
+    'non_current_liabilities': 16508663000000
+}
+
+CASES = {
+    "line": (
+        lambda: json.loads(create_financial_chart(YEARS, VALUES, "revenue").to_json()),
+        lambda: chart_specs.financial_chart_spec(YEARS, VALUES, "revenue")
+    ),
+    "pie": (
+        lambda: json.loads(create_financial_pie_chart(PIE_METRICS, "assets").to_json()),
+        lambda: chart_specs.financial_pie_chart_spec(PIE_METRICS)
+    ),
+    "balance_box": (
+        lambda: json.loads(create_balance_sheet_box_chart(BOX_METRICS, 2023).to_json()),
+        lambda: chart_specs.balance_sheet_box_chart_spec(BOX_METRICS, 2023)
+    )
+}
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    print(f"\n📊 차트 생성 벤치마크 (반복 {number}회)")
+    print("-" * 72)
+    print(f"{'차트':<12} {'plotly (ms)':>12} {'spec (ms)':>12} {'배속':>8} {'동일여부':>10}")
+    print("-" * 72)
+
+    for name, (plotly_path, spec_path) in CASES.items():
+        # 키 순서와 무관하게 값이 모두 같은지 비교
+        identical = plotly_path() == spec_path()
+
+        plotly_ms = min(timeit.repeat(plotly_path, number=number, repeat=3)) / number * 1000
+        spec_ms = min(timeit.repeat(spec_path, number=number, repeat=3)) / number * 1000
+
+        print(f"{name:<12} {plotly_ms:>12.3f} {spec_ms:>12.3f} {plotly_ms / spec_ms:>7.0f}x {str(identical):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+배치 차트 응답 인코딩 벤치마크
+/api/financial_charts_batch 응답(full 형식)의 직렬화 시간을 변경 전/후로 비교
+
+- 변경 전: fig.to_json() → json.loads → jsonable_encoder → JSONResponse
+- 변경 후: 차트 스펙 딕셔너리 → ORJSONResponse (orjson)
+
+실행: python benchmarks/bench_json_encoding.py [반복횟수]
+"""
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+import chart_specs
+from app import create_financial_chart, create_financial_pie_chart
+
+YEARS = [2019, 2020, 2021, 2022, 2023]
+SERIES = {
+    "revenue": [2304008.81, 2368069.88, 2796048.0, 3022313.6, 2589354.94],
+    "profit": [217388.65, 264078.08, 399074.5, 556540.66, 154871.09],
+    "assets": [3525645.04, 3782357.18, 4266211.58, 4484245.07, 4559059.8]
+}
+PIE_METRICS = {'total_assets': 4559059.8, 'total_liabilities': 922281.15, 'total_equity': 3636778.65}
+
+
+def batch_payload(line_chart, pie_chart):
+    """배치 API 응답 구조 생성"""
+    return {
+        "line_charts": {
+            chart_type: {"chart": line_chart(chart_type, values), "years": YEARS, "values": values}
+            for chart_type, values in SERIES.items()
+        },
+        "pie_chart": {"chart": pie_chart(), "metrics": PIE_METRICS},
+        "success": True,
+        "message": "모든 차트 데이터를 성공적으로 로드했습니다."
+    }
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    # 차트 생성 비용은 제외하고 인코딩만 측정하도록 미리 생성
+    figures = {chart_type: create_financial_chart(YEARS, values, chart_type) for chart_type, values in SERIES.items()}
+    pie_figure = create_financial_pie_chart(PIE_METRICS, "assets")
+    specs = batch_payload(lambda chart_type, values: chart_specs.financial_chart_spec(YEARS, values, chart_type),
+                          lambda: chart_specs.financial_pie_chart_spec(PIE_METRICS))
+
+    def encode_before():
+        payload = batch_payload(lambda chart_type, values: json.loads(figures[chart_type].to_json()),
+                                lambda: json.loads(pie_figure.to_json()))
+        return JSONResponse(jsonable_encoder(payload)).body
+
+    def encode_after():
+        return ORJSONResponse(specs).body
+
+    before_ms = min(timeit.repeat(encode_before, number=number, repeat=3)) / number * 1000
+    after_ms = min(timeit.repeat(encode_after, number=number, repeat=3)) / number * 1000
+
+    print(f"\n📦 배치 차트 응답 인코딩 벤치마크 (반복 {number}회)")
+    print("-" * 60)
+    print(f"{'경로':<28} {'시간 (ms)':>12} {'크기 (bytes)':>14}")
+    print("-" * 60)
+    print(f"{'변경 전 (to_json+loads+json)':<28} {before_ms:>12.3f} {len(encode_before()):>14,}")
+    print(f"{'변경 후 (spec+orjson)':<28} {after_ms:>12.3f} {len(encode_after()):>14,}")
+    print(f"\n⚡ {before_ms / after_ms:.0f}배 빠름")
+
+
+if __name__ == "__main__":
+    main()
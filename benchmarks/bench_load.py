@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+앱 부하 테스트
+로컬 DART 서버(fake_dart_server)와 스텁 Gemini 모델로 실제 앱(uvicorn)을 띄우고
+엔드포인트별로 동시 요청을 보내 처리량과 지연시간 분위수(p50/p95/p99)를 측정 (네트워크 불필요)
+
+- 앱은 별도 프로세스로 임시 작업 디렉토리에서 실행 (회사 DB, 분석 캐시, 용어 사전이 매번 비어있는 상태)
+- 요청 i는 회사 풀의 i % pool 번째 회사를 사용하므로 풀보다 요청이 많으면 앞부분은 콜드, 뒷부분은 캐시 적중
+- DART 호출 수: 시나리오 동안 로컬 DART 서버가 받은 요청 수
+- --dart-slow-rate/--dart-slow-ms: 일부 DART 요청에 꼬리 지연 추가 (--hedge-delay와 함께 헤지 요청 효과 측정)
+- --hedge-delay: 앱의 DART_HEDGE_DELAY (기본 0: 헤지 요청 사용 안 함)
+- --workers: uvicorn 워커 수 (WEB_CONCURRENCY도 같이 설정하므로 2 이상이면 캐시는 워커 공유 SQLite)
+- --outage: 시나리오마다 회사 풀을 한 바퀴 미리 조회한 뒤 DART 장애(지연 후 503) 상태에서 측정
+
+실행: python benchmarks/bench_load.py [--app-dir 경로] [--requests 200] [--concurrency 20] [--pool 50]
+      [--dart-latency 50] [--dart-jitter 20] [--dart-slow-rate 0.05 --dart-slow-ms 2000]
+      [--hedge-delay 1.5] [--outage] [--ai-delay 0.5] [--scenarios search company ...] [--artifact] [--workers 4]
+      [--json-out results.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from typing import Callable, Dict, List
+from urllib.parse import quote
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from fake_dart_server import FakeDartServer, make_companies, write_corp_codes
+
+# 비교 요청 한 건의 회사 수
+PEER_GROUP_SIZE = 10
+
+
+def peer_codes(company: Dict[str, str]) -> str:
+    """회사가 속한 비교 그룹 (합성 회사를 PEER_GROUP_SIZE개씩 묶은 그룹)의 고유번호 목록"""
+    code = company["corp_code"]
+    index = int(code[1:]) if code.startswith("9") else zlib.crc32(code.encode()) % 1000
+    start = index // PEER_GROUP_SIZE * PEER_GROUP_SIZE
+    return ",".join(f"9{i:07d}" for i in range(start, start + PEER_GROUP_SIZE))
+
+
+# 시나리오 이름 -> 요청 경로 생성 함수 (회사 풀을 몇 바퀴째 도는지와 회사 정보를 받음)
+SCENARIOS: Dict[str, Callable[[int, Dict[str, str]], str]] = {
+    "search": lambda r, c: f"/api/search_companies?q={quote(c['corp_name'][-4:])}",
+    # 한 바퀴마다 회사명을 한 글자씩 더 입력하는 자동완성 (회사별 클라이언트, 바퀴 수가 입력 순번)
+    "autocomplete": lambda r, c: (f"/api/search_companies?q={quote(c['corp_name'][:r % len(c['corp_name']) + 1])}"
+                                  f"&client={c['corp_code']}&seq={r}"),
+    "company": lambda r, c: f"/api/company/{c['corp_code']}",
+    "financial": lambda r, c: f"/api/financial/{c['corp_code']}?year=2023",
+    "balance_sheet_box": lambda r, c: f"/api/balance_sheet_box/{c['corp_code']}?year=2023&format=compact",
+    # 사업보고서가 없는 연도 (로컬 DART 서버는 2015년 이전 013 응답, 앱은 400이므로 모두 오류로 집계됨)
+    "no_data_year": lambda r, c: f"/api/balance_sheet_box/{c['corp_code']}?year=2014&format=compact",
+    "charts_batch": lambda r, c: f"/api/financial_charts_batch/{c['corp_code']}?format=compact",
+    # 2019~2023년 분기 보고서 전체 (연도마다 1분기/반기/3분기/사업보고서)
+    "quarterly_series": lambda r, c: f"/api/financial_series/{c['corp_code']}?freq=TTM",
+    # 회사가 속한 10개사 그룹의 2019~2023년 비교
+    "compare": lambda r, c: f"/api/compare?corp_codes={peer_codes(c)}&years=2019,2020,2021,2022,2023",
+    # 회사 페이지 번들 (주요 지표 + 차트 + 재무상태표를 한 조회 계획으로 스트리밍)
+    "company_bundle": lambda r, c: f"/api/company_bundle/{c['corp_code']}",
+    # 브라우저 기본 경로인 AI 분석 스트리밍 (SSE, done 이벤트까지 읽음). 분석 캐시를 ai_analysis와 공유하므로
+    # 먼저 실행되는 쪽만 콜드 (각각 콜드로 측정하려면 --scenarios로 따로 실행)
+    "ai_analysis_stream": lambda r, c: f"/api/ai_analysis_stream/{c['corp_code']}?year=2023",
+    "ai_analysis": lambda r, c: f"/api/ai_analysis/{c['corp_code']}?year=2023",
+    "financial_terms": lambda r, c: "/api/financial_terms"
+}
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """정렬된 값의 분위수 (nearest-rank)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run_scenario(base_url: str, paths: List[str], concurrency: int) -> Dict[str, float]:
+    """
+    경로 목록을 동시 요청 수 concurrency로 모두 요청
+
+    Returns:
+        요청 수, 오류 수, 처리량(req/s), 지연시간 분위수(ms)
+    """
+    import httpx
+
+    latencies: List[float] = []
+    errors = 0
+    next_index = 0
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=120,
+                                 limits=httpx.Limits(max_connections=concurrency)) as client:
+        async def worker():
+            nonlocal next_index, errors
+            while next_index < len(paths):
+                path = paths[next_index]
+                next_index += 1
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    await response.aread()
+                    if response.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(paths),
+        "errors": errors,
+        "throughput": len(paths) / elapsed,
+        "p50": percentile(latencies, 50) * 1000,
+        "p95": percentile(latencies, 95) * 1000,
+        "p99": percentile(latencies, 99) * 1000
+    }
+
+
+def start_app(app_dir: str, work_dir: str, port: int, env: Dict[str, str], workers: int = 1) -> subprocess.Popen:
+    """
+    작업 디렉토리에서 앱 서버 프로세스 시작 (부하 생성기와 GIL을 나누지 않도록 별도 프로세스)
+    스텁 모델을 주입하는 bench_app 모듈을 uvicorn으로 실행 (workers개 워커)
+    """
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "bench_app:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=work_dir, env=dict(os.environ, PYTHONPATH=os.pathsep.join([app_dir, BENCH_DIR]), **env)
+    )
+
+
+def wait_ready(base_url: str, process: subprocess.Popen):
+    """앱이 요청을 받고 회사 데이터 로드를 마칠 때까지 대기"""
+    import httpx
+
+    while True:
+        if process.poll() is not None:
+            raise RuntimeError("앱 서버가 종료되었습니다")
+        try:
+            if httpx.get(f"{base_url}/readyz").status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.05)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="앱 부하 테스트 (로컬 DART 서버 + 스텁 Gemini)")
+    parser.add_argument("--app-dir", default=REPO_DIR, help="측정할 앱 디렉토리 (변경 전 버전은 git worktree로 체크아웃)")
+    parser.add_argument("--requests", type=int, default=200, help="시나리오별 요청 수")
+    parser.add_argument("--concurrency", type=int, default=20, help="동시 요청 수")
+    parser.add_argument("--pool", type=int, default=50, help="요청에 사용할 회사 수")
+    parser.add_argument("--companies", type=int, default=10000, help="합성 회사 수")
+    parser.add_argument("--dart-latency", type=float, default=50, help="DART 응답 지연시간(ms)")
+    parser.add_argument("--dart-jitter", type=float, default=20, help="DART 추가 무작위 지연시간 최대값(ms)")
+    parser.add_argument("--dart-slow-rate", type=float, default=0, help="꼬리 지연을 더할 DART 요청 비율 (0~1)")
+    parser.add_argument("--dart-slow-ms", type=float, default=2000, help="꼬리 지연 DART 요청에 더하는 시간(ms)")
+    parser.add_argument("--hedge-delay", type=float, default=0, help="DART 헤지 요청 지연시간(초, 0이면 사용 안 함)")
+    parser.add_argument("--outage", action="store_true", help="회사 풀을 미리 조회한 뒤 DART 장애 상태에서 측정")
+    parser.add_argument("--outage-ms", type=float, default=1000, help="장애 중 DART 503 응답 전 지연시간(ms)")
+    parser.add_argument("--ai-delay", type=float, default=0.5, help="스텁 모델 응답 지연시간(초)")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--artifact", action="store_true", help="빌드된 읽기 전용 회사 DB로 실행")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="앱 워커 프로세스 수 (2 이상이면 --artifact 권장, WEB_CONCURRENCY로도 전달)")
+    parser.add_argument("--json-out", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    app_dir = os.path.abspath(args.app_dir)
+    json_out = os.path.abspath(args.json_out) if args.json_out else None
+
+    companies = make_companies(args.companies)
+    pool = companies[:args.pool]
+
+    dart_server = FakeDartServer(companies, args.dart_latency, args.dart_jitter,
+                                 slow_rate=args.dart_slow_rate, slow_ms=args.dart_slow_ms,
+                                 outage_ms=args.outage_ms).start()
+    work_dir = tempfile.mkdtemp(prefix="bench_load_")
+    write_corp_codes(os.path.join(work_dir, "corpCodes.json"), companies)
+    for name in ("templates", "static"):
+        os.symlink(os.path.join(app_dir, name), os.path.join(work_dir, name))
+    if args.artifact:
+        from database import build_company_artifact
+        build_company_artifact(os.path.join(work_dir, "corpCodes.json"),
+                               os.path.join(work_dir, "companies_artifact.db"))
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    process = start_app(app_dir, work_dir, port, {
+        "DART_API_KEY": "bench",
+        "DART_API_BASE_URL": dart_server.base_url,
+        "BENCH_AI_DELAY": str(args.ai_delay),
+        "DART_HEDGE_DELAY": str(args.hedge_delay),
+        "WEB_CONCURRENCY": str(args.workers),
+        "LOG_LEVEL": os.getenv("LOG_LEVEL", "WARNING")
+    }, workers=args.workers)
+
+    print(f"\n🚀 부하 테스트: 요청 {args.requests}개 x 동시 {args.concurrency}, 회사 풀 {len(pool)}개, "
+          f"워커 {args.workers}개")
+    print(f"   DART 지연 {args.dart_latency}ms + 0~{args.dart_jitter}ms"
+          f" (+{args.dart_slow_ms:.0f}ms {args.dart_slow_rate:.0%}), 헤지 {args.hedge_delay}s, 스텁 모델 지연 {args.ai_delay}s, "
+          f"빌드된 DB: {'사용' if args.artifact else '미사용'}")
+    if args.outage:
+        print(f"   DART 장애: 회사 풀을 미리 조회한 뒤 {args.outage_ms:.0f}ms 지연 후 503 응답 상태에서 측정")
+    print("-" * 86)
+    print(f"{'엔드포인트':<20}{'요청':>7}{'오류':>6}{'req/s':>10}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'DART호출':>10}")
+    print("-" * 86)
+
+    results = {}
+    try:
+        wait_ready(base_url, process)
+        for name in args.scenarios:
+            paths = [SCENARIOS[name](i // len(pool), pool[i % len(pool)]) for i in range(args.requests)]
+            if args.outage:
+                dart_server.outage = False
+                asyncio.run(run_scenario(base_url, paths[:len(pool)], args.concurrency))
+                dart_server.outage = True
+            dart_calls_before = sum(dart_server.requests.values())
+            result = asyncio.run(run_scenario(base_url, paths, args.concurrency))
+            result["dart_calls"] = sum(dart_server.requests.values()) - dart_calls_before
+            results[name] = result
+            print(f"{name:<20}{result['requests']:>7}{result['errors']:>6}{result['throughput']:>10.1f}"
+                  f"{result['p50']:>10.1f}{result['p95']:>10.1f}{result['p99']:>10.1f}{result['dart_calls']:>10}")
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+        dart_server.stop()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if json_out:
+        with open(json_out, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": results}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
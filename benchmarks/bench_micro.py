@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+핵심 함수 마이크로 벤치마크 (네트워크 불필요)
+
+- parse_financial_data / get_key_financial_metrics: fixtures의 fnlttSinglAcnt 응답 사용
+- search_companies: 합성 회사 목록으로 만든 일반 DB와 빌드된 읽기 전용 DB 비교 (짧은/긴 검색어)
+- 차트 빌더: chart_specs의 라인/파이/박스 차트 스펙 생성
+
+실행: python benchmarks/bench_micro.py [--number 2000] [--companies 100000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import timeit
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import chart_specs
+from dart_api import DartAPI
+from database import CompanyDatabase, build_company_artifact
+from fake_dart_server import FakeDart, make_companies, write_corp_codes
+
+SEARCH_TERMS = ("삼성", "벤치마크기업12", "기업9999")
+
+
+def measure(func, number: int) -> float:
+    """1회 실행 시간(µs), 3번 반복 중 최솟값"""
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="핵심 함수 마이크로 벤치마크")
+    parser.add_argument("--number", type=int, default=2000, help="측정당 반복 횟수")
+    parser.add_argument("--companies", type=int, default=100000, help="검색 벤치마크 합성 회사 수")
+    args = parser.parse_args()
+
+    companies = make_companies(args.companies)
+    dart_api = DartAPI(api_key="bench")
+    rows = FakeDart(companies).financial_statements("00126380", "2023")["list"]
+    parsed = dart_api.parse_financial_data(rows)
+    metrics = dart_api.get_key_financial_metrics(parsed)
+    years = list(range(2019, 2024))
+    values = [metrics["revenue"] / 1e8 * (0.9 + 0.05 * i) for i in range(len(years))]
+    pie_metrics = {key: metrics[key] / 1e8 for key in ("total_liabilities", "total_equity")}
+
+    cases = [
+        (f"parse_financial_data ({len(rows)}행)", lambda: dart_api.parse_financial_data(rows), args.number),
+        ("get_key_financial_metrics", lambda: dart_api.get_key_financial_metrics(parsed), args.number),
+        ("financial_chart_spec", lambda: chart_specs.financial_chart_spec(years, values, "revenue"), args.number),
+        ("financial_pie_chart_spec", lambda: chart_specs.financial_pie_chart_spec(pie_metrics), args.number),
+        ("balance_sheet_box_chart_spec", lambda: chart_specs.balance_sheet_box_chart_spec(metrics, 2023), args.number),
+    ]
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        json_path = os.path.join(work_dir, "corpCodes.json")
+        write_corp_codes(json_path, companies)
+
+        writable_db = CompanyDatabase(os.path.join(work_dir, "companies.db"))
+        writable_db.load_from_json(json_path)
+        artifact_path = os.path.join(work_dir, "companies_artifact.db")
+        build_company_artifact(json_path, artifact_path)
+        artifact_db = CompanyDatabase(artifact_path, read_only=True)
+
+        search_number = max(args.number // 20, 10)
+        for label, db in (("일반 DB", writable_db), ("빌드된 DB", artifact_db)):
+            for term in SEARCH_TERMS:
+                cases.append((f"search_companies {label} '{term}'",
+                              lambda db=db, term=term: db.search_companies(term, limit=20), search_number))
+
+        print(f"\n⏱️ 마이크로 벤치마크 (검색 대상 회사 {len(companies):,}개)")
+        print("-" * 64)
+        print(f"{'항목':<44}{'반복':>8}{'µs/회':>12}")
+        print("-" * 64)
+        for name, func, number in cases:
+            print(f"{name:<44}{number:>8}{measure(func, number):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+앱 시작 시간 벤치마크
+빈 데이터베이스 + corpCodes.json 상태(콜드 스타트)에서 다음 시간을 측정
+
+- import: `import app` 소요 시간
+- first response: 시작(lifespan 포함) 후 `/` 첫 응답까지
+- ready: 회사 데이터 로드 완료까지 (/readyz가 없는 이전 버전은 first response와 동일)
+
+실행: python benchmarks/bench_startup.py [--app-dir 경로] [--companies 100000] [--runs 3] [--artifact]
+이전 버전과 비교하려면 git worktree로 체크아웃한 디렉토리를 --app-dir로 지정
+--artifact: build_company_db.py로 미리 빌드한 읽기 전용 DB가 있는 상태에서 측정
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 측정 대상 프로세스에서 실행할 코드 (작업 디렉토리는 임시 디렉토리)
+PROBE = r"""
+import json, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+
+from fastapi.testclient import TestClient
+overhead = time.perf_counter() - imported
+
+with TestClient(app.app) as client:
+    client.get("/")
+    first_response = time.perf_counter() - overhead
+
+    if client.get("/readyz").status_code != 404:
+        while client.get("/readyz").status_code != 200:
+            time.sleep(0.005)
+    ready = time.perf_counter() - overhead
+
+print(json.dumps({
+    "import": imported - started,
+    "first_response": first_response - started,
+    "ready": ready - started
+}))
+"""
+
+
+def write_corp_codes(path: str, count: int):
+    """벤치마크용 corpCodes.json 생성 (상장/비상장 혼합)"""
+    companies = [
+        {
+            "corp_code": f"{i:08d}",
+            "corp_name": f"벤치마크기업{i}",
+            "stock_code": f"{i:06d}" if i % 4 == 0 else "",
+            "modify_date": "20240101"
+        }
+        for i in range(count)
+    ]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(companies, f, ensure_ascii=False)
+
+
+def run_once(app_dir: str, corp_codes_path: str, artifact_path: str = None) -> dict:
+    """임시 디렉토리(빈 DB)에서 앱을 한 번 시작하여 시간 측정"""
+    with tempfile.TemporaryDirectory() as work_dir:
+        shutil.copy(corp_codes_path, os.path.join(work_dir, "corpCodes.json"))
+        if artifact_path:
+            shutil.copy(artifact_path, os.path.join(work_dir, "companies_artifact.db"))
+        for name in ("templates", "static"):
+            os.symlink(os.path.join(app_dir, name), os.path.join(work_dir, name))
+
+        env = dict(os.environ, PYTHONPATH=app_dir, DART_API_KEY="bench", GEMINI_API_KEY="bench")
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE],
+            cwd=work_dir, env=env, capture_output=True, text=True, check=True
+        ).stdout
+
+    # 앱 로그 출력 중 마지막 JSON 줄이 측정 결과
+    return json.loads([line for line in output.splitlines() if line.startswith("{")][-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="앱 시작 시간 벤치마크")
+    parser.add_argument("--app-dir", default=REPO_DIR, help="측정할 앱 디렉토리")
+    parser.add_argument("--companies", type=int, default=100000, help="corpCodes.json 회사 수")
+    parser.add_argument("--runs", type=int, default=3, help="반복 횟수 (중앙값 출력)")
+    parser.add_argument("--artifact", action="store_true", help="빌드된 읽기 전용 회사 DB 사용")
+    args = parser.parse_args()
+    app_dir = os.path.abspath(args.app_dir)
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        corp_codes_path = os.path.join(data_dir, "corpCodes.json")
+        write_corp_codes(corp_codes_path, args.companies)
+
+        artifact_path = None
+        if args.artifact:
+            artifact_path = os.path.join(data_dir, "companies_artifact.db")
+            subprocess.run(
+                [sys.executable, os.path.join(app_dir, "build_company_db.py"),
+                 "--json", corp_codes_path, "--output", artifact_path],
+                cwd=app_dir, capture_output=True, check=True
+            )
+
+        results = [run_once(app_dir, corp_codes_path, artifact_path) for _ in range(args.runs)]
+
+    print(f"앱 디렉토리: {args.app_dir}")
+    print(f"회사 수: {args.companies:,}개, 반복: {args.runs}회 (중앙값), 빌드된 DB: {'사용' if args.artifact else '미사용'}")
+    print(f"{'항목':<16}{'시간(ms)':>12}")
+    print("-" * 28)
+    for key in ("import", "first_response", "ready"):
+        print(f"{key:<16}{statistics.median(r[key] for r in results) * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+벤치마크용 로컬 DART 서버
+fixtures/의 DART 응답(fnlttSinglAcnt, list.json)과 회사 목록을 지연시간을 두고 재생하여
+네트워크 없이 앱 성능을 측정
+
+- fnlttSinglAcnt.json: 기록된 응답의 금액을 (회사, 연도)별로 일정 비율 변형하여 반환
+  (MIN_YEAR 이전 연도나 목록에 없는 회사는 013 데이터 없음. 분기/반기보고서는 손익 항목을
+  계절성 있는 누적 비율로 나누어 thstrm_add_amount에 누적, thstrm_amount에 3개월 금액을 담음)
+- fnlttMultiAcnt.json: 쉼표로 구분한 회사들의 fnlttSinglAcnt 계정을 이어 붙여 반환 (데이터 없는 회사는 제외)
+- company.json: 회사별로 결정적인 업종코드(KSIC)와 법인구분(상장사 Y/K, 그 외 E)의 기업개황
+- list.json: 기록된 공시 목록을 반복하여 page_no/page_count에 맞게 페이지 구성
+- corpCode.xml: 회사 목록을 CORPCODE.xml로 담은 ZIP
+
+실행: python benchmarks/fake_dart_server.py [--port 8765] [--latency 50] [--jitter 20] [--companies 1000]
+앱 연결: DART_API_BASE_URL=http://127.0.0.1:8765/api uvicorn app:app
+"""
+import argparse
+import copy
+import io
+import json
+import os
+import random
+import threading
+import time
+import zipfile
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# 재무제표 데이터가 있는 가장 이른 사업연도 (DART 단일회사 주요계정은 2015년부터 제공)
+MIN_YEAR = 2015
+
+NO_DATA = {"status": "013", "message": "조회된 데이타가 없습니다."}
+AMOUNT_FIELDS = ("thstrm_amount", "frmtrm_amount", "bfefrmtrm_amount")
+
+# 기업개황 업종코드 후보 (KSIC, 같은 중분류/소분류에 여러 회사가 모이도록 일부만 사용)
+INDUSTRY_CODES = ("26110", "26410", "26429", "20111", "20119", "21210", "29271", "30121", "58221", "62010", "47111", "41221")
+
+# 보고서 코드별 사업연도 누적 비율 (1분기, 반기, 3분기, 사업보고서)
+CUMULATIVE_SHARES = {"11013": 0.23, "11012": 0.48, "11014": 0.74, "11011": 1.0}
+PREVIOUS_REPORT = {"11012": "11013", "11014": "11012"}
+
+
+def load_fixture(name: str) -> Any:
+    """fixtures 디렉토리의 JSON 파일 로드"""
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def make_companies(count: int) -> List[Dict[str, str]]:
+    """
+    기록된 회사 목록에 합성 회사를 더한 회사 목록 생성
+
+    Args:
+        count: 추가할 합성 회사 수 (3개 중 1개는 상장사)
+
+    Returns:
+        corpCodes.json 형식의 회사 목록
+    """
+    companies = load_fixture("corp_codes.json")
+    companies.extend(
+        {
+            "corp_code": f"9{i:07d}",
+            "corp_name": f"벤치마크기업{i}",
+            "stock_code": f"9{i:05d}" if i % 3 == 0 else "",
+            "modify_date": "20240101"
+        }
+        for i in range(count)
+    )
+    return companies
+
+
+def write_corp_codes(path: str, companies: List[Dict[str, str]]):
+    """회사 목록을 앱이 읽는 corpCodes.json 형식으로 저장"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(companies, f, ensure_ascii=False)
+
+
+def _scale_amount(text: str, factor: float) -> str:
+    if not text:
+        return text
+    try:
+        return f"{int(int(text.replace(',', '')) * factor):,}"
+    except ValueError:
+        return text
+
+
+class FakeDart:
+    """기록된 응답으로 DART API 응답을 만드는 재생기 (HTTP와 무관한 부분)"""
+
+    def __init__(self, companies: List[Dict[str, str]]):
+        self.companies = {company["corp_code"]: company for company in companies}
+        self.financials = load_fixture("fnlttSinglAcnt.json")
+        self.disclosures = load_fixture("list.json")["list"]
+        self.recorded_year = int(self.financials["list"][0]["bsns_year"])
+        self._corp_code_zip: Optional[bytes] = None
+
+    def financial_statements(self, corp_code: str, year: str, reprt_code: str = "11011") -> Dict[str, Any]:
+        """단일회사 주요계정 응답 (회사, 연도별로 결정적인 비율로 금액 변형)"""
+        company = self.companies.get(corp_code)
+        if not company or not year.isdigit() or not MIN_YEAR <= int(year) <= self.recorded_year + 1:
+            return NO_DATA
+        if reprt_code not in CUMULATIVE_SHARES:
+            return NO_DATA
+
+        # 같은 (회사, 연도)는 항상 같은 값, 연도가 갈수록 조금씩 성장
+        factor = 0.05 + (zlib.crc32(corp_code.encode()) % 1000) / 500
+        factor *= 1.04 ** (int(year) - self.recorded_year)
+
+        rows = copy.deepcopy(self.financials["list"])
+        for row in rows:
+            row["corp_code"] = corp_code
+            row["stock_code"] = company["stock_code"]
+            row["bsns_year"] = year
+            for field in AMOUNT_FIELDS:
+                row[field] = _scale_amount(row.get(field, ""), factor)
+            if reprt_code != "11011":
+                self._quarterly_amounts(row, reprt_code)
+        return {"status": "000", "message": "정상", "list": rows}
+
+    def company_overview(self, corp_code: str) -> Dict[str, Any]:
+        """기업개황 응답 (회사별로 결정적인 업종코드와 법인구분)"""
+        company = self.companies.get(corp_code)
+        if not company:
+            return {"status": "013", "message": "조회된 데이타가 없습니다."}
+
+        seed = zlib.crc32(corp_code.encode())
+        if company["stock_code"]:
+            corp_cls = "Y" if seed % 2 else "K"
+        else:
+            corp_cls = "E"
+        return {
+            "status": "000", "message": "정상",
+            "corp_code": corp_code, "corp_name": company["corp_name"], "stock_name": company["corp_name"],
+            "stock_code": company["stock_code"], "ceo_nm": "홍길동", "corp_cls": corp_cls,
+            "induty_code": INDUSTRY_CODES[seed % len(INDUSTRY_CODES)],
+            "est_dt": "19690113", "acc_mt": "12", "hm_url": ""
+        }
+
+    def multi_company_statements(self, corp_codes: str, year: str, reprt_code: str = "11011") -> Dict[str, Any]:
+        """다중회사 주요계정 응답 (회사별 단일회사 응답의 계정을 이어 붙임)"""
+        rows = []
+        for corp_code in corp_codes.split(","):
+            rows.extend(self.financial_statements(corp_code, year, reprt_code).get("list", []))
+        if not rows:
+            return NO_DATA
+        return {"status": "000", "message": "정상", "list": rows}
+
+    @staticmethod
+    def _quarterly_amounts(row: Dict[str, Any], reprt_code: str):
+        """사업보고서 계정을 분기/반기보고서 계정으로 변환 (손익은 누적/3개월 금액, 재무상태는 분기 말 잔액)"""
+        share = CUMULATIVE_SHARES[reprt_code]
+        annual = row.get("thstrm_amount", "")
+        if row.get("sj_div") == "IS":
+            cumulative = _scale_amount(annual, share)
+            previous = CUMULATIVE_SHARES.get(PREVIOUS_REPORT.get(reprt_code), 0)
+            row["thstrm_add_amount"] = cumulative
+            row["thstrm_amount"] = _scale_amount(annual, share - previous)
+        else:
+            row["thstrm_amount"] = _scale_amount(annual, 1.04 ** (share - 1))
+        row["frmtrm_amount"] = row["bfefrmtrm_amount"] = ""
+
+    def disclosure_list(self, params: Dict[str, str], total_count: int) -> Dict[str, Any]:
+        """공시검색 응답 (기록된 공시를 반복하여 요청한 페이지 구성)"""
+        page_no = max(int(params.get("page_no", 1)), 1)
+        page_count = min(max(int(params.get("page_count", 10)), 1), 100)
+        total_page = max((total_count + page_count - 1) // page_count, 1)
+
+        start = (page_no - 1) * page_count
+        items = []
+        for index in range(start, min(start + page_count, total_count)):
+            item = dict(self.disclosures[index % len(self.disclosures)])
+            item["rcept_no"] = f"{item['rcept_no'][:8]}{index:06d}"
+            corp_code = params.get("corp_code")
+            if corp_code in self.companies:
+                company = self.companies[corp_code]
+                item.update(corp_code=corp_code, corp_name=company["corp_name"],
+                            stock_code=company["stock_code"], flr_nm=company["corp_name"])
+            items.append(item)
+
+        if not items:
+            return NO_DATA
+        return {
+            "status": "000", "message": "정상",
+            "page_no": page_no, "page_count": page_count,
+            "total_count": total_count, "total_page": total_page,
+            "list": items
+        }
+
+    def corp_code_zip(self) -> bytes:
+        """고유번호 응답 (CORPCODE.xml을 담은 ZIP, 한 번 만들어 재사용)"""
+        if self._corp_code_zip is None:
+            entries = "".join(
+                "<list>"
+                f"<corp_code>{escape(c['corp_code'])}</corp_code>"
+                f"<corp_name>{escape(c['corp_name'])}</corp_name>"
+                f"<stock_code>{escape(c['stock_code'] or ' ')}</stock_code>"
+                f"<modify_date>{escape(c['modify_date'])}</modify_date>"
+                "</list>"
+                for c in self.companies.values()
+            )
+            buffer = io.BytesIO()
+            with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
+                zip_file.writestr("CORPCODE.xml", f'<?xml version="1.0" encoding="UTF-8"?><result>{entries}</result>')
+            self._corp_code_zip = buffer.getvalue()
+        return self._corp_code_zip
+
+
+class FakeDartServer:
+    """
+    FakeDart를 HTTP로 제공하는 로컬 서버 (요청마다 지연시간 적용)
+    outage를 True로 바꾸면 장애 상황처럼 outage_ms 동안 기다린 뒤 503으로 응답
+    """
+
+    def __init__(self,
+                 companies: Optional[List[Dict[str, str]]] = None,
+                 latency_ms: float = 50,
+                 jitter_ms: float = 0,
+                 disclosures: int = 250,
+                 host: str = "127.0.0.1",
+                 port: int = 0,
+                 seed: int = 0,
+                 slow_rate: float = 0,
+                 slow_ms: float = 0,
+                 outage_ms: float = 1000):
+        """
+        Args:
+            companies: 회사 목록 (없으면 기록된 회사 + 합성 회사 1000개)
+            latency_ms: 응답 지연시간(ms)
+            jitter_ms: 지연시간에 더하는 0~jitter_ms 사이 무작위 시간(ms)
+            disclosures: list.json 전체 공시 수
+            host: 바인딩 주소
+            port: 포트 (0이면 빈 포트 자동 선택)
+            seed: 지연시간 난수 시드 (같은 시드면 같은 지연시간 순서)
+            slow_rate: 꼬리 지연을 더할 요청 비율 (0~1)
+            slow_ms: 꼬리 지연 요청에 더하는 시간(ms)
+            outage_ms: 장애 중 503 응답 전 지연시간(ms)
+        """
+        self.dart = FakeDart(companies if companies is not None else make_companies(1000))
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.slow_rate = slow_rate
+        self.slow = slow_ms / 1000
+        self.outage = False
+        self.outage_delay = outage_ms / 1000
+        self.disclosures = disclosures
+        self.requests = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """앱의 DART_API_BASE_URL로 지정할 주소"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def serve_forever(self):
+        """현재 스레드에서 서버 실행 (CLI용)"""
+        self._httpd.serve_forever()
+
+    def start(self) -> "FakeDartServer":
+        """백그라운드 스레드에서 서버 시작"""
+        self._thread = threading.Thread(target=self.serve_forever, name="fake-dart", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """서버 종료"""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeDartServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _delay(self) -> float:
+        with self._lock:
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+            if self.slow_rate and self._random.random() < self.slow_rate:
+                delay += self.slow
+            return delay
+
+    def respond(self, api: str, params: Dict[str, str]):
+        """API 이름과 파라미터로 (상태코드, Content-Type, 본문) 생성"""
+        with self._lock:
+            self.requests[api] += 1
+
+        if self.outage:
+            data = {"status": "800", "message": "시스템 점검으로 인한 서비스가 중지 중입니다."}
+            return 503, "application/json; charset=utf-8", json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+        if api == "fnlttSinglAcnt.json":
+            data = self.dart.financial_statements(params.get("corp_code", ""), params.get("bsns_year", ""),
+                                                 params.get("reprt_code", "11011"))
+        elif api == "fnlttMultiAcnt.json":
+            data = self.dart.multi_company_statements(params.get("corp_code", ""), params.get("bsns_year", ""),
+                                                      params.get("reprt_code", "11011"))
+        elif api == "company.json":
+            data = self.dart.company_overview(params.get("corp_code", ""))
+        elif api == "list.json":
+            data = self.dart.disclosure_list(params, self.disclosures)
+        elif api == "corpCode.xml":
+            return 200, "application/x-msdownload", self.dart.corp_code_zip()
+        else:
+            data = {"status": "100", "message": "지원하지 않는 API입니다."}
+
+        status = 404 if data["status"] == "100" else 200
+        return status, "application/json; charset=utf-8", json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                time.sleep(server.outage_delay if server.outage else server._delay())
+
+                status, content_type, body = server.respond(url.path.rsplit("/", 1)[-1], params)
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크용 로컬 DART 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=50, help="응답 지연시간(ms)")
+    parser.add_argument("--jitter", type=float, default=0, help="추가 무작위 지연시간 최대값(ms)")
+    parser.add_argument("--slow-rate", type=float, default=0, help="꼬리 지연을 더할 요청 비율 (0~1)")
+    parser.add_argument("--slow-ms", type=float, default=0, help="꼬리 지연 요청에 더하는 시간(ms)")
+    parser.add_argument("--companies", type=int, default=1000, help="합성 회사 수")
+    parser.add_argument("--corp-codes-out", help="앱이 읽을 corpCodes.json을 이 경로에 저장")
+    args = parser.parse_args()
+
+    companies = make_companies(args.companies)
+    if args.corp_codes_out:
+        write_corp_codes(args.corp_codes_out, companies)
+
+    server = FakeDartServer(companies, args.latency, args.jitter, host=args.host, port=args.port,
+                            slow_rate=args.slow_rate, slow_ms=args.slow_ms)
+    print(f"🛰️ 로컬 DART 서버: {server.base_url} (지연 {args.latency}ms + 0~{args.jitter}ms, 회사 {len(companies):,}개)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+읽기 전용 회사 DB 빌드 스크립트
+corpCodes.json을 정렬, 인덱싱(검색 인덱스 포함), VACUUM한 SQLite 파일로 만들어
+컨테이너 시작시 JSON 적재 없이 바로 사용
+
+실행:
+    python build_company_db.py                      # corpCodes.json → companies_artifact.db
+    python build_company_db.py --download           # DART에서 회사 코드를 받은 뒤 빌드
+    python build_company_db.py --optional           # 실패해도 종료 코드 0 (앱은 기존 방식으로 동작)
+"""
+import argparse
+import os
+import sys
+import time
+
+from database import ARTIFACT_PATH, build_company_artifact
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="읽기 전용 회사 DB 빌드")
+    parser.add_argument("--json", default="corpCodes.json", help="회사 코드 JSON 파일 경로")
+    parser.add_argument("--output", default=ARTIFACT_PATH, help="생성할 DB 파일 경로")
+    parser.add_argument("--download", action="store_true", help="JSON 파일이 없으면 DART에서 다운로드")
+    parser.add_argument("--optional", action="store_true", help="빌드 실패시에도 정상 종료")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.download and not os.path.exists(args.json):
+            from dart_api import DartAPI
+            DartAPI().download_corp_codes(save_json=True)
+
+        started = time.perf_counter()
+        info = build_company_artifact(args.json, args.output)
+        elapsed = time.perf_counter() - started
+
+        print(f"✅ 회사 DB 빌드 완료: {args.output} ({os.path.getsize(args.output) / 1024 / 1024:.1f}MB, {elapsed:.1f}초)")
+        print(f"  - 전체 회사: {info['company_count']:,}개")
+        print(f"  - 상장회사: {info['listed_count']:,}개")
+        print(f"  - 원본 해시: {info['source_sha256'][:12]}")
+        return 0
+
+    except Exception as e:
+        print(f"❌ 회사 DB 빌드 실패: {e}")
+        return 0 if args.optional else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""
+차트 응답 캐시 모듈
+완성된 차트 JSON을 바이트로 캐싱하고 ETag 기반 조건부 응답(304)을 제공
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable, Optional
+
+import orjson
+from fastapi import Request
+from fastapi.responses import Response
+
+from metrics import record_cache, span
+
+
+@dataclass
+class CachedPayload:
+    """캐시된 응답 본문"""
+    body: bytes
+    etag: str
+    created_at: float
+
+
+class ChartPayloadCache:
+    """입력값(corp_code, 연도, 차트 종류)을 키로 하는 차트 응답 캐시 (LRU + TTL)"""
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: int = 3600, max_age: int = 600):
+        """
+        캐시 초기화
+
+        Args:
+            max_entries: 최대 보관 항목 수 (초과시 가장 오래 사용되지 않은 항목 제거)
+            ttl_seconds: 서버측 캐시 유효시간(초)
+            max_age: 브라우저에 전달할 Cache-Control max-age(초)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_age = max_age
+        self._entries: "OrderedDict[Hashable, CachedPayload]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[CachedPayload]:
+        """
+        캐시 조회
+
+        Args:
+            key: 캐시 키
+
+        Returns:
+            캐시된 응답 또는 None (없거나 만료된 경우)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry.created_at > self.ttl_seconds:
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        record_cache("chart", entry is not None)
+        return entry
+
+    def set(self, key: Hashable, payload: Any) -> CachedPayload:
+        """
+        응답 데이터를 JSON 바이트로 직렬화하여 캐시에 저장
+
+        Args:
+            key: 캐시 키
+            payload: JSON 직렬화 가능한 응답 데이터
+
+        Returns:
+            저장된 캐시 항목
+        """
+        with span("serialize"):
+            body = orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+        entry = CachedPayload(body=body, etag=make_etag(body), created_at=time.time())
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return entry
+
+    def clear(self):
+        """캐시 전체 삭제"""
+        with self._lock:
+            self._entries.clear()
+
+    def to_response(self, request: Request, entry: CachedPayload) -> Response:
+        """
+        캐시 항목을 HTTP 응답으로 변환 (If-None-Match 일치시 304)
+
+        Args:
+            request: 요청 객체
+            entry: 캐시 항목
+
+        Returns:
+            200 JSON 응답 또는 304 응답
+        """
+        headers = {
+            "ETag": entry.etag,
+            "Cache-Control": f"public, max-age={self.max_age}"
+        }
+
+        if etag_matches(request.headers.get("if-none-match"), entry.etag):
+            return Response(status_code=304, headers=headers)
+
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+def make_etag(body: bytes) -> str:
+    """응답 본문으로부터 강한(strong) ETag 생성"""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match 헤더가 ETag와 일치하는지 확인 (약한 비교)
+
+    Args:
+        if_none_match: 요청의 If-None-Match 헤더 값
+        etag: 현재 응답의 ETag
+
+    Returns:
+        일치 여부
+    """
+    if not if_none_match:
+        return False
+
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*':
+            return True
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+
+    return False
@@ -0,0 +1,398 @@
+"""
+경량 차트 스펙 생성 모듈
+plotly.graph_objects의 Figure 생성/검증 과정 없이 Plotly JSON 스펙을 직접 생성
+(app.py의 create_* 함수가 만드는 fig.to_json() 결과와 동일한 구조)
+"""
+import json
+import os
+import importlib.util
+from functools import lru_cache
+from typing import Dict, List, Any
+
+from metrics import timed
+
+
+CHART_CONFIGS = {
+    "revenue": {"title": "매출액 추이", "color": "#2E86AB", "unit": "억원"},
+    "profit": {"title": "순이익 추이", "color": "#A23B72", "unit": "억원"},
+    "assets": {"title": "총자산 추이", "color": "#F18F01", "unit": "억원"},
+    "equity": {"title": "자본 추이", "color": "#C73E1D", "unit": "억원"}
+}
+
+GRID_COLOR = 'rgba(128,128,128,0.2)'
+
+# 재무상태표 박스 차트 구성요소별 스타일 (막대 색상, 글자색, 글자크기)
+BOX_SEGMENT_STYLES = {
+    "유동자산": {"color": "#87CEEB", "text_color": "black", "text_size": 10},
+    "비유동자산": {"color": "#4682B4", "text_color": "white", "text_size": 10},
+    "총자산": {"color": "#4682B4", "text_color": "white", "text_size": 12},
+    "유동부채": {"color": "#FFB6C1", "text_color": "black", "text_size": 10},
+    "비유동부채": {"color": "#DC143C", "text_color": "white", "text_size": 10},
+    "총부채": {"color": "#DC143C", "text_color": "white", "text_size": 12},
+    "자본": {"color": "#32CD32", "text_color": "white", "text_size": 11}
+}
+
+# 비교 막대 차트의 연도별 색상 (오래된 연도부터, 마지막이 가장 최근 연도)
+PEER_YEAR_COLORS = ["#BFD7EA", "#91B6D4", "#5E92BE", "#2E86AB", "#1B4F72"]
+
+# 클라이언트측 차트 템플릿 버전 (템플릿 구조가 바뀌면 올려서 브라우저 캐시를 무효화)
+CHART_TEMPLATE_VERSION = 2
+
+
+@lru_cache(maxsize=None)
+def load_plotly_template(name: str) -> Dict[str, Any]:
+    """
+    Plotly 패키지에 포함된 레이아웃 템플릿 JSON 로드
+    plotly 모듈을 import하지 않고 패키지 데이터 파일만 읽음
+
+    Args:
+        name: 템플릿 이름 (plotly, plotly_white 등)
+
+    Returns:
+        템플릿 딕셔너리 (공유 객체이므로 수정하지 말 것)
+    """
+    spec = importlib.util.find_spec('plotly')
+    if spec is None or not spec.submodule_search_locations:
+        raise FileNotFoundError("plotly 패키지를 찾을 수 없습니다.")
+
+    package_dir = list(spec.submodule_search_locations)[0]
+    template_path = os.path.join(package_dir, 'package_data', 'templates', f'{name}.json')
+
+    with open(template_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@timed("chart_build")
+def financial_chart_spec(years: List[int], values: List[float], chart_type: str) -> Dict[str, Any]:
+    """
+    재무 라인 차트 스펙 생성 (create_financial_chart와 동일한 결과)
+
+    Args:
+        years: 연도 리스트
+        values: 값 리스트 (억원)
+        chart_type: 차트 종류 (revenue/profit/assets/equity)
+
+    Returns:
+        Plotly figure JSON 딕셔너리
+    """
+    if not years or not values:
+        raise ValueError("연도 또는 값 데이터가 비어있습니다")
+
+    if len(years) != len(values):
+        raise ValueError(f"연도 개수({len(years)})와 값 개수({len(values)})가 일치하지 않습니다")
+
+    config = CHART_CONFIGS.get(chart_type, CHART_CONFIGS["revenue"])
+
+    return {
+        "data": [{
+            "hovertemplate": f'<b>%{{x}}년</b><br>{config["title"]}: %{{y:,.0f}}{config["unit"]}<extra></extra>',
+            "line": {"color": config["color"], "width": 3},
+            "marker": {"color": config["color"], "size": 8},
+            "mode": "lines+markers",
+            "name": config["title"],
+            "x": list(years),
+            "y": list(values),
+            "type": "scatter"
+        }],
+        "layout": {
+            "template": load_plotly_template("plotly_white"),
+            "title": {
+                "font": {"size": 20, "color": "#2C3E50"},
+                "text": config["title"],
+                "x": 0.5,
+                "xanchor": "center"
+            },
+            "font": {"family": "Arial, sans-serif", "size": 12},
+            "xaxis": {
+                "title": {"text": "연도"},
+                "showgrid": True,
+                "gridwidth": 1,
+                "gridcolor": GRID_COLOR
+            },
+            "yaxis": {
+                "title": {"text": f"{config['title']} ({config['unit']})"},
+                "showgrid": True,
+                "gridwidth": 1,
+                "gridcolor": GRID_COLOR
+            },
+            "height": 400,
+            "hovermode": "x unified",
+            "plot_bgcolor": "rgba(0,0,0,0)",
+            "paper_bgcolor": "rgba(0,0,0,0)"
+        }
+    }
+
+
+@timed("chart_build")
+def financial_pie_chart_spec(metrics: Dict[str, float]) -> Dict[str, Any]:
+    """
+    자산 구성 파이 차트 스펙 생성 (create_financial_pie_chart와 동일한 결과)
+
+    Args:
+        metrics: 억원 단위로 변환된 재무지표 (total_liabilities, total_equity)
+
+    Returns:
+        Plotly figure JSON 딕셔너리
+    """
+    return {
+        "data": [{
+            "hovertemplate": '<b>%{label}</b><br>금액: %{value:,.0f}억원<br>비율: %{percent}<extra></extra>',
+            "labels": ['부채', '자본'],
+            "marker": {"colors": ['#FF6B6B', '#4ECDC4']},
+            "values": [metrics['total_liabilities'], metrics['total_equity']],
+            "type": "pie"
+        }],
+        "layout": {
+            "template": load_plotly_template("plotly_white"),
+            "title": {
+                "font": {"size": 20, "color": "#2C3E50"},
+                "text": "자산 구성",
+                "x": 0.5,
+                "xanchor": "center"
+            },
+            "font": {"family": "Arial, sans-serif", "size": 12},
+            "height": 400
+        }
+    }
+
+
+@timed("chart_build")
+def peer_comparison_chart_spec(names: List[str],
+                               years: List[int],
+                               values: List[List[Any]],
+                               title: str,
+                               unit: str) -> Dict[str, Any]:
+    """
+    회사 비교 막대 차트 스펙 생성 (회사별로 연도 막대를 묶어 표시)
+
+    Args:
+        names: 회사명 리스트
+        years: 연도 리스트
+        values: 연도별 회사 값 리스트 (values[연도 순번][회사 순번], 값이 없으면 None)
+        title: 지표 이름
+        unit: 단위 (억원, % 등)
+
+    Returns:
+        Plotly figure JSON 딕셔너리
+    """
+    colors = PEER_YEAR_COLORS[-len(years):] if len(years) <= len(PEER_YEAR_COLORS) else None
+
+    data = []
+    for index, (year, year_values) in enumerate(zip(years, values)):
+        trace = {
+            "hovertemplate": f'<b>%{{x}}</b><br>{year}년 {title}: %{{y:,.2f}}{unit}<extra></extra>',
+            "name": f"{year}년",
+            "x": list(names),
+            "y": list(year_values),
+            "type": "bar"
+        }
+        if colors:
+            trace["marker"] = {"color": colors[index]}
+        data.append(trace)
+
+    return {
+        "data": data,
+        "layout": {
+            "template": load_plotly_template("plotly_white"),
+            "title": {
+                "font": {"size": 20, "color": "#2C3E50"},
+                "text": f"{title} 비교",
+                "x": 0.5,
+                "xanchor": "center"
+            },
+            "font": {"family": "Arial, sans-serif", "size": 12},
+            "xaxis": {"title": {"text": ""}, "type": "category"},
+            "yaxis": {
+                "title": {"text": f"{title} ({unit})"},
+                "showgrid": True,
+                "gridwidth": 1,
+                "gridcolor": GRID_COLOR
+            },
+            "legend": {"orientation": "h", "x": 0.5, "y": -0.2, "xanchor": "center"},
+            "height": 450,
+            "barmode": "group",
+            "plot_bgcolor": "rgba(0,0,0,0)",
+            "paper_bgcolor": "rgba(0,0,0,0)"
+        }
+    }
+
+
+def _box_bar(category: str, label: str, amount: float, pct_text: str,
+             base: float = None) -> Dict[str, Any]:
+    """재무상태표 박스 차트의 막대 하나 생성"""
+    style = BOX_SEGMENT_STYLES[label]
+    bar = {}
+    if base is not None:
+        bar["base"] = [base]
+    bar.update({
+        "hovertemplate": f'{label}<br>%{{y:,.0f}}억원 ({pct_text})<extra></extra>',
+        "marker": {"color": style["color"]},
+        "name": f'{label} ({pct_text})',
+        "showlegend": True,
+        "text": [f'{label}<br>{amount:,.0f}억원<br>({pct_text})'],
+        "textfont": {"color": style["text_color"], "size": style["text_size"]},
+        "textposition": "inside",
+        "width": 0.8,
+        "x": [category],
+        "y": [amount],
+        "type": "bar"
+    })
+    return bar
+
+
+@timed("chart_build")
+def balance_sheet_box_chart_spec(metrics: Dict, year: int) -> Dict[str, Any]:
+    """
+    재무상태표 박스 차트 스펙 생성 (create_balance_sheet_box_chart와 동일한 결과)
+
+    Args:
+        metrics: 원 단위 재무지표
+        year: 기준 연도
+
+    Returns:
+        Plotly figure JSON 딕셔너리
+    """
+    # 데이터 추출 (억원 단위)
+    total_assets = metrics.get('total_assets', 0) / 100000000
+    total_liabilities = metrics.get('total_liabilities', 0) / 100000000
+    total_equity = metrics.get('total_equity', 0) / 100000000
+    current_assets = metrics.get('current_assets', 0) / 100000000
+    non_current_assets = metrics.get('non_current_assets', 0) / 100000000
+    current_liabilities = metrics.get('current_liabilities', 0) / 100000000
+    non_current_liabilities = metrics.get('non_current_liabilities', 0) / 100000000
+
+    def pct(amount):
+        return (amount / total_assets) * 100 if total_assets > 0 else 0
+
+    categories = ['자산', '부채 + 자본']
+    data = []
+
+    # === 좌측: 자산 부분 ===
+    if current_assets > 0 and non_current_assets > 0:
+        data.append(_box_bar(categories[0], '유동자산', current_assets, f'{pct(current_assets):.1f}%'))
+        data.append(_box_bar(categories[0], '비유동자산', non_current_assets,
+                             f'{pct(non_current_assets):.1f}%', base=current_assets))
+    else:
+        data.append(_box_bar(categories[0], '총자산', total_assets, '100%'))
+
+    # === 우측: 부채 + 자본 부분 ===
+    if current_liabilities > 0 and non_current_liabilities > 0:
+        data.append(_box_bar(categories[1], '유동부채', current_liabilities, f'{pct(current_liabilities):.1f}%'))
+        data.append(_box_bar(categories[1], '비유동부채', non_current_liabilities,
+                             f'{pct(non_current_liabilities):.1f}%', base=current_liabilities))
+        liability_base = current_liabilities + non_current_liabilities
+    elif total_liabilities > 0:
+        data.append(_box_bar(categories[1], '총부채', total_liabilities, f'{pct(total_liabilities):.1f}%'))
+        liability_base = total_liabilities
+    else:
+        liability_base = 0
+
+    # 자본 (우측 상단)
+    if total_equity > 0:
+        data.append(_box_bar(categories[1], '자본', total_equity,
+                             f'{pct(total_equity):.1f}%', base=liability_base))
+
+    return {
+        "data": data,
+        "layout": {
+            "template": load_plotly_template("plotly"),
+            "title": {
+                "font": {"size": 20, "color": "#2F4F4F"},
+                "text": f'{year}년 재무상태표 구조 (자산 = 부채 + 자본)',
+                "x": 0.5,
+                "y": 0.95,
+                "xanchor": "center"
+            },
+            "font": {"size": 12},
+            "legend": {
+                "font": {"size": 11},
+                "orientation": "h",
+                "x": 0.5,
+                "y": -0.15,
+                "xanchor": "center",
+                "bgcolor": "rgba(255,255,255,0.9)",
+                "bordercolor": "rgba(0,0,0,0.2)",
+                "borderwidth": 1
+            },
+            "margin": {"t": 120, "b": 120, "l": 80, "r": 80},
+            "xaxis": {
+                "tickfont": {"size": 18, "color": "#2F4F4F"},
+                "title": {"text": ""},
+                "showticklabels": True,
+                "categoryorder": "array",
+                "categoryarray": ['자산', '부채 + 자본']
+            },
+            "yaxis": {
+                "title": {"font": {"size": 16, "color": "#2F4F4F"}, "text": "금액 (억원)"},
+                "tickfont": {"size": 14, "color": "#2F4F4F"},
+                "showgrid": True,
+                "gridwidth": 1,
+                "gridcolor": "rgb(240, 240, 240)"
+            },
+            "showlegend": True,
+            "height": 600,
+            "barmode": "stack",
+            "plot_bgcolor": "rgba(248,249,250,0.8)",
+            "paper_bgcolor": "white",
+            "annotations": [
+                {
+                    "align": "center",
+                    "bgcolor": "rgba(255,255,255,0.8)",
+                    "bordercolor": "rgba(0,0,0,0.2)",
+                    "borderwidth": 1,
+                    "font": {"color": "#2F4F4F", "size": 14},
+                    "showarrow": False,
+                    "text": f"<b>{total_assets:,.0f}억원 = {total_liabilities:,.0f}억원 + {total_equity:,.0f}억원</b>",
+                    "x": 0.5,
+                    "xref": "paper",
+                    "y": 1.12,
+                    "yref": "paper"
+                },
+                {
+                    "bgcolor": "rgba(255,255,255,0.9)",
+                    "bordercolor": "rgba(0,0,0,0.3)",
+                    "borderpad": 10,
+                    "borderwidth": 2,
+                    "font": {"color": "#2F4F4F", "family": "Arial Black", "size": 48},
+                    "showarrow": False,
+                    "text": "<b>=</b>",
+                    "x": 0.5,
+                    "xref": "paper",
+                    "y": 0.5,
+                    "yref": "paper"
+                }
+            ]
+        }
+    }
+
+
+def chart_templates() -> Dict[str, Any]:
+    """
+    클라이언트측 렌더링용 차트 템플릿 생성
+    compact 응답은 숫자 시리즈와 템플릿 ID만 전달하고, 브라우저가 이 템플릿으로 차트를 조립함
+    레이아웃은 서버 스펙 생성 함수에서 그대로 가져오며 제목 등 가변 텍스트는 클라이언트에서 채움
+
+    Returns:
+        버전과 템플릿 ID별 레이아웃/스타일 딕셔너리
+    """
+    return {
+        "version": CHART_TEMPLATE_VERSION,
+        "templates": {
+            "line": {
+                "configs": CHART_CONFIGS,
+                "layout": financial_chart_spec([0], [0], "revenue")["layout"]
+            },
+            "pie": {
+                "trace": financial_pie_chart_spec({'total_liabilities': 0, 'total_equity': 0})["data"][0],
+                "layout": financial_pie_chart_spec({'total_liabilities': 0, 'total_equity': 0})["layout"]
+            },
+            "balance_box": {
+                "segments": BOX_SEGMENT_STYLES,
+                "layout": balance_sheet_box_chart_spec({}, 0)["layout"]
+            },
+            "peer_bar": {
+                "year_colors": PEER_YEAR_COLORS,
+                "layout": peer_comparison_chart_spec([], [], [], "", "")["layout"]
+            }
+        }
+    }
@@ -0,0 +1,155 @@
+"""
+응답 압축 모듈
+Accept-Encoding에 따라 br(brotli 패키지가 있을 때) 또는 gzip으로 응답 본문을 압축하는 ASGI 미들웨어
+
+- 본문이 minimum_size 미만이거나 압축 대상이 아닌 형식(이미지 등), 이미 인코딩된 응답(미리 압축한 정적 파일)은 그대로 전달
+- 스트리밍 응답(NDJSON/SSE)은 조각마다 flush하여 섹션이 도착하는 즉시 브라우저에 전달
+- 압축한 응답의 강한 ETag는 약한 ETag(W/)로 바꿈 (인코딩별로 본문이 다르므로)
+"""
+import os
+import zlib
+from typing import Optional, Set
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli  # 선택 의존성 (없으면 gzip만 사용)
+except ImportError:
+    brotli = None
+
+# 이 크기(바이트) 미만의 응답은 압축하지 않음 (헤더/CPU 비용이 더 큼)
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "4"))
+
+# 압축할 Content-Type (접두어)
+COMPRESSIBLE_TYPES = (
+    "text/", "application/json", "application/javascript", "application/x-ndjson",
+    "application/xml", "image/svg+xml"
+)
+
+
+def accepted_encodings(accept_encoding: str) -> Set[str]:
+    """Accept-Encoding 헤더에서 허용된 인코딩 (q=0은 제외)"""
+    encodings = set()
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        quality = params.strip()
+        if quality.startswith("q=") and quality[2:].strip() in ("0", "0.0", "0.00", "0.000"):
+            continue
+        if name:
+            encodings.add(name.strip())
+    return encodings
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """응답에 사용할 인코딩 (br > gzip, 둘 다 허용되지 않으면 None)"""
+    encodings = accepted_encodings(accept_encoding)
+    if brotli is not None and "br" in encodings:
+        return "br"
+    if "gzip" in encodings or "*" in encodings:
+        return "gzip"
+    return None
+
+
+def weak_etag(etag: str) -> str:
+    """약한 ETag로 변환 (따옴표 없이 만든 ETag도 형식에 맞게 감쌈)"""
+    return 'W/"' + etag.strip('"') + '"'
+
+
+def is_compressible(content_type: str) -> bool:
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class StreamCompressor:
+    """조각 단위 압축기 (finish가 아니면 지금까지의 입력을 모두 내보내도록 flush)"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            # wbits 31: gzip 헤더/트레일러 포함
+            self._zlib = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, finish: bool) -> bytes:
+        if self.encoding == "br":
+            output = self._brotli.process(data) if data else b""
+            return output + (self._brotli.finish() if finish else self._brotli.flush())
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_FINISH if finish else zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    """gzip/brotli 응답 압축 ASGI 미들웨어"""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_SIZE):
+        """
+        Args:
+            app: 감쌀 ASGI 앱
+            minimum_size: 압축할 최소 본문 크기(바이트)
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        start_message: Optional[Message] = None
+        compressor: Optional[StreamCompressor] = None
+
+        async def send_compressed(message: Message):
+            nonlocal start_message, compressor
+
+            if message["type"] == "http.response.start":
+                # 첫 본문 조각을 보고 압축 여부를 정할 때까지 헤더 전송을 미룸
+                start_message = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            if start_message is None:
+                # 헤더를 보낸 뒤의 본문 조각
+                if compressor is not None:
+                    more_body = message.get("more_body", False)
+                    message = {"type": "http.response.body",
+                               "body": compressor.compress(message.get("body", b""), not more_body),
+                               "more_body": more_body}
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            headers = MutableHeaders(scope=start)
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            compressible = (is_compressible(headers.get("content-type", ""))
+                            and "content-encoding" not in headers
+                            and start["status"] not in (204, 304))
+            if compressible and "accept-encoding" not in headers.get("vary", "").lower():
+                headers.add_vary_header("Accept-Encoding")
+
+            content_length = headers.get("content-length")
+            size = int(content_length) if content_length is not None else (None if more_body else len(body))
+            if not (compressible and encoding and (size is None or size >= self.minimum_size)):
+                await send(start)
+                await send(message)
+                return
+
+            compressor = StreamCompressor(encoding)
+            body = compressor.compress(body, not more_body)
+            headers["Content-Encoding"] = encoding
+            del headers["Content-Length"]
+            if not more_body:
+                headers["Content-Length"] = str(len(body))
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = weak_etag(etag)
+
+            await send(start)
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
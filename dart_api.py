@@ -2,33 +2,169 @@
 DART Open API를 사용한 공시검색 및 데이터 다운로드 모듈
 """
 import os
+import hashlib
 import requests
 import json
-import pandas as pd
 import zipfile
 import io
+import time
+import threading
+import contextvars
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict, List, Any
+from typing import TYPE_CHECKING, Optional, Dict, List, Any, Iterable, Iterator, Tuple
 from dotenv import load_dotenv
 
+from dart_cache import NoDataCache, StatementCache, is_no_data, mark_stale, statement_key
+from financial_series import QUARTERLY_REPORTS
+from logging_utils import get_logger
+from metrics import registry, span, timed
+from resilience import CircuitBreaker, CircuitOpenError, RequestHedger
+from shared_cache import CacheBackend, default_cache_backend
+
+if TYPE_CHECKING:
+    import pandas as pd
+
 # 환경변수 로드
 load_dotenv()
 
+logger = get_logger("dart_api")
+
+# DART 호출 수 (API별, 응답 상태코드별: 000 정상, 013 데이터 없음, 020 한도 초과 등)
+DART_REQUESTS = registry.counter("dart_requests_total", "DART API 호출 수", labelnames=("api", "status"))
+
+# 응답은 받았지만 DART 쪽 장애로 보는 상태코드 (020: 요청 제한 초과, 800: 시스템 점검, 900: 정의되지 않은 오류)
+DART_OUTAGE_STATUSES = ("020", "800", "900")
+
+# 사업보고서 코드
+ANNUAL_REPORT_CODE = '11011'
+
+# 다중회사 주요계정 API 한 번에 조회할 수 있는 최대 회사 수
+MULTI_ACCOUNT_MAX_CORPS = 100
+
+# 사업보고서 한 건에 담긴 기간 (필드 접두어, 사업연도로부터 몇 년 전인지): 당기, 전기, 전전기
+REPORT_PERIODS = (("thstrm", 0), ("frmtrm", 1), ("bfefrmtrm", 2))
+PERIOD_SUFFIXES = ("_nm", "_dt", "_amount")
+
+
+def plan_report_years(years: Iterable[int],
+                      latest_report_year: int,
+                      exclude: Iterable[int] = (),
+                      periods: int = len(REPORT_PERIODS)) -> List[int]:
+    """
+    연도 목록을 모두 덮는 최소한의 보고서 사업연도 목록
+    보고서 하나가 periods개 연도(당기, 전기, 전전기)를 담으므로 최신 연도부터 덮어 내려감
+    (예: 2019~2023년 → [2023, 2020] 2건)
+    
+    Args:
+        years: 필요한 연도 목록
+        latest_report_year: 조회할 수 있는 가장 최근 보고서 사업연도
+        exclude: 이미 조회했거나 데이터가 없는 보고서 사업연도
+        periods: 보고서 한 건이 담는 연도 수 (분기보고서 등은 1)
+        
+    Returns:
+        조회할 보고서 사업연도 목록 (최신순)
+    """
+    exclude = set(exclude)
+    plan = []
+    covered = set()
+    
+    for year in sorted(set(years), reverse=True):
+        if year in covered:
+            continue
+        # 해당 연도를 담는 보고서 중 가장 오래된 것이 아래쪽 연도를 가장 많이 덮음
+        for report_year in range(year, year + periods):
+            if report_year not in exclude and report_year <= latest_report_year:
+                plan.append(report_year)
+                covered.update(range(report_year - periods + 1, report_year + 1))
+                break
+    
+    return plan
+
+
+def split_report_periods(rows: List[Dict[str, Any]],
+                         report_year: int,
+                         periods: int = len(REPORT_PERIODS)) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    보고서 한 건의 계정 목록을 기간별 계정 목록으로 분리
+    전기/전전기 금액을 당기 금액 필드로 옮겨 해당 연도 보고서를 조회한 것과 같은 형태로 만듦
+    
+    Args:
+        rows: 단일회사 주요계정 응답의 list
+        report_year: 보고서 사업연도
+        periods: 사용할 기간 수
+        
+    Returns:
+        {연도: 계정 목록} (금액이 하나도 없는 기간은 제외)
+    """
+    prefixes = [prefix for prefix, _ in REPORT_PERIODS[:periods]]
+    split = {}
+    
+    for index, (prefix, offset) in enumerate(REPORT_PERIODS[:periods]):
+        if not any(row.get(f"{prefix}_amount") for row in rows):
+            continue
+        
+        shifted = prefixes[index:] + [None] * index
+        period_rows = []
+        for row in rows:
+            period_row = dict(row, bsns_year=str(report_year - offset))
+            for target, source in zip(prefixes, shifted):
+                for suffix in PERIOD_SUFFIXES:
+                    period_row[target + suffix] = row.get(source + suffix, '') if source else ''
+            period_rows.append(period_row)
+        split[report_year - offset] = period_rows
+    
+    return split
+
+
 class DartAPI:
     """DART Open API 클래스"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self,
+                 api_key: Optional[str] = None,
+                 base_url: Optional[str] = None,
+                 no_data_cache: Optional[NoDataCache] = None,
+                 statement_cache: Optional[StatementCache] = None,
+                 breaker: Optional[CircuitBreaker] = None,
+                 timeout: Optional[float] = None,
+                 hedge_delay: Optional[float] = None,
+                 cache_backend: Optional[CacheBackend] = None):
         """
         DART API 초기화
         
         Args:
             api_key: DART API 인증키. 없으면 환경변수에서 가져옴
+            base_url: API 주소. 없으면 환경변수 DART_API_BASE_URL 또는 DART 공식 주소 (벤치마크용 로컬 서버 지정)
+            no_data_cache: 재무제표 "데이터 없음" 응답 캐시 (없으면 기본 메모리 캐시 사용)
+            statement_cache: 재무제표 응답 캐시 (없으면 기본 메모리 캐시 사용)
+            breaker: DART 호출 회로 차단기 (없으면 기본 설정으로 생성)
+            timeout: 요청 제한시간(초). 없으면 환경변수 DART_TIMEOUT 또는 10초
+            hedge_delay: 이 시간(초) 안에 응답이 없으면 같은 요청을 한 번 더 보냄.
+                         없으면 환경변수 DART_HEDGE_DELAY (기본 0: 사용 안 함, 하루 호출 한도를 쓰므로 선택 사용)
+            cache_backend: 캐시 저장소 겸 워커 간 단일 실행 잠금 (없으면 프로세스 기본 저장소,
+                           워커가 여러 개면 SQLite 공유 파일)
         """
         self.api_key = api_key or os.getenv('DART_API_KEY')
         if not self.api_key:
             raise ValueError("API 키가 필요합니다. 환경변수 DART_API_KEY를 설정하거나 직접 전달해주세요.")
         
-        self.base_url = "https://opendart.fss.or.kr/api"
+        self.base_url = (base_url or os.getenv('DART_API_BASE_URL') or "https://opendart.fss.or.kr/api").rstrip('/')
+        self.cache_backend = cache_backend if cache_backend is not None else default_cache_backend()
+        self.no_data_cache = no_data_cache if no_data_cache is not None else NoDataCache(backend=self.cache_backend)
+        self.statement_cache = (statement_cache if statement_cache is not None
+                                else StatementCache(backend=self.cache_backend))
+        self.breaker = breaker if breaker is not None else CircuitBreaker("dart")
+        self.timeout = timeout if timeout is not None else float(os.getenv('DART_TIMEOUT', '10'))
+        
+        if hedge_delay is None:
+            hedge_delay = float(os.getenv('DART_HEDGE_DELAY', '0'))
+        self.hedger = RequestHedger("dart", hedge_delay) if hedge_delay > 0 else None
+        
+        # 지난 데이터로 응답한 재무제표의 백그라운드 갱신 (같은 항목은 한 번만, 워커 간에는 임대 잠금)
+        self._refresh_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="dart-refresh")
+        self._refreshing: set = set()
+        self._refresh_lock = threading.Lock()
         
     def search_disclosure(self,
                          corp_code: Optional[str] = None,
@@ -86,12 +222,7 @@ class DartAPI:
         if corp_cls:
             params['corp_cls'] = corp_cls
             
-        try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            raise Exception(f"API 요청 실패: {e}")
+        return self._request_json("list", url, params, "API 요청 실패")
     
     def download_corp_codes(self, save_json: bool = True) -> Dict[str, Any]:
         """
@@ -161,6 +292,23 @@ class DartAPI:
         except Exception as e:
             raise Exception(f"회사 코드 처리 실패: {e}")
     
+    def get_company_overview(self, corp_code: str) -> Dict[str, Any]:
+        """
+        기업개황 조회 API 호출
+        
+        Args:
+            corp_code: 고유번호 (8자리)
+            
+        Returns:
+            기업개황 (corp_cls: 법인구분 Y 유가/K 코스닥/N 코넥스/E 기타, induty_code: 업종코드(KSIC),
+            est_dt: 설립일, acc_mt: 결산월 등)
+        """
+        params = {
+            'crtfc_key': self.api_key,
+            'corp_code': corp_code
+        }
+        return self._request_json("company", f"{self.base_url}/company.json", params, "기업개황 조회 실패")
+    
     def get_financial_statements(self, 
                                corp_code: str,
                                bsns_year: str,
@@ -178,8 +326,45 @@ class DartAPI:
                        11011: 사업보고서
                        
         Returns:
-            재무제표 데이터
+            재무제표 데이터 (최근에 데이터 없음으로 확인된 조회는 DART 호출 없이 같은 응답 반환).
+            유효시간이 지난 응답은 DART를 기다리지 않고 바로 반환하고 백그라운드에서 갱신
+            (DART 회로가 열려 있으면 갱신하지 않음)
         """
+        cached = self.no_data_cache.get(corp_code, bsns_year, reprt_code)
+        if cached is not None:
+            return cached
+        
+        stored = self.statement_cache.get(corp_code, bsns_year, reprt_code)
+        if stored is not None:
+            result, age = stored
+            if self.statement_cache.is_fresh(age):
+                return result
+            if self.breaker.is_open:
+                mark_stale(age, "circuit_open")
+            else:
+                mark_stale(age, "revalidate")
+                self._revalidate_statements(corp_code, bsns_year, reprt_code)
+            return result
+        
+        # 같은 조회가 동시에 들어오면 (다른 워커 포함) 한 곳만 DART를 호출하고 나머지는 저장된 결과 사용
+        return self.cache_backend.single_flight(
+            "fnlttSinglAcnt:" + statement_key(corp_code, bsns_year, reprt_code),
+            lambda: self._peek_financial_statements(corp_code, bsns_year, reprt_code),
+            lambda: self._fetch_financial_statements(corp_code, bsns_year, reprt_code),
+            lease_seconds=self.timeout * 2,
+            wait_seconds=self.timeout * 2
+        )
+    
+    def _peek_financial_statements(self, corp_code: str, bsns_year: str, reprt_code: str) -> Optional[Dict[str, Any]]:
+        """다른 요청이 저장한 재무제표 (데이터 없음 응답 포함), 없으면 None"""
+        cached = self.no_data_cache.peek(corp_code, bsns_year, reprt_code)
+        if cached is not None:
+            return cached
+        stored = self.statement_cache.peek(corp_code, bsns_year, reprt_code)
+        return stored[0] if stored is not None else None
+    
+    def _fetch_financial_statements(self, corp_code: str, bsns_year: str, reprt_code: str) -> Dict[str, Any]:
+        """단일회사 주요계정을 DART에서 조회하고 결과에 따라 캐시 갱신"""
         url = f"{self.base_url}/fnlttSinglAcnt.json"
         
         params = {
@@ -189,12 +374,91 @@ class DartAPI:
             'reprt_code': reprt_code
         }
         
+        result = self._request_json("fnlttSinglAcnt", url, params, "재무제표 조회 실패")
+        if is_no_data(result):
+            self.no_data_cache.set(corp_code, bsns_year, reprt_code, result)
+            self.statement_cache.discard(corp_code, bsns_year, reprt_code)
+        elif result.get('status') == '000':
+            self.statement_cache.set(corp_code, bsns_year, reprt_code, result)
+        return result
+    
+    def _revalidate_statements(self, corp_code: str, bsns_year: str, reprt_code: str):
+        """재무제표 백그라운드 갱신 예약 (이미 갱신 중이면 무시)"""
+        key = (corp_code, str(bsns_year), reprt_code)
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        
         try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
+            self._refresh_executor.submit(self._refresh_statements, key)
+        except RuntimeError:
+            with self._refresh_lock:
+                self._refreshing.discard(key)
+    
+    def _refresh_statements(self, key: Tuple[str, str, str]):
+        lease_name = "refresh:" + statement_key(*key)
+        token = self.cache_backend.acquire_lease(lease_name, self.timeout * 2)
+        try:
+            if token is None:
+                # 다른 워커가 갱신 중
+                return
+            self._fetch_financial_statements(*key)
+        except Exception as e:
+            logger.info("♻️ %s %s년 재무제표 갱신 실패 (지난 데이터 유지): %s", key[0], key[1], e)
+        finally:
+            if token is not None:
+                self.cache_backend.release_lease(lease_name, token)
+            with self._refresh_lock:
+                self._refreshing.discard(key)
+    
+    def _request_json(self, api: str, url: str, params: Dict[str, Any], error_message: str) -> Dict[str, Any]:
+        """
+        DART JSON API 호출 (소요 시간과 응답 상태코드를 지표로 기록)
+        회로 차단기가 열려 있으면 요청하지 않고 바로 실패하고, 느린 요청은 헤지 요청을 추가함
+        
+        Args:
+            api: 지표 라벨용 API 이름
+            url: 요청 URL
+            params: 요청 파라미터
+            error_message: 요청 실패시 예외 메시지 앞부분
+            
+        Returns:
+            응답 JSON
+            
+        Raises:
+            CircuitOpenError: DART 오류/지연이 계속되어 호출을 잠시 중단한 경우
+        """
+        if not self.breaker.allow():
+            DART_REQUESTS.inc(api=api, status="circuit_open")
+            raise CircuitOpenError(f"{error_message}: DART 응답 오류/지연이 계속되어 잠시 호출을 중단했습니다")
+        
+        # 회로 차단기에는 실제 요청 시간만 기록 (헤지 실행 스레드를 기다린 시간 제외, 헤지가 이기면 그 요청 시간)
+        durations: List[float] = []
+        
+        def fetch() -> Dict[str, Any]:
+            fetch_started = time.perf_counter()
+            try:
+                response = requests.get(url, params=params, timeout=self.timeout)
+                response.raise_for_status()
+                return response.json()
+            finally:
+                durations.append(time.perf_counter() - fetch_started)
+        
+        started = time.perf_counter()
+        success = False
+        try:
+            with span("dart_fetch"):
+                result = self.hedger.call(fetch) if self.hedger else fetch()
+            success = str(result.get('status')) not in DART_OUTAGE_STATUSES
         except requests.RequestException as e:
-            raise Exception(f"재무제표 조회 실패: {e}")
+            DART_REQUESTS.inc(api=api, status="http_error")
+            raise Exception(f"{error_message}: {e}")
+        finally:
+            self.breaker.record(success, min(durations) if durations else time.perf_counter() - started)
+        
+        DART_REQUESTS.inc(api=api, status=str(result.get('status', 'unknown')))
+        return result
     
     def get_multiple_year_financials(self,
                                    corp_code: str,
@@ -202,7 +466,7 @@ class DartAPI:
                                    end_year: int,
                                    reprt_code: str = '11011') -> Dict[str, Any]:
         """
-        여러 연도의 재무제표 데이터 조회
+        여러 연도의 재무제표 데이터 조회 (사업보고서는 전기/전전기 금액을 이용해 연도 수의 1/3만 조회)
         
         Args:
             corp_code: 고유번호
@@ -211,24 +475,229 @@ class DartAPI:
             reprt_code: 보고서 코드 (기본값: 사업보고서)
             
         Returns:
-            연도별 재무제표 데이터
+            연도별 재무제표 데이터 (데이터가 없는 연도는 빈 리스트)
+        """
+        series, _ = self.get_financial_series(corp_code, range(start_year, end_year + 1), reprt_code)
+        return {str(year): series.get(year, []) for year in range(start_year, end_year + 1)}
+    
+    def get_financial_series(self,
+                             corp_code: str,
+                             years: Iterable[int],
+                             reprt_code: str = ANNUAL_REPORT_CODE) -> Tuple[Dict[int, List[Dict]], List[int]]:
+        """
+        여러 연도의 재무제표를 최소한의 보고서 조회로 수집
+        사업보고서는 당기/전기/전전기 금액을 담으므로 plan_report_years로 고른 보고서만 동시에 조회하고,
+        데이터가 없어 비는 연도는 다른 보고서로 다시 계획. 같은 연도가 여러 보고서에 있으면
+        정정된 값을 반영하도록 가장 최근 보고서의 금액 사용
+        
+        Args:
+            corp_code: 고유번호
+            years: 필요한 연도 목록
+            reprt_code: 보고서 코드 (사업보고서가 아니면 연도별로 조회)
+            
+        Returns:
+            ({연도: 계정 목록}, 오류로 조회하지 못한 보고서 사업연도 목록)
+        """
+        years = sorted(set(years))
+        if not years:
+            return {}, []
+        
+        periods = len(REPORT_PERIODS) if reprt_code == ANNUAL_REPORT_CODE else 1
+        found: Dict[int, Tuple[int, List[Dict]]] = {}
+        tried: set = set()
+        failed: List[int] = []
+        
+        def fetch(report_year: int) -> Optional[List[Dict]]:
+            try:
+                result = self.get_financial_statements(corp_code, str(report_year), reprt_code)
+            except Exception as e:
+                logger.warning("%s %s년 데이터 조회 오류: %s", corp_code, report_year, e)
+                failed.append(report_year)
+                return None
+            if result['status'] != '000':
+                logger.debug("%s %s년 데이터 조회 실패: %s", corp_code, report_year, result['message'])
+                return None
+            return result.get('list', [])
+        
+        while True:
+            plan = plan_report_years([year for year in years if year not in found], years[-1], tried, periods)
+            if not plan:
+                break
+            tried.update(plan)
+            
+            if len(plan) == 1:
+                responses = [fetch(plan[0])]
+            else:
+                # 요청별 단계 시간 집계가 이어지도록 현재 컨텍스트에서 실행
+                with ThreadPoolExecutor(max_workers=len(plan)) as executor:
+                    futures = [executor.submit(contextvars.copy_context().run, fetch, year) for year in plan]
+                    responses = [future.result() for future in futures]
+            
+            for report_year, rows in zip(plan, responses):
+                for year, period_rows in split_report_periods(rows or [], report_year, periods).items():
+                    if year in years and (year not in found or found[year][0] < report_year):
+                        found[year] = (report_year, period_rows)
+        
+        return {year: found[year][1] for year in years if year in found}, failed
+    
+    def get_peer_financials(self,
+                            corp_codes: List[str],
+                            years: Iterable[int],
+                            reprt_code: str = ANNUAL_REPORT_CODE,
+                            max_workers: int = 8) -> Tuple[Dict[str, Dict[int, List[Dict]]], List[str]]:
+        """
+        여러 회사의 여러 연도 재무제표를 한꺼번에 수집
+        캐시에 없는 회사는 다중회사 주요계정 API로 보고서 사업연도마다 한 번에 조회해 회사별 캐시에 저장한 뒤,
+        회사별로 get_financial_series를 실행 (대부분 캐시 적중, 데이터가 없어 다시 계획한 연도만 개별 조회)
+        
+        Args:
+            corp_codes: 고유번호 목록
+            years: 필요한 연도 목록
+            reprt_code: 보고서 코드
+            max_workers: 동시에 처리할 최대 회사 수
+            
+        Returns:
+            ({고유번호: {연도: 계정 목록}}, 오류로 일부 연도를 조회하지 못한 고유번호 목록)
+        """
+        years = sorted(set(years))
+        corp_codes = list(dict.fromkeys(corp_codes))
+        if not years or not corp_codes:
+            return {}, []
+        
+        periods = len(REPORT_PERIODS) if reprt_code == ANNUAL_REPORT_CODE else 1
+        report_years = plan_report_years(years, years[-1], periods=periods)
+        
+        # 요청별 단계 시간 집계가 이어지도록 현재 컨텍스트에서 실행
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(report_years)))) as executor:
+            futures = [executor.submit(contextvars.copy_context().run, self._prefetch_multi_company_statements,
+                                       corp_codes, str(year), reprt_code)
+                       for year in report_years]
+            for future in futures:
+                future.result()
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(corp_codes)))) as executor:
+            futures = [executor.submit(contextvars.copy_context().run, self.get_financial_series,
+                                       corp_code, years, reprt_code)
+                       for corp_code in corp_codes]
+            results = [future.result() for future in futures]
+        
+        financials = {corp_code: series for corp_code, (series, _) in zip(corp_codes, results)}
+        failed = [corp_code for corp_code, (_, failed_years) in zip(corp_codes, results) if failed_years]
+        return financials, failed
+    
+    def _prefetch_multi_company_statements(self, corp_codes: List[str], bsns_year: str, reprt_code: str):
+        """
+        캐시에 없는 회사들의 재무제표를 다중회사 주요계정 API로 조회해 회사별 캐시에 저장
+        (조회 실패는 get_financial_series의 개별 조회로 대체되므로 기록만 함)
+        """
+        missing = [corp_code for corp_code in corp_codes
+                   if self._peek_financial_statements(corp_code, bsns_year, reprt_code) is None]
+        
+        for start in range(0, len(missing), MULTI_ACCOUNT_MAX_CORPS):
+            chunk = missing[start:start + MULTI_ACCOUNT_MAX_CORPS]
+            digest = hashlib.sha1(','.join(chunk).encode('utf-8')).hexdigest()
+            
+            def lookup(chunk=chunk) -> Optional[bool]:
+                if all(self._peek_financial_statements(corp_code, bsns_year, reprt_code) is not None
+                       for corp_code in chunk):
+                    return True
+                return None
+            
+            # 같은 회사 묶음을 동시에 비교하는 요청은 (다른 워커 포함) 한 곳만 DART를 호출
+            try:
+                self.cache_backend.single_flight(
+                    f"fnlttMultiAcnt:{bsns_year}:{reprt_code}:{digest}",
+                    lookup,
+                    lambda chunk=chunk: self._fetch_multi_company_statements(chunk, bsns_year, reprt_code),
+                    lease_seconds=self.timeout * 2,
+                    wait_seconds=self.timeout * 2
+                )
+            except Exception as e:
+                logger.warning("%s년 다중회사 재무제표 조회 오류 (%d개사, 개별 조회로 대체): %s",
+                               bsns_year, len(chunk), e)
+    
+    def _fetch_multi_company_statements(self, corp_codes: List[str], bsns_year: str, reprt_code: str) -> bool:
+        """
+        다중회사 주요계정을 DART에서 조회해 회사별 재무제표 캐시에 저장
+        응답에 없는 회사는 단일회사 조회와 같이 데이터 없음으로 캐시 (공시 일정에 따라 만료)
+        """
+        params = {
+            'crtfc_key': self.api_key,
+            'corp_code': ','.join(corp_codes),
+            'bsns_year': bsns_year,
+            'reprt_code': reprt_code
+        }
+        result = self._request_json("fnlttMultiAcnt", f"{self.base_url}/fnlttMultiAcnt.json", params,
+                                    "다중회사 재무제표 조회 실패")
+        if result.get('status') != '000' and not is_no_data(result):
+            return False
+        
+        rows_by_corp: Dict[str, List[Dict]] = {}
+        for row in result.get('list', []):
+            rows_by_corp.setdefault(row.get('corp_code'), []).append(row)
+        
+        for corp_code in corp_codes:
+            rows = rows_by_corp.get(corp_code)
+            if rows:
+                self.statement_cache.set(corp_code, bsns_year, reprt_code,
+                                         {'status': '000', 'message': result.get('message', '정상'), 'list': rows})
+            else:
+                self.no_data_cache.set(corp_code, bsns_year, reprt_code,
+                                       {'status': '013', 'message': '조회된 데이타가 없습니다.'})
+        return True
+    
+    def get_quarterly_statements(self,
+                                 corp_code: str,
+                                 years: Iterable[int],
+                                 max_workers: int = 8) -> Tuple[Dict[Tuple[int, int], List[Dict]], List[Tuple[int, int]]]:
+        """
+        여러 연도의 1분기/반기/3분기/사업보고서를 동시에 수집
+        사업보고서는 get_financial_series로 연간 차트와 같은 보고서(1/3만 조회)를 공유하고,
+        분기/반기보고서는 연도별로 조회. 모두 get_financial_statements를 거치므로 캐시가 그대로 적용됨
+        
+        Args:
+            corp_code: 고유번호
+            years: 필요한 연도 목록
+            max_workers: 동시에 조회할 최대 보고서 수
+            
+        Returns:
+            ({(연도, 분기): 계정 목록}, 오류로 조회하지 못한 (연도, 분기) 목록)
         """
-        all_data = {}
+        years = sorted(set(years))
+        if not years:
+            return {}, []
+        
+        found: Dict[Tuple[int, int], List[Dict]] = {}
+        failed: List[Tuple[int, int]] = []
         
-        for year in range(start_year, end_year + 1):
+        def fetch(year: int, reprt_code: str, quarter: int):
             try:
                 result = self.get_financial_statements(corp_code, str(year), reprt_code)
-                if result['status'] == '000':
-                    all_data[str(year)] = result.get('list', [])
-                else:
-                    print(f"{year}년 데이터 조회 실패: {result['message']}")
-                    all_data[str(year)] = []
             except Exception as e:
-                print(f"{year}년 데이터 조회 오류: {e}")
-                all_data[str(year)] = []
+                logger.warning("%s %s년 %d분기 데이터 조회 오류: %s", corp_code, year, quarter, e)
+                failed.append((year, quarter))
+                return
+            if result['status'] == '000':
+                found[(year, quarter)] = result.get('list', [])
+        
+        def fetch_annual():
+            annual, annual_failed = self.get_financial_series(corp_code, years)
+            for year, rows in annual.items():
+                found[(year, 4)] = rows
+            failed.extend((year, 4) for year in annual_failed)
+        
+        # 요청별 단계 시간 집계가 이어지도록 현재 컨텍스트에서 실행
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(contextvars.copy_context().run, fetch_annual)]
+            futures += [executor.submit(contextvars.copy_context().run, fetch, year, reprt_code, quarter)
+                        for year in years
+                        for reprt_code, quarter in QUARTERLY_REPORTS if reprt_code != ANNUAL_REPORT_CODE]
+            for future in futures:
+                future.result()
         
-        return all_data
+        return found, failed
     
+    @timed("parse")
     def parse_financial_data(self, financial_data: List[Dict]) -> Dict[str, Dict]:
         """
         재무제표 데이터를 구조화된 형태로 파싱
@@ -249,6 +718,7 @@ class DartAPI:
             account_nm = item.get('account_nm', '')  # 계정명
             thstrm_amount = item.get('thstrm_amount', '0')  # 당기금액
             frmtrm_amount = item.get('frmtrm_amount', '0')  # 전기금액
+            bfefrmtrm_amount = item.get('bfefrmtrm_amount', '')  # 전전기금액
             
             if sj_div in ['BS', 'IS'] and account_nm:
                 if account_nm not in parsed_data[sj_div]:
@@ -262,15 +732,23 @@ class DartAPI:
                     current_amount = 0
                     previous_amount = 0
                 
+                try:
+                    before_previous_amount = int(bfefrmtrm_amount.replace(',', '')) if bfefrmtrm_amount else 0
+                except (ValueError, AttributeError):
+                    before_previous_amount = 0
+                
                 parsed_data[sj_div][account_nm] = {
                     'current': current_amount,
                     'previous': previous_amount,
+                    'before_previous': before_previous_amount,
                     'current_formatted': thstrm_amount,
-                    'previous_formatted': frmtrm_amount
+                    'previous_formatted': frmtrm_amount,
+                    'before_previous_formatted': bfefrmtrm_amount
                 }
         
         return parsed_data
     
+    @timed("metrics")
     def get_key_financial_metrics(self, parsed_data: Dict[str, Dict]) -> Dict[str, Any]:
         """
         주요 재무지표 계산
@@ -391,6 +869,7 @@ class DartAPI:
                            corp_code: Optional[str] = None,
                            bgn_de: Optional[str] = None,
                            end_de: Optional[str] = None,
+                           max_workers: int = 4,
                            **kwargs) -> List[Dict[str, Any]]:
         """
         모든 페이지의 공시 정보를 가져옴
@@ -399,16 +878,46 @@ class DartAPI:
             corp_code: 고유번호
             bgn_de: 시작일
             end_de: 종료일
+            max_workers: 동시에 조회할 최대 페이지 수
             **kwargs: 기타 검색 옵션
             
         Returns:
             모든 공시 정보 리스트
         """
         all_disclosures = []
-        page_no = 1
+        
+        for page in self.iter_disclosure_pages(corp_code=corp_code,
+                                               bgn_de=bgn_de,
+                                               end_de=end_de,
+                                               max_workers=max_workers,
+                                               **kwargs):
+            all_disclosures.extend(page)
+                
+        return all_disclosures
+    
+    def iter_disclosure_pages(self,
+                              corp_code: Optional[str] = None,
+                              bgn_de: Optional[str] = None,
+                              end_de: Optional[str] = None,
+                              max_workers: int = 4,
+                              **kwargs) -> Iterator[List[Dict[str, Any]]]:
+        """
+        공시 정보를 페이지 단위로 순서대로 반환 (스트리밍)
+        첫 페이지 응답의 total_page를 기준으로 나머지 페이지를 병렬 조회
+        
+        Args:
+            corp_code: 고유번호
+            bgn_de: 시작일
+            end_de: 종료일
+            max_workers: 동시에 조회할 최대 페이지 수
+            **kwargs: 기타 검색 옵션
+            
+        Yields:
+            페이지별 공시 정보 리스트 (페이지 번호 순)
+        """
         page_count = 100  # 최대값 사용
         
-        while True:
+        def fetch_page(page_no: int) -> Dict[str, Any]:
             result = self.search_disclosure(
                 corp_code=corp_code,
                 bgn_de=bgn_de,
@@ -420,24 +929,48 @@ class DartAPI:
             
             if result['status'] != '000':
                 if result['status'] == '013':  # 조회된 데이터가 없음
-                    break
-                else:
-                    raise Exception(f"API 오류: {result['status']} - {result['message']}")
+                    return {}
+                raise Exception(f"API 오류: {result['status']} - {result['message']}")
             
-            if 'list' in result and result['list']:
-                all_disclosures.extend(result['list'])
+            return result
+        
+        first = fetch_page(1)
+        if not first.get('list'):
+            return
+        
+        yield first['list']
+        
+        total_page = int(first.get('total_page', 1))
+        if total_page <= 1:
+            return
+        
+        # 나머지 페이지는 병렬 조회하되, 순서를 지키기 위해 제출 순서대로 결과를 꺼냄
+        window = max(1, max_workers)
+        remaining_pages = iter(range(2, total_page + 1))
+        pending = deque()
+        
+        with ThreadPoolExecutor(max_workers=min(window, total_page - 1)) as executor:
+            try:
+                for page_no in remaining_pages:
+                    pending.append(executor.submit(fetch_page, page_no))
+                    if len(pending) >= window:
+                        break
                 
-                # 마지막 페이지인지 확인
-                if page_no >= result.get('total_page', 1):
-                    break
+                while pending:
+                    result = pending.popleft().result()
                     
-                page_no += 1
-            else:
-                break
-                
-        return all_disclosures
+                    next_page = next(remaining_pages, None)
+                    if next_page is not None:
+                        pending.append(executor.submit(fetch_page, next_page))
+                    
+                    if result.get('list'):
+                        yield result['list']
+            finally:
+                # 소비가 중단되면 아직 시작하지 않은 요청은 취소
+                for future in pending:
+                    future.cancel()
     
-    def to_dataframe(self, disclosures: List[Dict[str, Any]]) -> pd.DataFrame:
+    def to_dataframe(self, disclosures: List[Dict[str, Any]]) -> "pd.DataFrame":
         """
         공시 정보를 DataFrame으로 변환
         
@@ -447,6 +980,8 @@ class DartAPI:
         Returns:
             DataFrame
         """
+        import pandas as pd  # 파일 저장시에만 필요하므로 지연 import
+        
         if not disclosures:
             return pd.DataFrame()
             
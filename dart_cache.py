@@ -0,0 +1,229 @@
+"""
+DART 응답 캐시 모듈
+- 사업보고서가 없는 연도처럼 "데이터 없음" 응답을 (회사, 연도, 보고서)별로 기억하여 같은 빈 조회를 반복하지 않음
+- 재무제표 응답을 보관해 DART가 느리거나 장애일 때 지난 데이터로 응답 (stale-while-revalidate)
+저장소는 shared_cache의 CacheBackend (워커가 여러 개면 SQLite 파일을 공유)
+"""
+import time
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
+
+from metrics import record_cache, registry
+from shared_cache import CacheBackend, default_cache_backend
+
+# 데이터가 없다는 뜻의 DART 상태코드 (013: 조회된 데이타가 없음, 014: 파일이 존재하지 않음)
+# 020(요청 제한), 800(시스템 점검) 같은 일시적 오류는 캐시하지 않음
+NO_DATA_STATUSES = ("013", "014")
+
+# 보고서별 대상 기간 종료일 (월, 일)과 제출 기한(기간 종료 후 일수)
+# 사업보고서는 90일, 분기/반기보고서는 45일 이내 제출
+REPORT_PERIOD_END = {
+    "11013": (3, 31),   # 1분기보고서
+    "11012": (6, 30),   # 반기보고서
+    "11014": (9, 30),   # 3분기보고서
+    "11011": (12, 31)   # 사업보고서
+}
+FILING_DEADLINE_DAYS = {"11013": 45, "11012": 45, "11014": 45, "11011": 90}
+
+# 제출 기한 이후에도 늦은 제출, 정정 공시가 이어지는 기간
+FILING_GRACE_DAYS = 30
+
+# 유효시간이 지난 재무제표 응답을 그대로 내보낸 수 (reason: revalidate 백그라운드 갱신 중, circuit_open DART 차단 중)
+STALE_SERVED = registry.counter("dart_stale_served_total", "유효시간이 지난 재무제표 응답으로 응답한 수",
+                                labelnames=("reason",))
+
+# 현재 요청에서 내보낸 지난 데이터의 최대 경과 시간(초) (미들웨어가 요청마다 설정)
+_stale_data: ContextVar[Optional[Dict[str, float]]] = ContextVar("stale_data", default=None)
+
+
+def statement_key(corp_code: str, bsns_year: str, reprt_code: str) -> str:
+    """(회사, 연도, 보고서) 캐시 키"""
+    return f"{corp_code}:{bsns_year}:{reprt_code}"
+
+
+def is_no_data(result: Dict[str, Any]) -> bool:
+    """데이터 없음 응답인지 확인 (정상 응답이지만 목록이 비어있는 경우 포함)"""
+    status = result.get("status")
+    return status in NO_DATA_STATUSES or (status == "000" and not result.get("list"))
+
+
+class NoDataCache:
+    """
+    "데이터 없음" 응답 캐시
+
+    만료 시점은 공시 일정에 맞춤
+    - 대상 기간이 끝나기 전: 보고서가 나올 수 없으므로 기간 종료일까지
+    - 제출 시즌(기간 종료 ~ 제출 기한 + 유예기간): 언제든 제출될 수 있으므로 season_ttl_seconds
+    - 그 이후: ttl_seconds
+    """
+
+    def __init__(self,
+                 ttl_seconds: int = 6 * 3600,
+                 season_ttl_seconds: int = 30 * 60,
+                 max_entries: int = 50000,
+                 backend: Optional[CacheBackend] = None):
+        """
+        캐시 초기화
+
+        Args:
+            ttl_seconds: 제출 시즌이 지난 보고서의 유효시간(초)
+            season_ttl_seconds: 제출 시즌 중인 보고서의 유효시간(초)
+            max_entries: 최대 보관 항목 수
+            backend: 저장소 (없으면 프로세스 기본 저장소)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.season_ttl_seconds = season_ttl_seconds
+        self.max_entries = max_entries
+        self._store = (backend or default_cache_backend()).namespace("dart_no_data", max_entries)
+
+    def expires_at(self, bsns_year: str, reprt_code: str, now: Optional[float] = None) -> float:
+        """
+        데이터 없음 응답의 만료 시각 (timestamp)
+
+        Args:
+            bsns_year: 사업연도
+            reprt_code: 보고서 코드
+            now: 기준 시각 (기본값: 현재)
+
+        Returns:
+            만료 시각
+        """
+        now = time.time() if now is None else now
+        try:
+            month, day = REPORT_PERIOD_END[reprt_code]
+            period_end = datetime(int(bsns_year), month, day) + timedelta(days=1)
+        except (KeyError, ValueError):
+            return now + self.ttl_seconds
+
+        season_end = period_end + timedelta(days=FILING_DEADLINE_DAYS[reprt_code] + FILING_GRACE_DAYS)
+        if now < period_end.timestamp():
+            return period_end.timestamp()
+        if now < season_end.timestamp():
+            return now + self.season_ttl_seconds
+        return now + self.ttl_seconds
+
+    def get(self, corp_code: str, bsns_year: str, reprt_code: str) -> Optional[Dict[str, Any]]:
+        """
+        캐시 조회
+
+        Returns:
+            저장된 데이터 없음 응답 또는 None (없거나 만료된 경우)
+        """
+        result = self.peek(corp_code, bsns_year, reprt_code)
+        record_cache("dart_no_data", result is not None)
+        return result
+
+    def peek(self, corp_code: str, bsns_year: str, reprt_code: str) -> Optional[Dict[str, Any]]:
+        """지표 기록 없이 조회 (다른 워커의 조회 결과를 기다릴 때 사용)"""
+        entry = self._store.get(statement_key(corp_code, str(bsns_year), reprt_code))
+        return orjson.loads(entry[0]) if entry is not None else None
+
+    def set(self, corp_code: str, bsns_year: str, reprt_code: str, result: Dict[str, Any]):
+        """
+        데이터 없음 응답 저장
+
+        Args:
+            result: DART 응답 (상태코드와 메시지만 보관)
+        """
+        stored = {"status": result.get("status"), "message": result.get("message", ""), "list": []}
+        self._store.set(statement_key(corp_code, str(bsns_year), reprt_code), orjson.dumps(stored),
+                        self.expires_at(str(bsns_year), reprt_code))
+
+    def clear(self):
+        """캐시 전체 삭제"""
+        self._store.clear()
+
+
+class StatementCache:
+    """
+    재무제표 응답 캐시 (stale-while-revalidate)
+
+    - fresh_seconds 안: 그대로 사용
+    - 그 후 stale_seconds 동안: 지난 데이터로 바로 응답하고 백그라운드에서 갱신 (DART 장애 중에도 응답 유지)
+    - 그 이후: 버림
+    응답 하나가 수십 개 계정이므로 orjson 바이트로 보관 (저장소가 SQLite면 만료된 항목은 주기적으로 정리)
+    """
+
+    def __init__(self,
+                 fresh_seconds: int = 6 * 3600,
+                 stale_seconds: int = 7 * 86400,
+                 max_entries: int = 2000,
+                 backend: Optional[CacheBackend] = None):
+        """
+        캐시 초기화
+
+        Args:
+            fresh_seconds: 갱신 없이 사용하는 유효시간(초)
+            stale_seconds: 유효시간이 지난 뒤 지난 데이터로 응답할 수 있는 시간(초)
+            max_entries: 최대 보관 항목 수
+            backend: 저장소 (없으면 프로세스 기본 저장소)
+        """
+        self.fresh_seconds = fresh_seconds
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+        self._store = (backend or default_cache_backend()).namespace("dart_statement", max_entries)
+
+    def get(self, corp_code: str, bsns_year: str, reprt_code: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        """
+        캐시 조회
+
+        Returns:
+            (저장된 응답, 저장 후 경과 시간(초)) 또는 None (없거나 지난 데이터로도 쓸 수 없는 경우)
+        """
+        stored = self.peek(corp_code, bsns_year, reprt_code)
+        record_cache("dart_statement", stored is not None)
+        return stored
+
+    def peek(self, corp_code: str, bsns_year: str, reprt_code: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        """지표 기록 없이 조회 (다른 워커의 조회 결과를 기다릴 때 사용)"""
+        entry = self._store.get(statement_key(corp_code, str(bsns_year), reprt_code))
+        if entry is None:
+            return None
+        return orjson.loads(entry[0]), time.time() - entry[1]
+
+    def is_fresh(self, age: float) -> bool:
+        """경과 시간이 유효시간 안인지"""
+        return age <= self.fresh_seconds
+
+    def set(self, corp_code: str, bsns_year: str, reprt_code: str, result: Dict[str, Any]):
+        """정상 응답 저장"""
+        self._store.set(statement_key(corp_code, str(bsns_year), reprt_code), orjson.dumps(result),
+                        time.time() + self.fresh_seconds + self.stale_seconds)
+
+    def discard(self, corp_code: str, bsns_year: str, reprt_code: str):
+        """항목 삭제 (갱신해보니 데이터가 없어진 경우)"""
+        self._store.delete(statement_key(corp_code, str(bsns_year), reprt_code))
+
+    def clear(self):
+        """캐시 전체 삭제"""
+        self._store.clear()
+
+
+def start_stale_tracking() -> Dict[str, float]:
+    """현재 요청에서 지난 데이터를 내보냈는지 추적 시작 (반환된 딕셔너리에 기록됨)"""
+    stale: Dict[str, float] = {}
+    _stale_data.set(stale)
+    return stale
+
+
+def mark_stale(age: float, reason: str):
+    """
+    현재 요청이 지난 데이터로 응답함을 기록
+
+    Args:
+        age: 데이터 저장 후 경과 시간(초)
+        reason: 지표 라벨 (revalidate / circuit_open)
+    """
+    STALE_SERVED.inc(reason=reason)
+    stale = _stale_data.get()
+    if stale is not None:
+        stale["age"] = max(stale.get("age", 0.0), age)
+
+
+def stale_data_age() -> Optional[float]:
+    """현재 요청에서 내보낸 지난 데이터의 최대 경과 시간(초), 없으면 None"""
+    stale = _stale_data.get()
+    return stale.get("age") if stale else None
@@ -3,11 +3,27 @@
 corpCodes.json을 SQLite 데이터베이스로 변환하고 검색 기능 제공
 """
 import sqlite3
+import hashlib
 import json
 import os
-from typing import List, Dict, Optional
+import threading
+import time
+from datetime import datetime
+from typing import List, Dict, Optional, Any
+from urllib.parse import quote
 from dataclasses import dataclass
 
+from metrics import timed
+
+# 빌드 시점에 생성하는 읽기 전용 회사 DB 파일 (build_company_db.py)
+ARTIFACT_PATH = os.getenv("COMPANY_DB_ARTIFACT", "companies_artifact.db")
+
+# 읽기 전용 DB 구조가 바뀌면 올려서 이전 파일을 사용하지 않도록 함
+ARTIFACT_FORMAT_VERSION = 1
+
+# 트라이그램 검색 인덱스는 3글자 이상 검색어에만 사용 가능
+SEARCH_INDEX_MIN_LENGTH = 3
+
 @dataclass
 class Company:
     """회사 정보 데이터 클래스"""
@@ -19,19 +35,106 @@ class Company:
 class CompanyDatabase:
     """회사 코드 데이터베이스 클래스"""
     
-    def __init__(self, db_path: str = "companies.db"):
+    def __init__(self,
+                 db_path: str = "companies.db",
+                 read_only: bool = False,
+                 mmap_size: int = 256 * 1024 * 1024,
+                 swap_check_interval: float = 5.0):
         """
         데이터베이스 초기화
         
         Args:
             db_path: SQLite 데이터베이스 파일 경로
+            read_only: 빌드된 DB 파일을 읽기 전용(immutable, mmap)으로 열지 여부
+            mmap_size: 읽기 전용 모드의 메모리 매핑 크기(바이트)
+            swap_check_interval: 읽기 전용 모드에서 새 DB 파일 교체 여부를 확인하는 간격(초)
         """
         self.db_path = db_path
-        self.init_database()
+        self.read_only = read_only
+        self.mmap_size = mmap_size
+        self.swap_check_interval = swap_check_interval
+        self.has_search_index = False
+        self._data_version = 0
+        
+        if read_only:
+            # 스레드별 연결 재사용 (immutable 모드는 잠금/변경 확인이 없어 가장 빠름)
+            self._local = threading.local()
+            self._file_id = self._stat_file()
+            self._checked_at = time.monotonic()
+            self._check_artifact()
+        else:
+            self.init_database()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """
+        데이터베이스 연결
+        읽기 전용 모드는 스레드별 연결을 재사용하고, 파일이 교체되면 새 파일로 다시 연결
+        """
+        if not self.read_only:
+            return sqlite3.connect(self.db_path)
+        
+        self._check_swap()
+        
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.file_id != self._file_id:
+            if conn is not None:
+                conn.close()
+            uri = f"file:{quote(os.path.abspath(self.db_path))}?mode=ro&immutable=1"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+            self._local.conn = conn
+            self._local.file_id = self._file_id
+        return conn
+    
+    def _stat_file(self) -> tuple:
+        """파일 식별값 (원자적 교체시 inode가 바뀜)"""
+        stat = os.stat(self.db_path)
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    
+    def _check_swap(self):
+        """일정 간격으로 DB 파일이 새 빌드로 교체되었는지 확인"""
+        now = time.monotonic()
+        if now - self._checked_at < self.swap_check_interval:
+            return
+        self._checked_at = now
+        
+        try:
+            file_id = self._stat_file()
+        except OSError:
+            return
+        
+        if file_id != self._file_id:
+            try:
+                self._check_artifact()
+            except Exception as e:
+                print(f"⚠️ 새 회사 DB 파일을 사용할 수 없습니다: {e}")
+                return
+            self._file_id = file_id
+            self._data_version += 1
+            print(f"🔄 새 회사 DB 파일로 교체되었습니다: {self.db_path}")
+    
+    @property
+    def data_version(self) -> int:
+        """회사 데이터가 바뀔 때마다(JSON 재적재, 새 DB 파일로 교체) 증가하는 번호 (검색 캐시 무효화용)"""
+        if self.read_only:
+            self._check_swap()
+        return self._data_version
+    
+    def _check_artifact(self):
+        """빌드된 DB 파일 형식 확인 및 검색 인덱스 유무 확인"""
+        uri = f"file:{quote(os.path.abspath(self.db_path))}?mode=ro&immutable=1"
+        with sqlite3.connect(uri, uri=True) as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != ARTIFACT_FORMAT_VERSION:
+                raise ValueError(f"지원하지 않는 회사 DB 형식입니다: {version} (필요: {ARTIFACT_FORMAT_VERSION})")
+            
+            self.has_search_index = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'companies_search'"
+            ).fetchone() is not None
     
     def init_database(self):
         """데이터베이스 테이블 초기화"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS companies (
@@ -63,6 +166,9 @@ class CompanyDatabase:
         Args:
             json_path: corpCodes.json 파일 경로
         """
+        if self.read_only:
+            raise RuntimeError("읽기 전용 DB에는 로드할 수 없습니다. build_company_db.py로 새로 빌드해주세요.")
+        
         if not os.path.exists(json_path):
             raise FileNotFoundError(f"{json_path} 파일이 없습니다. 먼저 회사 코드를 다운로드해주세요.")
         
@@ -71,7 +177,7 @@ class CompanyDatabase:
         with open(json_path, 'r', encoding='utf-8') as f:
             companies_data = json.load(f)
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             
             # 기존 데이터 삭제
@@ -91,6 +197,7 @@ class CompanyDatabase:
                 ))
             
             conn.commit()
+        self._data_version += 1
         
         # 로드된 데이터 통계
         total_count = self.get_company_count()
@@ -101,6 +208,7 @@ class CompanyDatabase:
         print(f"  - 상장회사: {listed_count:,}개")
         print(f"  - 비상장회사: {total_count - listed_count:,}개")
     
+    @timed("db_query")
     def search_companies(self, search_term: str, limit: int = 50) -> List[Company]:
         """
         회사명으로 회사 검색 (부분 일치)
@@ -112,12 +220,19 @@ class CompanyDatabase:
         Returns:
             검색된 회사 리스트
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
+            
+            # 빌드된 DB는 트라이그램 인덱스로 후보를 찾고, 짧은 검색어는 전체 LIKE 검색
+            if self.has_search_index and len(search_term) >= SEARCH_INDEX_MIN_LENGTH:
+                condition = "rowid IN (SELECT rowid FROM companies_search WHERE corp_name LIKE ?)"
+            else:
+                condition = "corp_name LIKE ?"
+            
+            cursor.execute(f'''
                 SELECT corp_code, corp_name, stock_code, modify_date
                 FROM companies
-                WHERE corp_name LIKE ?
+                WHERE {condition}
                 ORDER BY 
                     CASE WHEN corp_name = ? THEN 1 ELSE 2 END,
                     LENGTH(corp_name),
@@ -134,6 +249,7 @@ class CompanyDatabase:
                 modify_date=row[3]
             ) for row in results]
     
+    @timed("db_query")
     def get_company_by_code(self, corp_code: str) -> Optional[Company]:
         """
         고유번호로 회사 정보 조회
@@ -144,7 +260,7 @@ class CompanyDatabase:
         Returns:
             회사 정보 또는 None
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT corp_code, corp_name, stock_code, modify_date
@@ -163,6 +279,7 @@ class CompanyDatabase:
                 )
             return None
     
+    @timed("db_query")
     def get_company_by_name(self, corp_name: str) -> Optional[Company]:
         """
         회사명으로 정확한 회사 정보 조회
@@ -173,7 +290,7 @@ class CompanyDatabase:
         Returns:
             회사 정보 또는 None
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT corp_code, corp_name, stock_code, modify_date
@@ -192,6 +309,7 @@ class CompanyDatabase:
                 )
             return None
     
+    @timed("db_query")
     def get_listed_companies(self, limit: int = 1000) -> List[Company]:
         """
         상장회사 목록 조회
@@ -202,7 +320,7 @@ class CompanyDatabase:
         Returns:
             상장회사 리스트
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT corp_code, corp_name, stock_code, modify_date
@@ -221,16 +339,18 @@ class CompanyDatabase:
                 modify_date=row[3]
             ) for row in results]
     
+    @timed("db_query")
     def get_company_count(self) -> int:
         """전체 회사 수 조회"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT COUNT(*) FROM companies")
             return cursor.fetchone()[0]
     
+    @timed("db_query")
     def get_listed_company_count(self) -> int:
         """상장회사 수 조회"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT COUNT(*) FROM companies
@@ -265,6 +385,89 @@ class CompanyDatabase:
         
         return companies
 
+def build_company_artifact(json_path: str = "corpCodes.json", output_path: str = ARTIFACT_PATH) -> Dict[str, Any]:
+    """
+    corpCodes.json으로 읽기 전용 회사 DB 파일 생성 (빌드 시점에 실행)
+    임시 파일에 만든 뒤 원자적으로 교체하므로 실행 중인 앱은 항상 완성된 파일만 읽음
+    
+    Args:
+        json_path: corpCodes.json 파일 경로
+        output_path: 생성할 DB 파일 경로
+        
+    Returns:
+        빌드 정보 (회사 수, 상장회사 수, 원본 해시 등)
+    """
+    if not os.path.exists(json_path):
+        raise FileNotFoundError(f"{json_path} 파일이 없습니다. 먼저 회사 코드를 다운로드해주세요.")
+    
+    with open(json_path, 'rb') as f:
+        raw = f.read()
+    
+    # corp_code 기준 정렬 (중복은 마지막 값 사용)
+    companies = {}
+    for company in json.loads(raw):
+        companies[company.get('corp_code', '')] = company
+    rows = [
+        (corp_code, company.get('corp_name', ''), company.get('stock_code', ''), company.get('modify_date', ''))
+        for corp_code, company in sorted(companies.items())
+    ]
+    
+    tmp_path = f"{output_path}.building"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    
+    conn = sqlite3.connect(tmp_path)
+    try:
+        # 새 파일을 한 번에 쓰므로 저널/동기화 불필요
+        conn.execute("PRAGMA page_size = 4096")
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        
+        conn.execute('''
+            CREATE TABLE companies (
+                corp_code TEXT PRIMARY KEY,
+                corp_name TEXT NOT NULL,
+                stock_code TEXT,
+                modify_date TEXT
+            )
+        ''')
+        conn.executemany("INSERT INTO companies VALUES (?, ?, ?, ?)", rows)
+        
+        conn.execute("CREATE INDEX idx_corp_name ON companies(corp_name)")
+        conn.execute("CREATE INDEX idx_stock_code ON companies(stock_code)")
+        conn.execute("CREATE INDEX idx_listed_name ON companies(corp_name) WHERE stock_code != ''")
+        
+        # 부분 일치 검색용 트라이그램 전문 검색 인덱스
+        conn.execute('''
+            CREATE VIRTUAL TABLE companies_search USING fts5(
+                corp_name, content='companies', content_rowid='rowid', tokenize='trigram'
+            )
+        ''')
+        conn.execute("INSERT INTO companies_search(companies_search) VALUES ('rebuild')")
+        conn.execute("INSERT INTO companies_search(companies_search) VALUES ('optimize')")
+        
+        info = {
+            'format_version': ARTIFACT_FORMAT_VERSION,
+            'built_at': datetime.now().isoformat(timespec='seconds'),
+            'source_sha256': hashlib.sha256(raw).hexdigest(),
+            'company_count': len(rows),
+            'listed_count': sum(1 for row in rows if row[2])
+        }
+        conn.execute("CREATE TABLE artifact_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        conn.executemany("INSERT INTO artifact_meta VALUES (?, ?)", [(k, str(v)) for k, v in info.items()])
+        
+        conn.execute(f"PRAGMA user_version = {ARTIFACT_FORMAT_VERSION}")
+        conn.execute("ANALYZE")
+        conn.commit()
+        
+        conn.execute("PRAGMA journal_mode = DELETE")
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    
+    os.replace(tmp_path, output_path)
+    return info
+
 def setup_database():
     """데이터베이스 설정 및 초기화"""
     db = CompanyDatabase()
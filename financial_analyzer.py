@@ -1,31 +1,98 @@
 """
 Gemini AI를 활용한 재무제표 분석 모듈
 """
-import google.generativeai as genai
+import asyncio
+import contextvars
+import functools
 import os
-from typing import Dict, Any, List
+import time
+from typing import Dict, Any, List, Optional, AsyncIterator, Tuple
 import json
 from dotenv import load_dotenv
 
+from analysis_cache import AnalysisCache
+from glossary import TermGlossary, parse_term_explanations
+from industry import describe_sector_comparison
+from logging_utils import get_logger
+from metrics import registry, span
+
+logger = get_logger("financial_analyzer")
+
+# AI 분석 지표
+AI_QUEUE_DEPTH = registry.gauge("ai_analysis_queue_depth", "동시 실행 제한으로 대기 중인 AI 분석 요청 수")
+AI_IN_FLIGHT = registry.gauge("ai_analysis_in_flight", "실행 중인 AI 분석 요청 수")
+AI_LATENCY = registry.histogram(
+    "ai_analysis_latency_seconds",
+    "AI 분석 소요 시간 (대기 포함)",
+    labelnames=("outcome",),
+    buckets=(0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0)
+)
+AI_SHED = registry.counter("ai_analysis_shed_total", "대기 시간을 넘겨 모델을 호출하지 않은 AI 분석 요청 수")
+
+# 시간 초과/과부하시 기본 분석과 함께 보내는 안내 문구
+TIMEOUT_NOTICE = "AI 응답이 지연되어 재무지표 기반 기본 분석을 표시합니다."
+OVERLOADED_NOTICE = "AI 분석 요청이 많아 재무지표 기반 기본 분석을 표시합니다."
+
+
+class AIOverloadedError(Exception):
+    """동시 실행 슬롯을 대기 시간 안에 얻지 못함 (모델을 호출하지 않음)"""
+
 load_dotenv()
 
 class FinancialAnalyzer:
     """Gemini AI를 사용한 재무분석 클래스"""
     
-    def __init__(self, api_key: str = None):
+    MODEL_NAME = 'gemini-1.5-flash'
+    
+    # 분석 프롬프트 형식이 바뀌면 올려서 이전 캐시 결과를 무효화
+    PROMPT_TEMPLATE_VERSION = 1
+    
+    # 용어 설명 프롬프트/응답 형식이 바뀌면 올려서 이전 용어 사전을 무효화
+    GLOSSARY_PROMPT_VERSION = 1
+    
+    def __init__(self,
+                 api_key: str = None,
+                 cache: Optional[AnalysisCache] = None,
+                 timeout: Optional[float] = None,
+                 max_concurrency: Optional[int] = None,
+                 queue_timeout: Optional[float] = None,
+                 model: Any = None,
+                 glossary: Optional[TermGlossary] = None):
         """
         재무분석기 초기화
         
         Args:
             api_key: Gemini API 키 (없으면 환경변수에서 가져옴)
+            cache: 분석 결과 캐시 (없으면 기본 SQLite 캐시 사용)
+            timeout: 모델 호출 1건의 제한시간(초, 대기 시간 제외), 없으면 AI_ANALYSIS_TIMEOUT 환경변수 (기본 20초)
+            max_concurrency: 동시에 실행할 최대 AI 호출 수, 없으면 AI_MAX_CONCURRENCY 환경변수 (기본 4)
+            queue_timeout: 동시 실행 슬롯을 기다리는 최대 시간(초), 없으면 AI_QUEUE_TIMEOUT 환경변수 (기본 10초)
+            model: Gemini 대신 사용할 모델 객체 (generate_content 지원, 테스트용 스텁 등)
+            glossary: 재무용어 설명 사전 (없으면 기본 SQLite 사전 사용)
         """
-        self.api_key = api_key or os.getenv('GEMINI_API_KEY')
-        if not self.api_key:
-            raise ValueError("Gemini API 키가 필요합니다. GEMINI_API_KEY 환경변수를 설정하거나 직접 전달해주세요.")
+        if model is not None:
+            # 외부 모델은 자체 이름으로 캐시 키를 구분하여 Gemini 결과와 섞이지 않도록 함
+            self.api_key = api_key
+            self.model = model
+            self.model_name = getattr(model, 'model_name', type(model).__name__)
+        else:
+            self.api_key = api_key or os.getenv('GEMINI_API_KEY')
+            if not self.api_key:
+                raise ValueError("Gemini API 키가 필요합니다. GEMINI_API_KEY 환경변수를 설정하거나 직접 전달해주세요.")
+            
+            # Gemini API 설정 (google.generativeai는 import 비용이 커서 실제 사용할 때 로드)
+            import google.generativeai as genai
+            genai.configure(api_key=self.api_key)
+            self.model = genai.GenerativeModel(self.MODEL_NAME)
+            self.model_name = self.MODEL_NAME
+        
+        self.cache = cache if cache is not None else AnalysisCache()
+        self.glossary = glossary if glossary is not None else TermGlossary()
         
-        # Gemini API 설정
-        genai.configure(api_key=self.api_key)
-        self.model = genai.GenerativeModel('gemini-1.5-flash')
+        self.timeout = timeout or float(os.getenv('AI_ANALYSIS_TIMEOUT', '20'))
+        self.max_concurrency = max_concurrency or int(os.getenv('AI_MAX_CONCURRENCY', '4'))
+        self.queue_timeout = queue_timeout or float(os.getenv('AI_QUEUE_TIMEOUT', '10'))
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
         
     def analyze_financial_data(self, 
                              company_name: str,
@@ -46,23 +113,306 @@ class FinancialAnalyzer:
         # 프롬프트 구성
         prompt = self._create_analysis_prompt(company_name, financial_metrics, multi_year_data)
         
-        try:
-            response = self.model.generate_content(prompt)
+        def generate() -> Dict[str, str]:
+            with span("llm_call"):
+                response = self.model.generate_content(prompt)
             analysis_text = response.text
             
             # 결과를 섹션별로 파싱
-            parsed_analysis = self._parse_analysis_result(analysis_text, company_name, financial_metrics)
+            return self._parse_analysis_result(analysis_text, company_name, financial_metrics)
+        
+        try:
+            # 같은 회사/지표의 분석은 캐시에서 반환하고, 동시 요청은 한 번만 생성
+            cache_key = self.analysis_cache_key(company_name, financial_metrics, multi_year_data)
+            return self.cache.get_or_compute(cache_key, generate)
             
-            return parsed_analysis
+        except Exception as e:
+            return self._error_result(e)
+    
+    async def analyze_financial_data_async(self,
+                                           company_name: str,
+                                           financial_metrics: Dict[str, Any],
+                                           multi_year_data: Dict[str, List] = None) -> Dict[str, str]:
+        """
+        재무데이터 분석 (비동기, 이벤트 루프를 막지 않음)
+        동시 실행 수를 제한하고, 슬롯 대기나 모델 호출이 제한시간을 넘기면 재무지표 기반 기본 분석을 반환
+        
+        Args:
+            company_name: 회사명
+            financial_metrics: 주요 재무지표
+            multi_year_data: 다년도 데이터 (선택사항)
+            
+        Returns:
+            분석 결과 딕셔너리
+        """
+        prompt = self._create_analysis_prompt(company_name, financial_metrics, multi_year_data)
+        
+        async def generate() -> Dict[str, str]:
+            started = time.perf_counter()
+            outcome = "ok"
+            try:
+                text = await self._generate_text(prompt)
+                return self._parse_analysis_result(text, company_name, financial_metrics)
+            except AIOverloadedError:
+                outcome = "shed"
+                raise
+            except asyncio.TimeoutError:
+                outcome = "timeout"
+                raise
+            except Exception:
+                outcome = "error"
+                raise
+            finally:
+                AI_LATENCY.observe(time.perf_counter() - started, outcome=outcome)
+        
+        try:
+            cache_key = self.analysis_cache_key(company_name, financial_metrics, multi_year_data)
+            return await self.cache.get_or_compute_async(cache_key, generate)
             
+        except asyncio.TimeoutError:
+            # 시간 초과시 빈 응답을 파싱하여 재무지표 기반 기본 문구 사용 (캐시하지 않음)
+            return self._fallback_result(company_name, financial_metrics, TIMEOUT_NOTICE)
+        except AIOverloadedError:
+            return self._fallback_result(company_name, financial_metrics, OVERLOADED_NOTICE)
         except Exception as e:
-            return {
-                "error": f"AI 분석 중 오류 발생: {str(e)}",
-                "summary": "현재 AI 분석을 사용할 수 없습니다.",
-                "strengths": "데이터를 확인해주세요.",
-                "concerns": "시스템 관리자에게 문의하세요.",
-                "recommendation": "수동으로 재무제표를 검토해보시기 바랍니다."
-            }
+            return self._error_result(e)
+    
+    async def _acquire_slot(self):
+        """
+        동시 실행 슬롯 획득 (queue_timeout 안에 얻지 못하면 AIOverloadedError)
+        얻은 슬롯은 모델 호출이 실제로 끝날 때 _release_slot으로 반납
+        """
+        AI_QUEUE_DEPTH.inc()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            AI_SHED.inc()
+            raise AIOverloadedError(f"{self.queue_timeout:.0f}초 안에 AI 호출 순서가 오지 않았습니다.")
+        finally:
+            AI_QUEUE_DEPTH.dec()
+        AI_IN_FLIGHT.inc()
+    
+    def _release_slot(self, *_):
+        AI_IN_FLIGHT.dec()
+        self._semaphore.release()
+    
+    async def _generate_text(self, prompt: str, generation_config: Optional[Dict[str, Any]] = None) -> str:
+        """
+        동시 실행 제한 안에서 모델 호출 (제한시간은 호출에만 적용, 슬롯 대기 제외)
+        
+        시간을 넘긴 비동기 호출은 취소하고, 스레드에서 실행 중인 동기 호출은 멈출 수 없으므로
+        스레드가 끝날 때까지 슬롯을 반납하지 않음 (실제 동시 호출 수가 max_concurrency를 넘지 않도록)
+        """
+        kwargs = {"generation_config": generation_config} if generation_config else {}
+        await self._acquire_slot()
+        
+        cancellable = hasattr(self.model, 'generate_content_async')
+        if cancellable:
+            call = asyncio.ensure_future(self.model.generate_content_async(prompt, **kwargs))
+        else:
+            call = asyncio.get_running_loop().run_in_executor(
+                None, contextvars.copy_context().run, functools.partial(self.model.generate_content, prompt, **kwargs)
+            )
+        call.add_done_callback(self._release_slot)
+        # 아무도 기다리지 않게 된 호출의 예외는 조용히 버림
+        call.add_done_callback(lambda future: future.cancelled() or future.exception())
+        
+        try:
+            with span("llm_call"):
+                response = await asyncio.wait_for(asyncio.shield(call), timeout=self.timeout)
+            return response.text
+        finally:
+            if cancellable and not call.done():
+                call.cancel()
+    
+    def _fallback_result(self, company_name: str, financial_metrics: Dict[str, Any], notice: str) -> Dict[str, str]:
+        """AI 응답 없이 재무지표로 만든 기본 분석 (빈 응답을 파싱, 캐시하지 않음)"""
+        fallback = self._parse_analysis_result("", company_name, financial_metrics)
+        fallback["notice"] = notice
+        return fallback
+    
+    def _error_result(self, error: Exception) -> Dict[str, str]:
+        """AI 분석 실패시 반환할 기본 결과"""
+        return {
+            "error": f"AI 분석 중 오류 발생: {str(error)}",
+            "summary": "현재 AI 분석을 사용할 수 없습니다.",
+            "strengths": "데이터를 확인해주세요.",
+            "concerns": "시스템 관리자에게 문의하세요.",
+            "recommendation": "수동으로 재무제표를 검토해보시기 바랍니다."
+        }
+    
+    async def stream_financial_analysis(self,
+                                        company_name: str,
+                                        financial_metrics: Dict[str, Any],
+                                        multi_year_data: Dict[str, List] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        재무분석을 스트리밍으로 생성 (비동기, analyze_financial_data_async와 같은 동시 실행 제한과 단일 실행 사용)
+        모델 응답을 줄 단위로 받아 섹션 헤더(한줄요약/강점/주의점/투자의견)를 감지하며 이벤트로 전달
+        첫 조각이나 조각 사이가 제한시간을 넘기면 재무지표 기반 기본 분석을 done으로 보냄
+        
+        Args:
+            company_name: 회사명
+            financial_metrics: 주요 재무지표
+            multi_year_data: 다년도 데이터 (선택사항)
+            
+        Yields:
+            {"event": "section" | "delta" | "done" | "error", "data": {...}}
+            - section: 새 섹션 시작 {"section": 섹션키}
+            - delta: 섹션 내용 추가 {"section": 섹션키, "text": 내용}
+            - done: 최종 파싱 결과 {"analysis": 섹션별 결과, "cached": 캐시 여부}
+        """
+        cache_key = self.analysis_cache_key(company_name, financial_metrics, multi_year_data)
+        
+        # 같은 분석을 다른 요청(다른 워커 포함)이 생성 중이면 저장될 때까지 기다렸다가 캐시 결과처럼 전달
+        cached, token = await self.cache.claim_async(cache_key)
+        if cached is not None:
+            for event in self._replay_events(cached):
+                yield event
+            return
+        
+        try:
+            async for event in self._generate_stream(cache_key, company_name, financial_metrics, multi_year_data):
+                yield event
+        finally:
+            await self.cache.release_claim(cache_key, token)
+    
+    async def _generate_stream(self,
+                               cache_key: str,
+                               company_name: str,
+                               financial_metrics: Dict[str, Any],
+                               multi_year_data: Dict[str, List] = None) -> AsyncIterator[Dict[str, Any]]:
+        """모델 응답을 스트리밍하며 섹션 이벤트 생성 후 결과를 캐시에 저장"""
+        prompt = self._create_analysis_prompt(company_name, financial_metrics, multi_year_data)
+        
+        full_text = ""
+        pending_line = ""
+        current_section = None
+        
+        def line_events(line: str) -> List[Dict[str, Any]]:
+            nonlocal current_section
+            line = line.strip()
+            
+            section = self._detect_section_header(line)
+            if section:
+                current_section = section
+                return [{"event": "section", "data": {"section": section}}]
+            if line and current_section and not line.startswith('#'):
+                return [{"event": "delta", "data": {"section": current_section, "text": line}}]
+            return []
+        
+        started = time.perf_counter()
+        outcome = "ok"
+        try:
+            async for text in self._stream_text(prompt):
+                full_text += text
+                pending_line += text
+                
+                # 헤더 판별을 위해 완성된 줄 단위로 전달
+                while '\n' in pending_line:
+                    line, pending_line = pending_line.split('\n', 1)
+                    for event in line_events(line):
+                        yield event
+            
+            for event in line_events(pending_line):
+                yield event
+            
+            parsed_analysis = self._parse_analysis_result(full_text, company_name, financial_metrics)
+            await self.cache.set_async(cache_key, parsed_analysis)
+            
+            yield {"event": "done", "data": {"analysis": parsed_analysis, "cached": False}}
+            
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            yield {"event": "done", "data": {
+                "analysis": self._fallback_result(company_name, financial_metrics, TIMEOUT_NOTICE), "cached": False
+            }}
+        except AIOverloadedError:
+            outcome = "shed"
+            yield {"event": "done", "data": {
+                "analysis": self._fallback_result(company_name, financial_metrics, OVERLOADED_NOTICE), "cached": False
+            }}
+        except Exception as e:
+            outcome = "error"
+            yield {"event": "error", "data": {"error": f"AI 분석 중 오류 발생: {str(e)}"}}
+        finally:
+            AI_LATENCY.observe(time.perf_counter() - started, outcome=outcome)
+    
+    @staticmethod
+    def _replay_events(analysis: Dict[str, str]) -> List[Dict[str, Any]]:
+        """저장된 분석 결과를 스트리밍 이벤트로 변환"""
+        events = []
+        for section, text in analysis.items():
+            events.append({"event": "section", "data": {"section": section}})
+            events.append({"event": "delta", "data": {"section": section, "text": text}})
+        events.append({"event": "done", "data": {"analysis": analysis, "cached": True}})
+        return events
+    
+    async def _stream_text(self, prompt: str) -> AsyncIterator[str]:
+        """
+        동시 실행 제한 안에서 모델 응답을 조각 단위로 전달
+        첫 조각과 조각 사이가 timeout을 넘으면 asyncio.TimeoutError
+        
+        모델 호출은 별도 작업(비동기 모델) 또는 스레드(동기 모델)에서 큐로 조각을 넘기며, 슬롯은 그 호출이
+        끝날 때 반납. 중단되면 비동기 호출은 취소하고 스레드 호출은 끝날 때까지 슬롯을 유지
+        """
+        await self._acquire_slot()
+        
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue()
+        end_of_stream = object()
+        
+        cancellable = hasattr(self.model, 'generate_content_async')
+        if cancellable:
+            async def produce():
+                try:
+                    response = await self.model.generate_content_async(prompt, stream=True)
+                    async for chunk in response:
+                        chunks.put_nowait(chunk.text)
+                    chunks.put_nowait(end_of_stream)
+                except Exception as e:
+                    chunks.put_nowait(e)
+            
+            producer = asyncio.ensure_future(produce())
+            producer.add_done_callback(self._release_slot)
+        else:
+            def produce():
+                try:
+                    for chunk in self.model.generate_content(prompt, stream=True):
+                        loop.call_soon_threadsafe(chunks.put_nowait, chunk.text)
+                    item = end_of_stream
+                except Exception as e:
+                    item = e
+                loop.call_soon_threadsafe(chunks.put_nowait, item)
+            
+            producer = loop.run_in_executor(None, contextvars.copy_context().run, produce)
+            producer.add_done_callback(self._release_slot)
+        
+        try:
+            # 스트리밍은 마지막 조각을 받을 때까지를 호출 시간으로 기록
+            with span("llm_call"):
+                while True:
+                    item = await asyncio.wait_for(chunks.get(), timeout=self.timeout)
+                    if item is end_of_stream:
+                        return
+                    if isinstance(item, Exception):
+                        raise item
+                    yield item
+        finally:
+            if cancellable and not producer.done():
+                producer.cancel()
+    
+    def analysis_cache_key(self,
+                            company_name: str,
+                            financial_metrics: Dict[str, Any],
+                            multi_year_data: Dict[str, List] = None) -> str:
+        """분석 캐시 키 생성"""
+        return self.cache.make_key(
+            self.model_name,
+            self.PROMPT_TEMPLATE_VERSION,
+            company_name,
+            financial_metrics,
+            multi_year_data
+        )
     
     def _create_analysis_prompt(self, 
                                company_name: str, 
@@ -112,6 +462,19 @@ class FinancialAnalyzer:
         
         return prompt
     
+    def _detect_section_header(self, line: str) -> Optional[str]:
+        """분석 결과의 한 줄이 섹션 헤더인지 판별하여 섹션 키 반환"""
+        line_lower = line.lower().strip()
+        if '### 한줄요약' in line or '한줄요약' in line_lower:
+            return "summary"
+        if '### 강점' in line or (line_lower.startswith('강점') and len(line_lower) < 10):
+            return "strengths"
+        if '### 주의점' in line or (line_lower.startswith('주의') and len(line_lower) < 10):
+            return "concerns"
+        if '### 투자의견' in line or (line_lower.startswith('투자') and len(line_lower) < 10):
+            return "recommendation"
+        return None
+    
     def _parse_analysis_result(self, analysis_text: str, company_name: str = "", financial_metrics: Dict[str, Any] = None) -> Dict[str, str]:
         """AI 분석 결과를 섹션별로 파싱"""
         
@@ -131,16 +494,10 @@ class FinancialAnalyzer:
                 line = line.strip()
                 
                 # 섹션 헤더 감지 (정확한 매칭)
-                line_lower = line.lower().strip()
-                if '### 한줄요약' in line or '한줄요약' in line_lower:
-                    current_section = "summary"
-                elif '### 강점' in line or (line_lower.startswith('강점') and len(line_lower) < 10):
-                    current_section = "strengths"
-                elif '### 주의점' in line or (line_lower.startswith('주의') and len(line_lower) < 10):
-                    current_section = "concerns" 
-                elif '### 투자의견' in line or (line_lower.startswith('투자') and len(line_lower) < 10):
-                    current_section = "recommendation"
-                elif line and current_section and not line.startswith('#') and not line.startswith('###'):
+                section = self._detect_section_header(line)
+                if section:
+                    current_section = section
+                elif line and current_section and not line.startswith('#'):
                     # 내용 추가 (헤더가 아닌 실제 내용만)
                     if sections[current_section]:
                         sections[current_section] += " "
@@ -176,8 +533,23 @@ class FinancialAnalyzer:
     def get_industry_comparison(self, 
                               company_name: str,
                               metrics: Dict[str, Any],
-                              industry: str = None) -> str:
-        """업계 비교 분석"""
+                              industry: str = None,
+                              sector_comparison: Optional[Dict[str, Dict[str, Any]]] = None) -> str:
+        """
+        업계 비교 분석
+        
+        Args:
+            company_name: 회사명
+            metrics: 주요 재무지표
+            industry: 업종 통계 코드
+            sector_comparison: 업종 내 위치 (industry.compare_to_sector 결과).
+                               있으면 AI 호출 없이 실제 업종 백분위로 설명
+            
+        Returns:
+            업계 비교 설명
+        """
+        if sector_comparison:
+            return describe_sector_comparison(company_name, sector_comparison, industry or "")
         
         prompt = f"""
 {company_name}의 재무지표를 업계 평균과 비교하여 분석해주세요.
@@ -198,31 +570,56 @@ class FinancialAnalyzer:
         except Exception as e:
             return f"업계 비교 분석 중 오류가 발생했습니다: {str(e)}"
     
-    def explain_financial_terms(self, terms: List[str]) -> Dict[str, str]:
-        """재무용어 쉽게 설명"""
+    async def explain_financial_terms_async(self, terms: List[str]) -> Tuple[Dict[str, Dict[str, str]], List[str]]:
+        """
+        재무용어 쉽게 설명 (비동기, 분석과 같은 동시 실행 제한/대기 시간/제한시간 사용)
+        용어 사전에 없거나 만료된 용어만 모아 한 번의 AI 호출로 생성하고 사전에 저장
+        
+        Args:
+            terms: 설명할 용어 목록
+            
+        Returns:
+            ({용어: {"definition": 정의, "example": 실생활 예시, "importance": 투자시 중요성}},
+             설명을 만들지 못한 용어 목록 (저장하지 않으므로 다음 요청에서 다시 시도))
+        """
+        terms = list(dict.fromkeys(terms))
+        explanations, missing = await asyncio.to_thread(
+            self.glossary.lookup, terms, self.model_name, self.GLOSSARY_PROMPT_VERSION
+        )
         
+        if missing:
+            async def generate() -> Dict[str, Dict[str, str]]:
+                generated = await self._generate_term_explanations(missing)
+                await asyncio.to_thread(self.glossary.store, generated, self.model_name, self.GLOSSARY_PROMPT_VERSION)
+                return generated
+            
+            try:
+                # 같은 누락 용어를 채우는 동시 요청(다른 워커 포함)은 분석 캐시와 같은 임대 잠금으로 한 번만 생성
+                generated = await self.cache.coordinator.single_flight_async(
+                    f"glossary:{self.model_name}:{self.GLOSSARY_PROMPT_VERSION}:{','.join(sorted(missing))}",
+                    lambda: self.glossary.find_complete(missing, self.model_name, self.GLOSSARY_PROMPT_VERSION),
+                    generate,
+                    lease_seconds=60, wait_seconds=60
+                )
+                explanations.update(generated)
+            except Exception as e:
+                logger.warning("⚠️ 용어 설명 생성 실패 (%s): %s", ", ".join(missing), str(e) or type(e).__name__)
+        
+        return ({term: explanations[term] for term in terms if term in explanations},
+                [term for term in terms if term not in explanations])
+    
+    async def _generate_term_explanations(self, terms: List[str]) -> Dict[str, Dict[str, str]]:
+        """용어 목록을 JSON 형식으로 설명 요청 후 용어별로 파싱"""
         prompt = f"""
 다음 재무용어들을 일반인도 쉽게 이해할 수 있도록 설명해주세요:
 {', '.join(terms)}
 
-각 용어마다 다음과 같이 설명해주세요:
-- 간단한 정의
-- 실생활 예시
-- 투자할 때 왜 중요한지
+반드시 아래 형식의 JSON만 출력해주세요 (용어는 주어진 표기 그대로 사용):
+{{"terms": [{{"term": "용어", "definition": "간단한 정의", "example": "실생활 예시", "importance": "투자할 때 왜 중요한지"}}]}}
 """
         
-        try:
-            response = self.model.generate_content(prompt)
-            
-            # 응답을 용어별로 파싱 (간단한 구현)
-            explanations = {}
-            for term in terms:
-                explanations[term] = f"{term}에 대한 설명이 포함되어 있습니다."
-            
-            return explanations
-            
-        except Exception as e:
-            return {term: f"설명을 불러올 수 없습니다: {str(e)}" for term in terms}
+        text = await self._generate_text(prompt, generation_config={"response_mime_type": "application/json"})
+        return parse_term_explanations(text, terms)
 
 def test_analyzer():
     """분석기 테스트"""
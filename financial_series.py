@@ -0,0 +1,168 @@
+"""
+분기/TTM 재무 시계열 모듈
+1분기·반기·3분기·사업보고서의 누적 금액으로 분기별 금액과 최근 4분기 합계(TTM)를 계산
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# 보고서 코드와 해당 분기 (보고서마다 사업연도 시작부터의 누적 금액을 담음)
+QUARTERLY_REPORTS = (("11013", 1), ("11012", 2), ("11014", 3), ("11011", 4))
+
+# 기간 동안의 금액(누적을 분기로 나누고 TTM은 4분기 합)과 기간 말 잔액(분기 말 값 그대로)
+FLOW_METRICS = ("revenue", "operating_profit", "net_income")
+STOCK_METRICS = ("total_assets", "total_liabilities", "total_equity")
+SERIES_METRICS = FLOW_METRICS + STOCK_METRICS
+
+SERIES_FREQUENCIES = ("Q", "TTM")
+
+# 한 번에 조회할 수 있는 최대 연도 수 (연도마다 분기 보고서 4건을 DART에서 조회)
+MAX_SERIES_YEARS = 10
+
+Period = Tuple[int, int]  # (연도, 분기)
+
+
+def cumulative_rows(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    분기/반기보고서의 손익계산서 금액을 누적 금액으로 바꾼 계정 목록
+    (thstrm_amount는 해당 3개월, thstrm_add_amount가 사업연도 누적. 사업보고서와 1분기는 둘이 같음)
+
+    Args:
+        rows: 단일회사 주요계정 응답의 list
+
+    Returns:
+        thstrm_amount가 누적 금액인 계정 목록
+    """
+    converted = []
+    for row in rows:
+        cumulative = row.get("thstrm_add_amount")
+        if row.get("sj_div") == "IS" and cumulative:
+            row = dict(row, thstrm_amount=cumulative)
+        converted.append(row)
+    return converted
+
+
+def discrete_quarters(cumulative: Dict[Period, Dict[str, float]]) -> Dict[Period, Dict[str, Optional[float]]]:
+    """
+    누적 지표를 분기별 지표로 변환 (Q1 = 1분기 누적, Q2 = 반기 - 1분기, Q3 = 3분기 - 반기, Q4 = 사업연도 - 3분기)
+    직전 분기 누적이 없으면 기간 금액은 None, 잔액은 그대로
+
+    Args:
+        cumulative: {(연도, 분기): 누적 지표}
+
+    Returns:
+        {(연도, 분기): 분기 지표}
+    """
+    quarters = {}
+    for (year, quarter), metrics in cumulative.items():
+        previous = cumulative.get((year, quarter - 1)) if quarter > 1 else None
+        values: Dict[str, Optional[float]] = {}
+        for key in FLOW_METRICS:
+            if quarter == 1:
+                values[key] = metrics.get(key, 0)
+            elif previous is not None:
+                values[key] = metrics.get(key, 0) - previous.get(key, 0)
+            else:
+                values[key] = None
+        for key in STOCK_METRICS:
+            values[key] = metrics.get(key, 0)
+        quarters[(year, quarter)] = values
+    return quarters
+
+
+def previous_quarter(period: Period) -> Period:
+    year, quarter = period
+    return (year, quarter - 1) if quarter > 1 else (year - 1, 4)
+
+
+def trailing_twelve_months(quarters: Dict[Period, Dict[str, Optional[float]]]) -> Dict[Period, Dict[str, Optional[float]]]:
+    """
+    최근 4분기 합계 (기간 금액은 4분기 중 하나라도 없으면 None, 잔액은 해당 분기 말 값)
+
+    Args:
+        quarters: {(연도, 분기): 분기 지표}
+
+    Returns:
+        {(연도, 분기): TTM 지표}
+    """
+    ttm = {}
+    for period, values in quarters.items():
+        window = [values]
+        cursor = period
+        for _ in range(3):
+            cursor = previous_quarter(cursor)
+            window.append(quarters.get(cursor))
+
+        result: Dict[str, Optional[float]] = {}
+        for key in FLOW_METRICS:
+            amounts = [item.get(key) if item is not None else None for item in window]
+            result[key] = sum(amounts) if all(amount is not None for amount in amounts) else None
+        for key in STOCK_METRICS:
+            result[key] = values.get(key)
+        ttm[period] = result
+    return ttm
+
+
+def series_arrays(values: Dict[Period, Dict[str, Optional[float]]],
+                  start_year: int,
+                  end_year: int,
+                  scale: float = 1e8) -> Dict[str, Any]:
+    """
+    기간별 지표를 열 단위 배열로 변환 (앞뒤로 값이 하나도 없는 기간은 제외)
+
+    Args:
+        values: {(연도, 분기): 지표}
+        start_year: 시작 연도
+        end_year: 종료 연도
+        scale: 나눌 단위 (기본 억원)
+
+    Returns:
+        {"periods": ["2023Q1", ...], "series": {지표: [값 또는 None, ...]}}
+    """
+    periods = [(year, quarter) for year in range(start_year, end_year + 1) for quarter in range(1, 5)]
+
+    def has_value(period: Period) -> bool:
+        item = values.get(period)
+        return item is not None and any(item.get(key) is not None for key in FLOW_METRICS)
+
+    while periods and not has_value(periods[-1]):
+        periods.pop()
+    while periods and not has_value(periods[0]):
+        periods.pop(0)
+
+    series: Dict[str, List[Optional[float]]] = {key: [] for key in SERIES_METRICS}
+    for period in periods:
+        item = values.get(period) or {}
+        for key in SERIES_METRICS:
+            value = item.get(key)
+            series[key].append(round(value / scale, 2) if value is not None else None)
+
+    return {"periods": [f"{year}Q{quarter}" for year, quarter in periods], "series": series}
+
+
+def build_series(statements: Dict[Period, List[Dict[str, Any]]],
+                 metrics_of: Callable[[List[Dict[str, Any]]], Dict[str, Any]],
+                 freq: str,
+                 start_year: int,
+                 end_year: int) -> Dict[str, Any]:
+    """
+    보고서별 계정 목록으로 분기 또는 TTM 시계열 생성
+
+    Args:
+        statements: {(연도, 분기): 해당 보고서의 계정 목록} (4분기는 사업보고서)
+        metrics_of: 계정 목록 → 주요 재무지표 (DartAPI 파싱/지표 계산)
+        freq: Q(분기) 또는 TTM(최근 4분기 합계)
+        start_year: 시작 연도 (TTM은 직전 연도 보고서도 있어야 첫 분기부터 계산됨)
+        end_year: 종료 연도
+
+    Returns:
+        series_arrays 결과 + freq, unit
+    """
+    # 사업보고서(4분기)는 전기 금액을 옮겨 온 계정일 수 있어 당기 금액을 그대로 사용
+    cumulative = {(year, quarter): metrics_of(cumulative_rows(rows) if quarter < 4 else rows)
+                  for (year, quarter), rows in statements.items() if rows}
+    values = discrete_quarters(cumulative)
+    if freq == "TTM":
+        values = trailing_twelve_months(values)
+
+    result = {"freq": freq, "unit": "억원"}
+    result.update(series_arrays(values, start_year, end_year))
+    return result
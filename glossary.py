@@ -0,0 +1,197 @@
+"""
+재무용어 사전 모듈
+AI가 생성한 재무용어 설명을 용어별로 SQLite에 저장하여 한 번 채운 뒤에는 AI 호출 없이 제공
+"""
+import json
+import re
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from metrics import record_cache
+
+# 기본으로 설명하는 재무용어 목록
+COMMON_TERMS = [
+    "영업이익률", "순이익률", "부채비율", "자기자본이익률(ROE)",
+    "매출액", "영업이익", "순이익", "총자산", "자본총계"
+]
+
+# 설명할 수 있는 재무용어 (기본 용어 + 상세 페이지/분석에 나오는 용어)
+# 요청마다 임의의 문자열로 AI를 호출하고 사전에 행을 쌓지 않도록 이 목록의 용어만 설명
+GLOSSARY_TERMS = frozenset(COMMON_TERMS + [
+    "ROE", "ROA", "자본비율", "총자산이익률(ROA)", "매출총이익률", "유동비율", "당좌비율", "이자보상배율",
+    "PER", "PBR", "EPS", "BPS", "EBITDA", "배당수익률", "배당성향",
+    "유동자산", "비유동자산", "유동부채", "비유동부채", "부채총계", "자본금", "이익잉여금",
+    "매출원가", "판매비와관리비", "감가상각비", "영업활동현금흐름", "잉여현금흐름(FCF)",
+    "TTM", "전년 대비 성장률", "업종 백분위"
+])
+
+# 용어 설명 항목 (정의, 실생활 예시, 투자시 중요성)
+TERM_FIELDS = ("definition", "example", "importance")
+
+
+class TermGlossary:
+    """용어별 설명을 보관하는 영구 용어 사전 (용어 단위 TTL)"""
+
+    def __init__(self, db_path: str = "glossary.db", ttl_seconds: int = 30 * 24 * 3600):
+        """
+        용어 사전 초기화
+
+        Args:
+            db_path: SQLite 데이터베이스 파일 경로
+            ttl_seconds: 용어 설명 유효시간(초), 지나면 다음 요청시 다시 생성
+        """
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.init_database()
+
+    def init_database(self):
+        """용어 사전 테이블 초기화 (여러 워커가 함께 쓰므로 WAL 모드)"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS glossary (
+                    term TEXT NOT NULL,
+                    model_name TEXT NOT NULL,
+                    prompt_version INTEGER NOT NULL,
+                    definition TEXT NOT NULL,
+                    example TEXT NOT NULL,
+                    importance TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (term, model_name, prompt_version)
+                )
+            ''')
+            conn.commit()
+
+    def lookup(self,
+               terms: List[str],
+               model_name: str,
+               prompt_version: int) -> Tuple[Dict[str, Dict[str, str]], List[str]]:
+        """
+        저장된 용어 설명 조회
+
+        Args:
+            terms: 조회할 용어 목록
+            model_name: 설명을 생성한 모델 이름
+            prompt_version: 용어 설명 프롬프트 버전
+
+        Returns:
+            (유효한 설명 {용어: {definition, example, importance}}, 없거나 만료된 용어 목록)
+        """
+        found = self._select(terms, model_name, prompt_version)
+        missing = [term for term in terms if term not in found]
+        record_cache("glossary", True, len(found))
+        record_cache("glossary", False, len(missing))
+        return found, missing
+
+    def _select(self, terms: List[str], model_name: str, prompt_version: int) -> Dict[str, Dict[str, str]]:
+        """유효한 용어 설명 조회 (캐시 지표 기록 없음, 다른 요청이 채우기를 기다릴 때 사용)"""
+        if not terms:
+            return {}
+
+        oldest = time.time() - self.ttl_seconds
+        placeholders = ",".join("?" * len(terms))
+
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT term, definition, example, importance FROM glossary
+                WHERE model_name = ? AND prompt_version = ? AND updated_at >= ?
+                AND term IN ({placeholders})
+            ''', (model_name, prompt_version, oldest, *terms))
+
+            return {
+                row[0]: dict(zip(TERM_FIELDS, row[1:]))
+                for row in cursor.fetchall()
+            }
+
+    def find_complete(self,
+                      terms: List[str],
+                      model_name: str,
+                      prompt_version: int) -> Optional[Dict[str, Dict[str, str]]]:
+        """모든 용어의 설명이 저장되어 있으면 반환, 하나라도 없으면 None"""
+        found = self._select(terms, model_name, prompt_version)
+        return found if len(found) == len(set(terms)) else None
+
+    def store(self, explanations: Dict[str, Dict[str, str]], model_name: str, prompt_version: int):
+        """
+        용어 설명 저장 (같은 용어는 갱신)
+
+        Args:
+            explanations: {용어: {definition, example, importance}}
+            model_name: 설명을 생성한 모델 이름
+            prompt_version: 용어 설명 프롬프트 버전
+        """
+        now = time.time()
+
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany('''
+                INSERT OR REPLACE INTO glossary
+                (term, model_name, prompt_version, definition, example, importance, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', [
+                (term, model_name, prompt_version,
+                 *(explanation.get(name, "") for name in TERM_FIELDS), now)
+                for term, explanation in explanations.items()
+            ])
+            conn.commit()
+
+    def clear(self):
+        """용어 사전 전체 삭제"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("DELETE FROM glossary")
+            conn.commit()
+
+
+def parse_term_explanations(text: str, terms: List[str]) -> Dict[str, Dict[str, str]]:
+    """
+    모델의 JSON 응답에서 용어별 설명 추출
+
+    Args:
+        text: 모델 응답 (JSON 객체, 코드블록으로 감싸져 있어도 됨)
+        terms: 요청한 용어 목록
+
+    Returns:
+        요청한 용어 중 설명이 있는 용어만 {용어: {definition, example, importance}}
+    """
+    data = _load_json_object(text)
+    if data is None:
+        return {}
+
+    # {"terms": [{"term": ..., ...}]} 또는 {"용어": {...}} 두 형식 모두 허용
+    items: Dict[str, Any] = {}
+    if isinstance(data.get("terms"), list):
+        for item in data["terms"]:
+            if isinstance(item, dict) and item.get("term"):
+                items[str(item["term"]).strip()] = item
+    else:
+        items = data
+
+    explanations = {}
+    for term in terms:
+        item = items.get(term)
+        if isinstance(item, dict) and str(item.get("definition", "")).strip():
+            explanations[term] = {name: str(item.get(name, "")).strip() for name in TERM_FIELDS}
+    return explanations
+
+
+def _load_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """응답 문자열에서 JSON 객체 파싱 (```json 코드블록 제거)"""
+    text = (text or "").strip()
+    fenced = re.match(r"^```(?:json)?\s*(.*?)\s*```$", text, re.DOTALL)
+    if fenced:
+        text = fenced.group(1)
+
+    try:
+        data = json.loads(text)
+    except ValueError:
+        start, end = text.find("{"), text.rfind("}")
+        if start < 0 or end <= start:
+            return None
+        try:
+            data = json.loads(text[start:end + 1])
+        except ValueError:
+            return None
+
+    return data if isinstance(data, dict) else None
@@ -0,0 +1,532 @@
+#!/usr/bin/env python3
+"""
+업종 통계 모듈
+DART 기업개황(company.json)의 업종코드/법인구분을 회사별로 저장하고,
+업종별 재무지표 분포(사분위수와 정렬된 값)를 미리 계산해 두어 업계 비교를 바로 제공
+
+- enrich: 기업개황을 분당 요청 한도 안에서 동시에 조회해 저장 (최근에 조회한 회사는 건너뜀)
+- aggregate: 저장된 회사들의 재무지표를 다중회사 API로 모아 업종별 분포 계산 (주기적으로 실행)
+
+실행:
+    python industry.py enrich --listed 3000 --rpm 600 --concurrency 8
+    python industry.py aggregate --year 2023
+"""
+import argparse
+import asyncio
+import json
+import sqlite3
+import time
+from bisect import bisect_left, bisect_right
+from statistics import quantiles
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from peer_comparison import PEER_METRICS, metric_vector
+
+# 저장하는 기업개황 항목
+OVERVIEW_FIELDS = ("corp_name", "stock_code", "corp_cls", "induty_code", "est_dt", "acc_mt", "ceo_nm", "hm_url")
+
+# 업종 통계를 계산하는 업종코드 자리수 (KSIC 중분류 2자리, 소분류 3자리)
+SECTOR_CODE_LENGTHS = (2, 3)
+
+# 업종 통계에 포함하는 법인구분 (유가증권, 코스닥, 코넥스)
+SECTOR_CORP_CLASSES = ("Y", "K", "N")
+
+# 업종 통계로 쓰기 위한 최소 회사 수 (이보다 적으면 상위 업종 통계 사용)
+MIN_SECTOR_COMPANIES = 5
+
+# 비율 지표의 분모 (분모가 0이면 지표가 0으로, 음수이면 부호가 뒤집혀 계산되므로 분포에서 제외)
+RATIO_BASES = {
+    "debt_ratio": "total_assets",
+    "operating_margin": "revenue",
+    "net_margin": "revenue",
+    "roe": "total_equity"
+}
+
+METRIC_KEYS = [key for key, _, _ in PEER_METRICS]
+
+
+class IndustryStore:
+    """기업개황과 업종별 재무지표 분포 저장소 (SQLite)"""
+
+    def __init__(self, db_path: str = "industry.db"):
+        """
+        Args:
+            db_path: SQLite 데이터베이스 파일 경로
+        """
+        self.db_path = db_path
+        self.init_database()
+
+    def init_database(self):
+        """테이블 초기화 (앱 워커와 일괄 작업이 함께 쓰므로 WAL 모드)"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS company_overviews (
+                    corp_code TEXT PRIMARY KEY,
+                    corp_name TEXT,
+                    stock_code TEXT,
+                    corp_cls TEXT,
+                    induty_code TEXT,
+                    est_dt TEXT,
+                    acc_mt TEXT,
+                    ceo_nm TEXT,
+                    hm_url TEXT,
+                    updated_at REAL NOT NULL
+                )
+            ''')
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_overview_induty ON company_overviews(induty_code)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_overview_cls ON company_overviews(corp_cls, induty_code)")
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS sector_metrics (
+                    sector_code TEXT NOT NULL,
+                    year INTEGER NOT NULL,
+                    metric TEXT NOT NULL,
+                    company_count INTEGER NOT NULL,
+                    p25 REAL,
+                    median REAL,
+                    p75 REAL,
+                    sorted_values TEXT NOT NULL,
+                    computed_at REAL NOT NULL,
+                    PRIMARY KEY (sector_code, year, metric)
+                )
+            ''')
+            conn.commit()
+
+    def upsert_overviews(self, overviews: List[Dict[str, Any]]):
+        """
+        기업개황 저장 (같은 회사는 갱신)
+
+        Args:
+            overviews: 기업개황 응답 목록 (corp_code 포함)
+        """
+        now = time.time()
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany(f'''
+                INSERT OR REPLACE INTO company_overviews
+                (corp_code, {", ".join(OVERVIEW_FIELDS)}, updated_at)
+                VALUES (?, {", ".join("?" * len(OVERVIEW_FIELDS))}, ?)
+            ''', [
+                (overview["corp_code"], *((overview.get(name) or "").strip() for name in OVERVIEW_FIELDS), now)
+                for overview in overviews
+            ])
+            conn.commit()
+
+    def get_overview(self, corp_code: str) -> Optional[Dict[str, Any]]:
+        """저장된 기업개황 (없으면 None)"""
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(f'''
+                SELECT {", ".join(OVERVIEW_FIELDS)}, updated_at FROM company_overviews WHERE corp_code = ?
+            ''', (corp_code,)).fetchone()
+        if row is None:
+            return None
+        overview = dict(zip(OVERVIEW_FIELDS, row[:-1]))
+        overview["corp_code"] = corp_code
+        overview["updated_at"] = row[-1]
+        return overview
+
+    def outdated_codes(self, corp_codes: List[str], max_age_seconds: float) -> List[str]:
+        """
+        기업개황이 없거나 max_age_seconds보다 오래된 회사 목록 (입력 순서 유지)
+
+        Args:
+            corp_codes: 고유번호 목록
+            max_age_seconds: 다시 조회할 기준 시간(초)
+
+        Returns:
+            조회가 필요한 고유번호 목록
+        """
+        oldest = time.time() - max_age_seconds
+        fresh = set()
+        with sqlite3.connect(self.db_path) as conn:
+            for start in range(0, len(corp_codes), 500):
+                chunk = corp_codes[start:start + 500]
+                fresh.update(row[0] for row in conn.execute(f'''
+                    SELECT corp_code FROM company_overviews
+                    WHERE updated_at >= ? AND corp_code IN ({",".join("?" * len(chunk))})
+                ''', (oldest, *chunk)))
+        return [corp_code for corp_code in corp_codes if corp_code not in fresh]
+
+    def sector_companies(self, corp_classes: Iterable[str] = SECTOR_CORP_CLASSES) -> List[Tuple[str, str]]:
+        """
+        업종 통계 대상 회사 목록
+
+        Args:
+            corp_classes: 포함할 법인구분
+
+        Returns:
+            [(고유번호, 업종코드)] (업종코드가 없는 회사 제외)
+        """
+        corp_classes = list(corp_classes)
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute(f'''
+                SELECT corp_code, induty_code FROM company_overviews
+                WHERE corp_cls IN ({",".join("?" * len(corp_classes))}) AND induty_code != ''
+                ORDER BY corp_code
+            ''', corp_classes).fetchall()
+
+    def replace_sector_metrics(self, year: int, rows: List[Tuple]):
+        """
+        연도의 업종 통계 전체를 한 번에 교체 (읽는 쪽은 이전 통계 또는 새 통계만 봄)
+
+        Args:
+            year: 사업연도
+            rows: [(업종코드, 지표, 회사 수, p25, 중앙값, p75, 정렬된 값 목록)]
+        """
+        now = time.time()
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("DELETE FROM sector_metrics WHERE year = ?", (year,))
+            conn.executemany('''
+                INSERT INTO sector_metrics
+                (sector_code, year, metric, company_count, p25, median, p75, sorted_values, computed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [(sector, year, metric, count, p25, p50, p75, json.dumps(values), now)
+                  for sector, metric, count, p25, p50, p75, values in rows])
+            conn.commit()
+
+    def get_sector_metrics(self, sector_code: str, year: int) -> Dict[str, Dict[str, Any]]:
+        """
+        업종 통계 조회
+
+        Args:
+            sector_code: 업종코드 (SECTOR_CODE_LENGTHS 자리수)
+            year: 사업연도
+
+        Returns:
+            {지표: {count, p25, median, p75, values, computed_at}} (없으면 빈 딕셔너리)
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute('''
+                SELECT metric, company_count, p25, median, p75, sorted_values, computed_at
+                FROM sector_metrics WHERE sector_code = ? AND year = ?
+            ''', (sector_code, year)).fetchall()
+        return {
+            metric: {"count": count, "p25": p25, "median": p50, "p75": p75,
+                     "values": json.loads(values), "computed_at": computed_at}
+            for metric, count, p25, p50, p75, values, computed_at in rows
+        }
+
+    def find_sector(self, induty_code: str, year: int) -> Optional[str]:
+        """
+        회사 업종코드에 맞는 업종 통계 코드 (가장 세분된 업종 중 회사 수가 MIN_SECTOR_COMPANIES 이상인 것)
+
+        Args:
+            induty_code: 회사 업종코드
+            year: 사업연도
+
+        Returns:
+            업종 통계 코드 또는 None
+        """
+        candidates = [induty_code[:length] for length in sorted(SECTOR_CODE_LENGTHS, reverse=True)
+                      if len(induty_code) >= length]
+        if not candidates:
+            return None
+
+        with sqlite3.connect(self.db_path) as conn:
+            counts = dict(conn.execute(f'''
+                SELECT sector_code, MAX(company_count) FROM sector_metrics
+                WHERE year = ? AND sector_code IN ({",".join("?" * len(candidates))})
+                GROUP BY sector_code
+            ''', (year, *candidates)).fetchall())
+
+        for code in candidates:
+            if counts.get(code, 0) >= MIN_SECTOR_COMPANIES:
+                return code
+        return None
+
+
+def distribution(values: List[float]) -> Tuple[float, float, float]:
+    """사분위수 (p25, 중앙값, p75)"""
+    if len(values) == 1:
+        return values[0], values[0], values[0]
+    p25, p50, p75 = quantiles(values, n=4, method="inclusive")
+    return round(p25, 2), round(p50, 2), round(p75, 2)
+
+
+def percentile_rank(sorted_values: List[float], value: float) -> Optional[float]:
+    """
+    분포 안에서의 백분위 (같은 값은 절반만 아래로 셈, 0~100)
+
+    Args:
+        sorted_values: 정렬된 업종 값 목록
+        value: 회사 값
+
+    Returns:
+        백분위 (분포가 비어 있으면 None)
+    """
+    if not sorted_values:
+        return None
+    below = bisect_left(sorted_values, value)
+    equal = bisect_right(sorted_values, value) - below
+    return round((below + equal / 2) / len(sorted_values) * 100, 1)
+
+
+def usable_metrics(vector: List[Optional[float]]) -> Dict[str, float]:
+    """지표 값 목록에서 분포에 넣을 값만 선택 (분모가 0 이하인 비율 지표 제외: 자본잠식 회사의 ROE 등)"""
+    values = dict(zip(METRIC_KEYS, vector))
+    return {
+        key: value for key, value in values.items()
+        if value is not None and (key not in RATIO_BASES or (values.get(RATIO_BASES[key]) or 0) > 0)
+    }
+
+
+def sector_aggregate_rows(companies: List[Tuple[str, str]],
+                          vectors: Dict[str, List[Optional[float]]]) -> List[Tuple]:
+    """
+    회사별 지표로 업종별 분포 계산
+
+    Args:
+        companies: [(고유번호, 업종코드)]
+        vectors: {고유번호: PEER_METRICS 순서의 지표 값 목록}
+
+    Returns:
+        IndustryStore.replace_sector_metrics 입력 행 목록
+    """
+    grouped: Dict[Tuple[str, str], List[float]] = {}
+    for corp_code, induty_code in companies:
+        vector = vectors.get(corp_code)
+        if vector is None:
+            continue
+        metrics = usable_metrics(vector)
+        for length in SECTOR_CODE_LENGTHS:
+            if len(induty_code) < length:
+                continue
+            sector = induty_code[:length]
+            for key, value in metrics.items():
+                grouped.setdefault((sector, key), []).append(value)
+
+    rows = []
+    for (sector, metric), values in sorted(grouped.items()):
+        values.sort()
+        rows.append((sector, metric, len(values), *distribution(values), values))
+    return rows
+
+
+def compare_to_sector(metrics: Dict[str, Any], sector_metrics: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    회사 재무지표의 업종 내 위치
+
+    Args:
+        metrics: 회사의 주요 재무지표 (get_key_financial_metrics 결과, 원 단위)
+        sector_metrics: IndustryStore.get_sector_metrics 결과
+
+    Returns:
+        {지표: {name, unit, value, percentile, p25, median, p75, count}}
+    """
+    values = usable_metrics(metric_vector(metrics))
+    comparison = {}
+    for key, name, unit in PEER_METRICS:
+        stats = sector_metrics.get(key)
+        if stats is None:
+            continue
+        value = values.get(key)
+        comparison[key] = {
+            "name": name,
+            "unit": unit,
+            "value": value,
+            "percentile": percentile_rank(stats["values"], value) if value is not None else None,
+            "p25": stats["p25"],
+            "median": stats["median"],
+            "p75": stats["p75"],
+            "count": stats["count"]
+        }
+    return comparison
+
+
+def describe_sector_comparison(company_name: str, comparison: Dict[str, Dict[str, Any]], sector_code: str) -> str:
+    """
+    업종 내 위치를 설명하는 문장 (AI 호출 없이 백분위로 작성)
+
+    Args:
+        company_name: 회사명
+        comparison: compare_to_sector 결과
+        sector_code: 업종 통계 코드
+
+    Returns:
+        업계 비교 설명
+    """
+    lines = [f"{company_name}의 재무지표를 같은 업종(업종코드 {sector_code}) 상장회사와 비교한 결과입니다."]
+    for key in ("operating_margin", "net_margin", "roe", "debt_ratio"):
+        item = comparison.get(key)
+        if item is None or item["percentile"] is None:
+            continue
+        # 부채비율은 낮을수록 좋으므로 하위일수록 양호
+        if key == "debt_ratio":
+            position = "낮은 편" if item["percentile"] <= 25 else "높은 편" if item["percentile"] >= 75 else "중간 수준"
+        else:
+            position = "상위권" if item["percentile"] >= 75 else "하위권" if item["percentile"] <= 25 else "중간 수준"
+        lines.append(
+            f"- {item['name']} {item['value']:,.1f}{item['unit']}: 업종 {item['count']}개사 중 백분위 "
+            f"{item['percentile']:.0f} ({position}, 중앙값 {item['median']:,.1f}{item['unit']}, "
+            f"사분위 {item['p25']:,.1f}~{item['p75']:,.1f}{item['unit']})"
+        )
+    return "\n".join(lines)
+
+
+async def enrich_overviews(dart_api,
+                           store: IndustryStore,
+                           corp_codes: List[str],
+                           requests_per_minute: float = 600,
+                           concurrency: int = 8,
+                           max_age_days: float = 30):
+    """
+    기업개황 일괄 조회 및 저장 (분당 요청 한도 안에서 동시에 조회)
+
+    Args:
+        dart_api: DART API 클라이언트
+        store: 기업개황 저장소
+        corp_codes: 조회할 고유번호 목록
+        requests_per_minute: DART 분당 요청 한도
+        concurrency: 동시 요청 수
+        max_age_days: 이 기간 안에 조회한 회사는 건너뜀
+
+    Returns:
+        실행 결과 (BatchReport)
+    """
+    from batch_analysis import BatchReport, RateLimiter
+
+    unique_codes = list(dict.fromkeys(corp_codes))
+    pending = store.outdated_codes(unique_codes, max_age_days * 24 * 3600)
+    report = BatchReport(total=len(unique_codes), skipped=len(unique_codes) - len(pending))
+    print(f"🚀 기업개황 조회 시작: 대상 {len(pending)}개 (건너뜀 {report.skipped}개)")
+
+    limiter = RateLimiter(requests_per_minute, burst=concurrency)
+    queue: asyncio.Queue = asyncio.Queue()
+    for corp_code in pending:
+        queue.put_nowait(corp_code)
+
+    # 모아서 저장 (회사마다 트랜잭션을 열지 않도록)
+    buffer: List[Dict[str, Any]] = []
+    started = time.perf_counter()
+
+    def flush():
+        if buffer:
+            store.upsert_overviews(buffer)
+            buffer.clear()
+
+    async def worker():
+        while True:
+            try:
+                corp_code = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            await limiter.acquire()
+            try:
+                result = await asyncio.to_thread(dart_api.get_company_overview, corp_code)
+                if result.get("status") != "000":
+                    raise ValueError(f"기업개황 조회 실패: {result.get('message')}")
+                buffer.append(dict(result, corp_code=corp_code))
+                report.succeeded += 1
+            except Exception as e:
+                report.failed += 1
+                report.errors[corp_code] = str(e)
+
+            if len(buffer) >= 100:
+                flush()
+            if report.processed % 100 == 0:
+                elapsed = time.perf_counter() - started
+                rate = report.processed / elapsed * 60 if elapsed > 0 else 0
+                print(f"  [{report.processed}/{len(pending)}] (성공 {report.succeeded}, 실패 {report.failed}, {rate:.1f}개/분)")
+
+    try:
+        await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    finally:
+        flush()
+
+    report.elapsed_seconds = time.perf_counter() - started
+    print(f"✅ 기업개황 조회 완료: 성공 {report.succeeded}개, 실패 {report.failed}개, "
+          f"{report.elapsed_seconds:.1f}초 ({report.companies_per_minute:.1f}개/분)")
+    return report
+
+
+def build_sector_aggregates(dart_api, store: IndustryStore, year: int, chunk_size: int = 500) -> Dict[str, Any]:
+    """
+    업종별 재무지표 분포 계산 및 저장 (주기적으로 실행)
+    회사별 재무제표는 다중회사 API로 모아서 조회하고 앱과 같은 캐시를 사용
+
+    Args:
+        dart_api: DART API 클라이언트
+        store: 기업개황 저장소
+        year: 사업연도
+        chunk_size: 한 번에 재무제표를 모을 회사 수
+
+    Returns:
+        {year, companies, with_data, sectors, rows, elapsed_seconds}
+    """
+    started = time.perf_counter()
+    companies = store.sector_companies()
+    codes = [corp_code for corp_code, _ in companies]
+    print(f"📊 {year}년 업종 통계 계산: 대상 {len(codes)}개사")
+
+    vectors: Dict[str, List[Optional[float]]] = {}
+    for start in range(0, len(codes), chunk_size):
+        chunk = codes[start:start + chunk_size]
+        financials, _ = dart_api.get_peer_financials(chunk, [year])
+        for corp_code in chunk:
+            rows = financials.get(corp_code, {}).get(year)
+            if rows:
+                parsed = dart_api.parse_financial_data(rows)
+                vectors[corp_code] = metric_vector(dart_api.get_key_financial_metrics(parsed))
+        print(f"  [{min(start + chunk_size, len(codes))}/{len(codes)}] 재무지표 {len(vectors)}개사")
+
+    rows = sector_aggregate_rows(companies, vectors)
+    store.replace_sector_metrics(year, rows)
+
+    summary = {
+        "year": year,
+        "companies": len(codes),
+        "with_data": len(vectors),
+        "sectors": len({row[0] for row in rows}),
+        "rows": len(rows),
+        "elapsed_seconds": round(time.perf_counter() - started, 1)
+    }
+    print(f"✅ 업종 통계 저장 완료: 업종 {summary['sectors']}개, 재무지표 {summary['with_data']}개사, "
+          f"{summary['elapsed_seconds']}초")
+    return summary
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="기업개황 수집 및 업종 통계 계산")
+    parser.add_argument("--db", default="industry.db", help="업종 통계 DB 파일 경로")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    enrich = subparsers.add_parser("enrich", help="기업개황 일괄 조회")
+    enrich.add_argument("--corp-codes", nargs="*", default=[], help="조회할 기업 고유번호 목록")
+    enrich.add_argument("--listed", type=int, default=0, help="상장회사 중 앞에서부터 N개 조회")
+    enrich.add_argument("--rpm", type=float, default=600, help="DART 분당 요청 한도")
+    enrich.add_argument("--concurrency", type=int, default=8, help="동시 요청 수")
+    enrich.add_argument("--max-age-days", type=float, default=30, help="이 기간 안에 조회한 회사는 건너뜀")
+
+    aggregate = subparsers.add_parser("aggregate", help="업종별 재무지표 분포 계산")
+    aggregate.add_argument("--year", type=int, default=2023, help="사업연도")
+    aggregate.add_argument("--chunk-size", type=int, default=500, help="한 번에 재무제표를 모을 회사 수")
+    args = parser.parse_args(argv)
+
+    from dart_api import DartAPI
+
+    store = IndustryStore(args.db)
+    dart_api = DartAPI()
+
+    if args.command == "enrich":
+        from database import CompanyDatabase
+
+        corp_codes = list(args.corp_codes)
+        if args.listed:
+            company_db = CompanyDatabase()
+            if company_db.get_company_count() == 0:
+                company_db.load_from_json()
+            corp_codes.extend(company.corp_code for company in company_db.get_listed_companies(limit=args.listed))
+        if not corp_codes:
+            parser.error("--corp-codes 또는 --listed 중 하나를 지정해주세요.")
+
+        report = asyncio.run(enrich_overviews(dart_api, store, corp_codes, args.rpm, args.concurrency,
+                                              args.max_age_days))
+        for corp_code, error in list(report.errors.items())[:20]:
+            print(f"  ❌ {corp_code}: {error}")
+    else:
+        build_sector_aggregates(dart_api, store, args.year, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
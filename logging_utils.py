@@ -0,0 +1,61 @@
+"""
+로깅 설정 모듈
+레벨별 로그 출력과 저수준(INFO 이하) 로그 샘플링으로 요청마다 쌓이는 출력 비용을 제한
+
+환경변수:
+    LOG_LEVEL: 출력할 최소 로그 레벨 (기본 INFO, 디버깅시 DEBUG)
+    LOG_SAMPLE_RATE: INFO 이하 로그를 출력할 비율 0~1 (기본 1.0, WARNING 이상은 항상 출력)
+"""
+import logging
+import os
+import random
+
+LOGGER_NAME = "fs_app"
+
+
+class SamplingFilter(logging.Filter):
+    """WARNING 미만 로그를 일정 비율로만 통과시키는 필터"""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = max(0.0, min(1.0, rate))
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.rate >= 1.0:
+            return True
+        return random.random() < self.rate
+
+
+def configure_logging(level: str = None, sample_rate: float = None) -> logging.Logger:
+    """
+    애플리케이션 로거 설정 (여러 번 호출해도 핸들러는 하나만 등록)
+
+    Args:
+        level: 로그 레벨 (없으면 LOG_LEVEL 환경변수)
+        sample_rate: INFO 이하 로그 샘플링 비율 (없으면 LOG_SAMPLE_RATE 환경변수)
+
+    Returns:
+        애플리케이션 루트 로거
+    """
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel((level or os.getenv("LOG_LEVEL", "INFO")).upper())
+    logger.propagate = False
+
+    if sample_rate is None:
+        sample_rate = float(os.getenv("LOG_SAMPLE_RATE", "1.0"))
+
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+        logger.addHandler(handler)
+
+    for handler in logger.handlers:
+        handler.filters = [f for f in handler.filters if not isinstance(f, SamplingFilter)]
+        handler.addFilter(SamplingFilter(sample_rate))
+
+    return logger
+
+
+def get_logger(name: str) -> logging.Logger:
+    """모듈별 로거 (fs_app 하위 로거)"""
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
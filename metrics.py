@@ -0,0 +1,304 @@
+"""
+애플리케이션 지표 수집 모듈
+카운터, 게이지, 히스토그램을 프로세스 내에서 집계하고 Prometheus 텍스트 형식으로 출력
+단계별 소요 시간(span)은 히스토그램과 요청별 Server-Timing 집계에 함께 기록
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# 기본 히스토그램 구간 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    """Prometheus 라벨 문자열 생성"""
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in pairs) + "}"
+
+
+def _escape_label(value: str) -> str:
+    """라벨 값 이스케이프 (역슬래시, 따옴표, 줄바꿈)"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    """Prometheus 숫자 표기"""
+    if value == float('inf'):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """지표 공통 기능 (이름, 설명, 라벨)"""
+
+    metric_type = ""
+
+    def __init__(self, name: str, description: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _label_values(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} 라벨이 올바르지 않습니다: {sorted(labels)} (필요: {list(self.labelnames)})")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.metric_type}"]
+        lines.extend(self._render_samples())
+        return lines
+
+    def _render_samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """단조 증가 카운터"""
+
+    metric_type = "counter"
+
+    def __init__(self, name: str, description: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, description, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        """카운터 증가"""
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        """현재 값 조회"""
+        with self._lock:
+            return self._values.get(self._label_values(labels), 0)
+
+    def _render_samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(_Metric):
+    """증감 가능한 현재값 지표"""
+
+    metric_type = "gauge"
+
+    def __init__(self, name: str, description: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, description, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels):
+        """값 설정"""
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        """값 증가"""
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        """값 감소"""
+        self.inc(-amount, **labels)
+
+    def value(self, **labels) -> float:
+        """현재 값 조회"""
+        with self._lock:
+            return self._values.get(self._label_values(labels), 0)
+
+    def _render_samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Histogram(_Metric):
+    """구간별 분포 히스토그램 (지연시간 등)"""
+
+    metric_type = "histogram"
+
+    def __init__(self, name: str, description: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, description, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 라벨별 (구간별 누적 전 개수, 합계, 전체 개수)
+        self._values: Dict[LabelValues, Tuple[List[int], float, int]] = {}
+
+    def observe(self, value: float, **labels):
+        """관측값 기록"""
+        key = self._label_values(labels)
+        with self._lock:
+            counts, total, count = self._values.get(key, ([0] * len(self.buckets), 0.0, 0))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._values[key] = (counts, total + value, count + 1)
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """블록 실행 시간을 초 단위로 기록"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def snapshot(self, **labels) -> Dict[str, float]:
+        """개수와 합계 조회"""
+        with self._lock:
+            _, total, count = self._values.get(self._label_values(labels), ([], 0.0, 0))
+        return {"count": count, "sum": total}
+
+    def _render_samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, (list(counts), total, count)) for key, (counts, total, count) in self._values.items())
+
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, ('le', _format_value(bound)))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, ('le', '+Inf'))} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """지표 등록소 (같은 이름은 같은 지표 객체를 반환)"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, description: str, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, description, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f"{name} 지표가 이미 다른 형식으로 등록되어 있습니다.")
+            return metric
+
+    def counter(self, name: str, description: str, labelnames: Sequence[str] = ()) -> Counter:
+        """카운터 등록/조회"""
+        return self._get_or_create(Counter, name, description, labelnames=labelnames)
+
+    def gauge(self, name: str, description: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """게이지 등록/조회"""
+        return self._get_or_create(Gauge, name, description, labelnames=labelnames)
+
+    def histogram(self, name: str, description: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """히스토그램 등록/조회"""
+        return self._get_or_create(Histogram, name, description, labelnames=labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        """전체 지표를 Prometheus 텍스트 형식으로 출력"""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# 애플리케이션 전역 지표 등록소
+registry = MetricsRegistry()
+
+
+# 단계별 지표
+STAGE_DURATION = registry.histogram(
+    "stage_duration_seconds",
+    "단계별 소요 시간 (dart_fetch, parse, metrics, chart_build, serialize, db_query, llm_call)",
+    labelnames=("stage",)
+)
+STAGE_ERRORS = registry.counter("stage_errors_total", "단계별 예외 발생 수", labelnames=("stage",))
+CACHE_REQUESTS = registry.counter("cache_requests_total", "캐시 조회 수", labelnames=("cache", "result"))
+
+# 현재 요청의 단계별 누적 시간 (미들웨어가 요청마다 설정)
+_request_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_timings", default=None)
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """
+    단계 실행 시간 기록 (히스토그램 + 현재 요청의 단계별 합계)
+    블록에서 예외가 발생하면 단계별 오류 수도 증가
+
+    Args:
+        stage: 단계 이름
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.inc(stage=stage)
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_DURATION.observe(elapsed, stage=stage)
+
+        timings = _request_timings.get()
+        if timings is not None:
+            timings[stage] = timings.get(stage, 0.0) + elapsed
+
+
+def timed(stage: str) -> Callable:
+    """함수 실행 시간을 span으로 기록하는 데코레이터"""
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_cache(cache: str, hit: bool, count: int = 1):
+    """캐시 적중/실패 기록"""
+    if count:
+        CACHE_REQUESTS.inc(count, cache=cache, result="hit" if hit else "miss")
+
+
+def start_request_timings() -> Dict[str, float]:
+    """현재 요청의 단계별 시간 집계 시작 (반환된 딕셔너리에 누적됨)"""
+    timings: Dict[str, float] = {}
+    _request_timings.set(timings)
+    return timings
+
+
+def server_timing_header(timings: Dict[str, float], total: Optional[float] = None) -> str:
+    """
+    단계별 시간을 Server-Timing 헤더 값으로 변환 (브라우저 개발자도구에서 확인 가능)
+
+    Args:
+        timings: 단계별 소요 시간(초)
+        total: 전체 요청 처리 시간(초)
+
+    Returns:
+        예: "dart_fetch;dur=812.4, parse;dur=3.1, total;dur=830.2"
+    """
+    entries = [f"{stage};dur={elapsed * 1000:.1f}" for stage, elapsed in timings.items()]
+    if total is not None:
+        entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
@@ -0,0 +1,100 @@
+"""
+기업 비교 모듈
+여러 회사의 연도별 재무지표를 회사 × 연도 × 지표 행렬로 정렬하고 비교 차트용 값을 만듦
+"""
+from statistics import median
+from typing import Any, Callable, Dict, List, Optional
+
+# 비교 지표 (키, 이름, 단위). 금액은 억원, 비율은 %
+PEER_METRICS = (
+    ("revenue", "매출액", "억원"),
+    ("operating_profit", "영업이익", "억원"),
+    ("net_income", "순이익", "억원"),
+    ("total_assets", "총자산", "억원"),
+    ("total_equity", "자본", "억원"),
+    ("debt_ratio", "부채비율", "%"),
+    ("operating_margin", "영업이익률", "%"),
+    ("net_margin", "순이익률", "%"),
+    ("roe", "ROE", "%"),
+)
+AMOUNT_UNIT = "억원"
+
+# 비교 차트로 만드는 지표
+PEER_CHART_METRICS = ("revenue", "operating_margin", "roe", "debt_ratio")
+
+# 한 번에 비교할 수 있는 최대 회사 수와 연도 수
+MAX_PEER_COMPANIES = 50
+MAX_PEER_YEARS = 10
+
+
+def peer_matrix(corp_codes: List[str],
+                years: List[int],
+                financials: Dict[str, Dict[int, List[Dict[str, Any]]]],
+                metrics_of: Callable[[List[Dict[str, Any]]], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    회사 × 연도 × 지표 행렬 생성 (데이터가 없는 칸은 None)
+
+    Args:
+        corp_codes: 고유번호 목록 (행 순서)
+        years: 연도 목록 (열 순서)
+        financials: {고유번호: {연도: 계정 목록}}
+        metrics_of: 계정 목록 → 주요 재무지표 (DartAPI 파싱/지표 계산)
+
+    Returns:
+        {"metrics": [지표 정보], "values": values[회사][연도][지표], "median": median[연도][지표]}
+    """
+    values: List[List[Optional[List[Optional[float]]]]] = []
+    for corp_code in corp_codes:
+        by_year = financials.get(corp_code, {})
+        row = []
+        for year in years:
+            rows = by_year.get(year)
+            row.append(metric_vector(metrics_of(rows)) if rows else None)
+        values.append(row)
+
+    medians = []
+    for year_index in range(len(years)):
+        year_medians = []
+        for metric_index in range(len(PEER_METRICS)):
+            column = [row[year_index][metric_index] for row in values
+                      if row[year_index] is not None and row[year_index][metric_index] is not None]
+            year_medians.append(round(median(column), 2) if column else None)
+        medians.append(year_medians)
+
+    return {
+        "metrics": [{"key": key, "name": name, "unit": unit} for key, name, unit in PEER_METRICS],
+        "values": values,
+        "median": medians
+    }
+
+
+def metric_vector(metrics: Dict[str, Any]) -> List[Optional[float]]:
+    """주요 재무지표를 PEER_METRICS 순서의 값 목록으로 변환 (금액은 억원)"""
+    vector = []
+    for key, _, unit in PEER_METRICS:
+        value = metrics.get(key)
+        if value is None:
+            vector.append(None)
+        elif unit == AMOUNT_UNIT:
+            vector.append(round(value / 100000000, 2))
+        else:
+            vector.append(round(value, 2))
+    return vector
+
+
+def metric_by_year(matrix: Dict[str, Any], metric_key: str) -> List[List[Optional[float]]]:
+    """
+    행렬에서 지표 하나를 연도별 회사 값 목록으로 추출 (비교 차트 입력)
+
+    Args:
+        matrix: peer_matrix 결과
+        metric_key: 지표 키
+
+    Returns:
+        values[연도 순번][회사 순번]
+    """
+    metric_index = [key for key, _, _ in PEER_METRICS].index(metric_key)
+    year_count = len(matrix["median"])
+    return [[row[year_index][metric_index] if row[year_index] is not None else None
+             for row in matrix["values"]]
+            for year_index in range(year_count)]
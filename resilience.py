@@ -0,0 +1,243 @@
+"""
+외부 API 장애 대응 모듈
+오류율이나 응답 지연이 커지면 호출을 잠시 멈추는 회로 차단기(circuit breaker)와,
+느린 요청에 같은 요청을 한 번 더 보내 먼저 온 응답을 쓰는 헤지 요청(hedged request)
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait
+from typing import Callable, Deque, Tuple, TypeVar
+
+from logging_utils import get_logger
+from metrics import registry
+
+logger = get_logger("resilience")
+
+T = TypeVar("T")
+
+# 회로 상태 (지표 값: 0 닫힘, 1 열림, 2 반열림)
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+CIRCUIT_STATE_VALUES = {CIRCUIT_CLOSED: 0, CIRCUIT_OPEN: 1, CIRCUIT_HALF_OPEN: 2}
+
+CIRCUIT_STATE = registry.gauge("circuit_breaker_state", "회로 차단기 상태 (0 닫힘, 1 열림, 2 반열림)",
+                               labelnames=("name",))
+CIRCUIT_TRANSITIONS = registry.counter("circuit_breaker_transitions_total", "회로 차단기 상태 전환 수",
+                                       labelnames=("name", "state"))
+CIRCUIT_REJECTED = registry.counter("circuit_breaker_rejected_total", "회로가 열려 있어 바로 실패한 호출 수",
+                                    labelnames=("name",))
+HEDGED_REQUESTS = registry.counter("hedged_requests_total",
+                                   "헤지 요청 수 (result: 먼저 성공한 쪽 primary/hedge, 둘 다 실패 failed)",
+                                   labelnames=("name", "result"))
+
+
+class CircuitOpenError(Exception):
+    """회로가 열려 있어 호출하지 않고 바로 실패"""
+
+
+class CircuitBreaker:
+    """
+    회로 차단기
+
+    최근 window_size번 호출 중 실패 비율이나 느린 호출 비율이 기준을 넘으면 열림(open) 상태가 되어
+    open_seconds 동안 호출을 바로 거절함. 그 후 반열림(half_open) 상태에서 시험 호출 하나만 허용하고,
+    시험 호출이 빠르게 성공하면 닫힘, 아니면 다시 열림
+    """
+
+    def __init__(self,
+                 name: str,
+                 window_size: int = 20,
+                 min_calls: int = 5,
+                 failure_rate: float = 0.5,
+                 slow_call_seconds: float = 5.0,
+                 slow_call_rate: float = 0.5,
+                 open_seconds: float = 30.0):
+        """
+        Args:
+            name: 지표 라벨용 이름
+            window_size: 비율을 계산할 최근 호출 수
+            min_calls: 비율을 판단하기 위한 최소 호출 수
+            failure_rate: 회로를 여는 실패 비율
+            slow_call_seconds: 느린 호출로 보는 소요 시간(초)
+            slow_call_rate: 회로를 여는 느린 호출 비율
+            open_seconds: 열림 상태 유지 시간(초)
+        """
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=window_size)  # (성공 여부, 느림 여부)
+        self._state = CIRCUIT_CLOSED
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+        CIRCUIT_STATE.set(0, name=name)
+
+    @property
+    def state(self) -> str:
+        """현재 상태 (열림 유지 시간이 지났으면 반열림으로 봄)"""
+        with self._lock:
+            if self._state == CIRCUIT_OPEN and time.monotonic() >= self._opened_at + self.open_seconds:
+                return CIRCUIT_HALF_OPEN
+            return self._state
+
+    @property
+    def is_open(self) -> bool:
+        """호출을 거절하는 중인지 (열림 유지 시간 안)"""
+        return self.state == CIRCUIT_OPEN
+
+    def allow(self) -> bool:
+        """
+        호출 허용 여부 (허용된 호출은 반드시 record로 결과를 알려야 함)
+
+        Returns:
+            호출해도 되면 True
+        """
+        with self._lock:
+            if self._state == CIRCUIT_OPEN:
+                if time.monotonic() < self._opened_at + self.open_seconds:
+                    CIRCUIT_REJECTED.inc(name=self.name)
+                    return False
+                self._transition(CIRCUIT_HALF_OPEN)
+                self._trial_in_flight = False
+
+            if self._state == CIRCUIT_HALF_OPEN:
+                if self._trial_in_flight:
+                    CIRCUIT_REJECTED.inc(name=self.name)
+                    return False
+                self._trial_in_flight = True
+
+            return True
+
+    def record(self, success: bool, duration: float):
+        """
+        호출 결과 기록
+
+        Args:
+            success: 성공 여부
+            duration: 소요 시간(초)
+        """
+        slow = duration >= self.slow_call_seconds
+        with self._lock:
+            if self._state == CIRCUIT_HALF_OPEN:
+                self._trial_in_flight = False
+                if success and not slow:
+                    self._outcomes.clear()
+                    self._transition(CIRCUIT_CLOSED)
+                else:
+                    self._open()
+                return
+
+            if self._state == CIRCUIT_OPEN:
+                # 열리기 전에 시작한 호출의 늦은 결과
+                return
+
+            self._outcomes.append((success, slow))
+            calls = len(self._outcomes)
+            if calls < self.min_calls:
+                return
+
+            failures = sum(1 for ok, _ in self._outcomes if not ok)
+            slow_calls = sum(1 for _, is_slow in self._outcomes if is_slow)
+            if failures / calls >= self.failure_rate or slow_calls / calls >= self.slow_call_rate:
+                logger.warning("🔌 %s 회로 열림: 최근 %d건 중 실패 %d건, 느린 호출 %d건",
+                               self.name, calls, failures, slow_calls)
+                self._open()
+
+    def reset(self):
+        """닫힘 상태로 초기화"""
+        with self._lock:
+            self._outcomes.clear()
+            self._trial_in_flight = False
+            self._transition(CIRCUIT_CLOSED)
+
+    def _open(self):
+        self._opened_at = time.monotonic()
+        self._transition(CIRCUIT_OPEN)
+
+    def _transition(self, state: str):
+        if state == self._state:
+            return
+        self._state = state
+        CIRCUIT_STATE.set(CIRCUIT_STATE_VALUES[state], name=self.name)
+        CIRCUIT_TRANSITIONS.inc(name=self.name, state=state)
+        if state == CIRCUIT_CLOSED:
+            logger.info("🔌 %s 회로 닫힘 (정상화)", self.name)
+
+
+class RequestHedger:
+    """
+    헤지 요청 실행기
+
+    요청이 시작된 뒤 delay_seconds 안에 끝나지 않으면 같은 요청을 한 번 더 보내고 먼저 성공한 응답을 사용
+    (응답 시간 꼬리 지연 완화). 실행 스레드를 기다린 시간은 지연에 넣지 않으므로 부하가 몰려 생긴
+    자체 대기열을 느린 응답으로 오인해 헤지 요청을 보내지 않음. 장애로 모든 요청이 느릴 때 부하를
+    두 배로 만들지 않도록 동시에 진행 중인 헤지 요청 수를 max_in_flight로 제한. 멱등인 조회 요청에만 사용
+    """
+
+    def __init__(self, name: str, delay_seconds: float, max_in_flight: int = 8, max_workers: int = 64):
+        """
+        Args:
+            name: 지표 라벨용 이름
+            delay_seconds: 헤지 요청을 보내기 전 기다리는 시간(초)
+            max_in_flight: 동시에 진행할 수 있는 최대 헤지 요청 수
+            max_workers: 요청 실행 스레드 수
+        """
+        self.name = name
+        self.delay_seconds = delay_seconds
+        self._budget = threading.BoundedSemaphore(max_in_flight)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-hedge")
+
+    def call(self, func: Callable[[], T]) -> T:
+        """
+        요청 실행 (delay_seconds가 지나면 헤지 요청 추가)
+
+        Args:
+            func: 인자 없이 호출하는 요청 함수
+
+        Returns:
+            먼저 성공한 요청의 결과 (둘 다 실패하면 첫 요청의 예외)
+        """
+        started = threading.Event()
+
+        def run_primary() -> T:
+            started.set()
+            return func()
+
+        primary = self._executor.submit(run_primary)
+        started.wait()
+        try:
+            return primary.result(timeout=self.delay_seconds)
+        except FutureTimeoutError:
+            pass
+
+        if not self._budget.acquire(blocking=False):
+            return primary.result()
+
+        try:
+            hedge = self._executor.submit(func)
+        except RuntimeError:
+            self._budget.release()
+            return primary.result()
+        hedge.add_done_callback(lambda _: self._budget.release())
+
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    HEDGED_REQUESTS.inc(name=self.name, result="hedge" if future is hedge else "primary")
+                    return future.result()
+
+        HEDGED_REQUESTS.inc(name=self.name, result="failed")
+        return primary.result()
+
+    def shutdown(self):
+        """실행 스레드 정리 (진행 중인 요청은 기다리지 않음)"""
+        self._executor.shutdown(wait=False)
+
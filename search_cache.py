@@ -0,0 +1,178 @@
+"""
+회사 검색 결과 캐시 모듈
+자동완성처럼 한 글자씩 길어지는 검색어("삼" → "삼성" → "삼성전")는 앞 검색어의 후보 목록을 걸러서 응답하고,
+새 입력으로 대체된 요청은 검색 전에 버림
+"""
+import string
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+from database import Company
+from metrics import record_cache, registry
+
+# 대체된(더 새로운 입력이 이미 도착한) 검색 요청 수
+SEARCH_SUPERSEDED = registry.counter("search_superseded_total", "새 입력으로 대체되어 버린 검색 요청 수")
+
+# SQLite LIKE는 ASCII 문자만 대소문자를 구분하지 않음
+_ASCII_FOLD = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def _fold(text: str) -> str:
+    return text.translate(_ASCII_FOLD)
+
+
+@dataclass
+class SearchEntry:
+    """검색어 하나의 후보 목록 (DB 정렬 순서 그대로)"""
+    companies: List[Company]
+    complete: bool  # 일치하는 회사를 모두 담고 있는지 (후보 수 제한에 걸리지 않음)
+
+
+class SearchResultCache:
+    """
+    검색어별 후보 목록 캐시 (LRU)
+
+    긴 검색어를 포함하는 회사명은 그 접두어도 포함하므로, 접두어의 후보 목록이 완전하면
+    DB 조회 없이 후보 목록을 걸러서 결과를 만듦. DB 정렬(정확히 일치, 이름 길이, 이름순)은
+    거르기만 해도 유지되므로 limit개를 채우면 바로 멈춤
+    """
+
+    def __init__(self, max_entries: int = 2048, max_candidates: int = 500):
+        """
+        캐시 초기화
+
+        Args:
+            max_entries: 최대 보관 검색어 수
+            max_candidates: 검색어별로 보관하는 최대 후보 수 (넘으면 완전하지 않은 목록으로 보관)
+        """
+        self.max_entries = max_entries
+        self.max_candidates = max_candidates
+        self._entries: "OrderedDict[str, SearchEntry]" = OrderedDict()
+        self._data_version = None
+        self._lock = threading.Lock()
+
+    def search(self,
+               query: str,
+               limit: int,
+               fetch: Callable[[str, int], List[Company]],
+               data_version: int = 0) -> List[Company]:
+        """
+        검색 (캐시 → 접두어 후보 거르기 → DB 순서)
+
+        Args:
+            query: 검색어
+            limit: 최대 결과 수 (max_candidates 이하)
+            fetch: DB 검색 함수 (검색어, 최대 결과 수)
+            data_version: 회사 DB 데이터 버전 (바뀌면 캐시 전체 무효화)
+
+        Returns:
+            검색된 회사 목록
+        """
+        entry, source = self._lookup(query, data_version)
+        record_cache("search", entry is not None)
+
+        if entry is None:
+            companies = fetch(query, self.max_candidates + 1)
+            entry = SearchEntry(companies[:self.max_candidates], len(companies) <= self.max_candidates)
+            self._store(query, entry, data_version)
+        elif source != query:
+            entry = self._refine(entry, query, limit)
+
+        return entry.companies[:limit]
+
+    def _lookup(self, query: str, data_version: int) -> Tuple[Optional[SearchEntry], Optional[str]]:
+        """같은 검색어, 없으면 가장 긴 접두어 중 완전한 후보 목록 조회"""
+        with self._lock:
+            if data_version != self._data_version:
+                self._entries.clear()
+                self._data_version = data_version
+
+            entry = self._entries.get(query)
+            if entry is not None:
+                self._entries.move_to_end(query)
+                return entry, query
+
+            # LIKE 와일드카드가 있는 검색어는 문자열 포함 여부로 거를 수 없음
+            if "%" in query or "_" in query:
+                return None, None
+
+            for length in range(len(query) - 1, 0, -1):
+                prefix = query[:length]
+                entry = self._entries.get(prefix)
+                if entry is not None and entry.complete:
+                    self._entries.move_to_end(prefix)
+                    return entry, prefix
+        return None, None
+
+    def _refine(self, entry: SearchEntry, query: str, limit: int) -> SearchEntry:
+        """접두어 후보 목록에서 검색어를 포함하는 회사만 골라냄"""
+        needle = _fold(query)
+        matches = []
+        for company in entry.companies:
+            if needle in _fold(company.corp_name):
+                matches.append(company)
+                if len(matches) >= limit:
+                    # limit개를 채우면 멈춤 (나머지를 모르므로 캐시하지 않음)
+                    return SearchEntry(matches, False)
+
+        refined = SearchEntry(matches, True)
+        self._store(query, refined, self._data_version)
+        return refined
+
+    def _store(self, query: str, entry: SearchEntry, data_version: int):
+        with self._lock:
+            if data_version != self._data_version:
+                return
+            self._entries[query] = entry
+            self._entries.move_to_end(query)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """캐시 전체 삭제"""
+        with self._lock:
+            self._entries.clear()
+
+
+class SearchSequencer:
+    """
+    클라이언트별 최신 검색 순번 추적
+    자동완성은 입력마다 순번(seq)을 올려 보내므로, 더 큰 순번이 이미 도착한 요청은 처리하지 않음
+    """
+
+    def __init__(self, max_clients: int = 10000):
+        """
+        Args:
+            max_clients: 추적할 최대 클라이언트 수 (초과시 가장 오래된 클라이언트부터 제거)
+        """
+        self.max_clients = max_clients
+        self._latest: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def begin(self, client_id: str, seq: int) -> bool:
+        """
+        요청 순번 등록
+
+        Returns:
+            처리해야 하면 True, 이미 더 새로운 요청이 있으면 False
+        """
+        with self._lock:
+            latest = self._latest.get(client_id)
+            if latest is not None and latest > seq:
+                SEARCH_SUPERSEDED.inc()
+                return False
+            self._latest[client_id] = seq
+            self._latest.move_to_end(client_id)
+            while len(self._latest) > self.max_clients:
+                self._latest.popitem(last=False)
+            return True
+
+    def is_current(self, client_id: str, seq: int) -> bool:
+        """검색 후 응답 직전에 다시 확인 (그 사이 새 요청이 오면 False)"""
+        with self._lock:
+            current = self._latest.get(client_id, seq) <= seq
+        if not current:
+            SEARCH_SUPERSEDED.inc()
+        return current
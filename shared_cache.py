@@ -0,0 +1,447 @@
+"""
+공유 캐시 저장소 모듈
+DART 응답 캐시 등이 쓰는 저장소 인터페이스와 구현
+
+- MemoryCacheBackend: 프로세스 메모리 (워커 1개일 때 기본값)
+- SQLiteCacheBackend: 로컬 디스크의 SQLite(WAL) 파일 하나를 모든 워커가 공유. 같은 키를 여러 워커가
+  동시에 계산하지 않도록 행 단위 임대(lease) 잠금으로 프로세스 간 단일 실행(single-flight) 제공
+
+CACHE_BACKEND(memory/sqlite)로 선택하며, 지정하지 않으면 WEB_CONCURRENCY(uvicorn 워커 수)가 2 이상일 때 sqlite
+"""
+import asyncio
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Dict, Iterator, Optional, Tuple, TypeVar
+
+from logging_utils import get_logger
+from metrics import registry
+
+logger = get_logger("shared_cache")
+
+T = TypeVar("T")
+
+# 단일 실행 결과 (result: leader 직접 계산, follower 다른 쪽 결과 사용, timeout 기다리다 직접 계산)
+SINGLE_FLIGHT = registry.counter("cache_single_flight_total", "캐시 단일 실행 결과", labelnames=("result",))
+
+# 공유 캐시 파일 기본 경로
+SHARED_CACHE_PATH = "shared_cache.db"
+
+
+class CacheBackend:
+    """
+    캐시 저장소 인터페이스
+
+    항목은 (네임스페이스, 키)로 구분하고 값(바이트), 저장 시각, 만료 시각을 가짐.
+    임대 잠금은 이름별로 하나의 소유자만 가지며 lease_seconds가 지나면 (소유자가 죽었어도) 풀림
+    """
+
+    def get(self, namespace: str, key: str) -> Optional[Tuple[bytes, float]]:
+        """(값, 저장 시각) 또는 None (없거나 만료된 경우)"""
+        raise NotImplementedError
+
+    def set(self, namespace: str, key: str, value: bytes, expires_at: float, max_entries: int):
+        """값 저장 (네임스페이스 항목 수가 max_entries를 넘으면 오래된 항목부터 삭제)"""
+        raise NotImplementedError
+
+    def delete(self, namespace: str, key: str):
+        raise NotImplementedError
+
+    def clear(self, namespace: str):
+        raise NotImplementedError
+
+    def acquire_lease(self, name: str, lease_seconds: float) -> Optional[str]:
+        """임대 잠금 획득 시도 (대기하지 않음). 성공하면 반납용 토큰, 실패하면 None"""
+        raise NotImplementedError
+
+    def release_lease(self, name: str, token: str):
+        raise NotImplementedError
+
+    def namespace(self, name: str, max_entries: int) -> "CacheNamespace":
+        """네임스페이스 하나에 묶인 캐시 핸들"""
+        return CacheNamespace(self, name, max_entries)
+
+    def single_flight(self,
+                      name: str,
+                      lookup: Callable[[], Optional[T]],
+                      compute: Callable[[], T],
+                      lease_seconds: float = 30.0,
+                      wait_seconds: float = 15.0) -> T:
+        """
+        같은 이름의 계산을 모든 워커에서 한 번만 실행
+
+        잠금을 얻은 쪽은 lookup으로 한 번 더 확인한 뒤 compute를 실행하고(결과 저장은 compute가 함),
+        나머지는 잠금이 풀리거나 lookup에 결과가 생길 때까지 기다림. wait_seconds가 지나면 직접 계산
+
+        Args:
+            name: 잠금 이름 (캐시 키)
+            lookup: 캐시에서 결과를 찾는 함수 (없으면 None)
+            compute: 결과를 계산하고 캐시에 저장하는 함수
+            lease_seconds: 잠금 임대 시간(초), 계산이 이보다 길면 다른 쪽도 계산할 수 있음
+            wait_seconds: 다른 쪽 계산을 기다리는 최대 시간(초)
+
+        Returns:
+            결과
+        """
+        deadline = time.monotonic() + wait_seconds
+        delay = 0.01
+        while True:
+            value, token = self._lead_step(name, lookup, lease_seconds)
+            if value is not None:
+                return value
+            if token is not None:
+                try:
+                    return compute()
+                finally:
+                    self.release_lease(name, token)
+            if time.monotonic() >= deadline:
+                SINGLE_FLIGHT.inc(result="timeout")
+                return compute()
+            time.sleep(delay)
+            delay = min(delay * 2, 0.05)
+
+    def _lead_step(self,
+                   name: str,
+                   lookup: Callable[[], Optional[T]],
+                   lease_seconds: float) -> Tuple[Optional[T], Optional[str]]:
+        """
+        잠금 획득 시도 한 번 (저장소 호출이 있으므로 비동기 버전은 스레드에서 실행)
+
+        Returns:
+            (결과, None): lookup에 결과가 있음 / (None, 토큰): 잠금을 얻어 계산할 차례 / (None, None): 다른 쪽이 계산 중
+        """
+        token = self.acquire_lease(name, lease_seconds)
+        try:
+            value = lookup()
+        except BaseException:
+            if token is not None:
+                self.release_lease(name, token)
+            raise
+        if value is not None:
+            if token is not None:
+                self.release_lease(name, token)
+            SINGLE_FLIGHT.inc(result="follower")
+            return value, None
+        if token is not None:
+            SINGLE_FLIGHT.inc(result="leader")
+        return None, token
+
+    async def single_flight_async(self,
+                                  name: str,
+                                  lookup: Callable[[], Optional[T]],
+                                  compute: Callable[[], Awaitable[T]],
+                                  lease_seconds: float = 60.0,
+                                  wait_seconds: float = 30.0) -> T:
+        """
+        single_flight의 비동기 버전 (compute는 코루틴 함수)
+        저장소 호출(SQLite 쓰기는 busy_timeout 동안 대기할 수 있음)과 lookup은 스레드에서 실행하여 이벤트 루프를 막지 않음
+        """
+        value, token = await self.lead_or_wait_async(name, lookup, lease_seconds, wait_seconds)
+        if value is not None:
+            return value
+        try:
+            return await compute()
+        finally:
+            if token is not None:
+                await self.release_lease_async(name, token)
+
+    async def lead_or_wait_async(self,
+                                 name: str,
+                                 lookup: Callable[[], Optional[T]],
+                                 lease_seconds: float = 60.0,
+                                 wait_seconds: float = 30.0) -> Tuple[Optional[T], Optional[str]]:
+        """
+        single_flight_async의 잠금/대기 단계 (계산 결과를 조금씩 내보내는 스트리밍 계산용)
+
+        Returns:
+            (결과, None): 캐시나 다른 쪽 계산에 결과가 있음
+            (None, 토큰): 이 쪽이 계산할 차례 (계산 후 release_lease_async로 반납)
+            (None, None): wait_seconds 동안 결과가 없어 잠금 없이 직접 계산
+        """
+        deadline = time.monotonic() + wait_seconds
+        delay = 0.01
+        while True:
+            step = asyncio.ensure_future(asyncio.to_thread(self._lead_step, name, lookup, lease_seconds))
+            try:
+                value, token = await asyncio.shield(step)
+            except asyncio.CancelledError:
+                # 기다리던 요청이 취소되어도 스레드에서 얻은 잠금은 반납
+                step.add_done_callback(self._release_abandoned(name))
+                raise
+            if value is not None or token is not None:
+                return value, token
+            if time.monotonic() >= deadline:
+                SINGLE_FLIGHT.inc(result="timeout")
+                return None, None
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.05)
+
+    async def release_lease_async(self, name: str, token: str):
+        """release_lease를 스레드에서 실행 (요청이 취소되어도 반납은 끝까지 실행)"""
+        await asyncio.shield(asyncio.to_thread(self.release_lease, name, token))
+
+    def _release_abandoned(self, name: str) -> Callable[["asyncio.Future"], None]:
+        def release(step: "asyncio.Future"):
+            if step.cancelled() or step.exception() is not None:
+                return
+            token = step.result()[1]
+            if token is not None:
+                asyncio.ensure_future(asyncio.to_thread(self.release_lease, name, token))
+        return release
+
+
+class CacheNamespace:
+    """네임스페이스와 최대 항목 수가 정해진 캐시 핸들"""
+
+    def __init__(self, backend: CacheBackend, name: str, max_entries: int):
+        self.backend = backend
+        self.name = name
+        self.max_entries = max_entries
+
+    def get(self, key: str) -> Optional[Tuple[bytes, float]]:
+        return self.backend.get(self.name, key)
+
+    def set(self, key: str, value: bytes, expires_at: float):
+        self.backend.set(self.name, key, value, expires_at, self.max_entries)
+
+    def delete(self, key: str):
+        self.backend.delete(self.name, key)
+
+    def clear(self):
+        self.backend.clear(self.name)
+
+
+class MemoryCacheBackend(CacheBackend):
+    """프로세스 메모리 저장소 (네임스페이스별 LRU, 임대 잠금은 같은 프로세스 안에서만 유효)"""
+
+    def __init__(self):
+        self._entries: Dict[str, "OrderedDict[str, Tuple[bytes, float, float]]"] = {}
+        self._leases: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, namespace: str, key: str) -> Optional[Tuple[bytes, float]]:
+        with self._lock:
+            entries = self._entries.get(namespace)
+            entry = entries.get(key) if entries is not None else None
+            if entry is None:
+                return None
+            if time.time() >= entry[2]:
+                del entries[key]
+                return None
+            entries.move_to_end(key)
+            return entry[0], entry[1]
+
+    def set(self, namespace: str, key: str, value: bytes, expires_at: float, max_entries: int):
+        with self._lock:
+            entries = self._entries.setdefault(namespace, OrderedDict())
+            entries[key] = (value, time.time(), expires_at)
+            entries.move_to_end(key)
+            while len(entries) > max_entries:
+                entries.popitem(last=False)
+
+    def delete(self, namespace: str, key: str):
+        with self._lock:
+            self._entries.get(namespace, {}).pop(key, None)
+
+    def clear(self, namespace: str):
+        with self._lock:
+            self._entries.pop(namespace, None)
+
+    def acquire_lease(self, name: str, lease_seconds: float) -> Optional[str]:
+        now = time.monotonic()
+        with self._lock:
+            lease = self._leases.get(name)
+            if lease is not None and lease[1] > now:
+                return None
+            token = uuid.uuid4().hex
+            self._leases[name] = (token, now + lease_seconds)
+            return token
+
+    def release_lease(self, name: str, token: str):
+        with self._lock:
+            lease = self._leases.get(name)
+            if lease is not None and lease[0] == token:
+                del self._leases[name]
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    여러 워커 프로세스가 공유하는 SQLite 저장소
+
+    - WAL 모드라 읽기는 쓰기를 기다리지 않고, 쓰기는 busy_timeout 동안 대기
+    - mmap으로 읽으므로 데이터 페이지는 OS 페이지 캐시에서 워커끼리 공유 (워커별 메모리는 연결 풀 크기만큼)
+    - 임대 잠금은 cache_leases 테이블의 행 (만료 시각이 지난 행은 다른 워커가 가져감)
+    - 정리(만료 항목, 최대 항목 수 초과분 삭제)는 네임스페이스별로 prune_every번 저장할 때마다 실행
+    """
+
+    def __init__(self,
+                 db_path: str = SHARED_CACHE_PATH,
+                 pool_size: int = 8,
+                 busy_timeout_ms: int = 5000,
+                 mmap_bytes: int = 256 * 1024 * 1024,
+                 prune_every: int = 200):
+        """
+        Args:
+            db_path: SQLite 파일 경로 (모든 워커가 같은 로컬 디스크 경로 사용)
+            pool_size: 프로세스별 최대 연결 수
+            busy_timeout_ms: 다른 워커가 쓰는 중일 때 기다리는 시간(ms)
+            mmap_bytes: 메모리 매핑 크기
+            prune_every: 정리 주기 (네임스페이스별 저장 횟수)
+        """
+        self.db_path = db_path
+        self.busy_timeout_ms = busy_timeout_ms
+        self.mmap_bytes = mmap_bytes
+        self.prune_every = prune_every
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(pool_size)
+        self._set_counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        with self._connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    namespace TEXT NOT NULL,
+                    cache_key TEXT NOT NULL,
+                    value BLOB NOT NULL,
+                    stored_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, cache_key)
+                )
+            ''')
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_cache_entries_stored_at
+                ON cache_entries(namespace, stored_at)
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS cache_leases (
+                    name TEXT PRIMARY KEY,
+                    token TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                ) WITHOUT ROWID
+            ''')
+
+    def _connect(self) -> sqlite3.Connection:
+        # 자동 커밋 모드: 문장 하나가 곧 트랜잭션이라 쓰기 잠금을 짧게 잡음
+        conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout_ms / 1000,
+                               isolation_level=None, check_same_thread=False)
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_bytes)}")
+        conn.execute("PRAGMA cache_size=-1024")
+        return conn
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """연결 풀에서 연결 하나를 빌림 (풀이 다 쓰이면 반납될 때까지 대기)"""
+        self._slots.acquire()
+        try:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+            try:
+                yield conn
+            finally:
+                self._pool.put(conn)
+        finally:
+            self._slots.release()
+
+    def get(self, namespace: str, key: str) -> Optional[Tuple[bytes, float]]:
+        with self._connection() as conn:
+            row = conn.execute('''
+                SELECT value, stored_at FROM cache_entries
+                WHERE namespace = ? AND cache_key = ? AND expires_at > ?
+            ''', (namespace, key, time.time())).fetchone()
+        return (bytes(row[0]), row[1]) if row else None
+
+    def set(self, namespace: str, key: str, value: bytes, expires_at: float, max_entries: int):
+        with self._connection() as conn:
+            conn.execute('''
+                INSERT OR REPLACE INTO cache_entries (namespace, cache_key, value, stored_at, expires_at)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (namespace, key, value, time.time(), expires_at))
+
+        with self._lock:
+            count = self._set_counts.get(namespace, 0) + 1
+            self._set_counts[namespace] = count
+        if count % self.prune_every == 0:
+            self.prune(namespace, max_entries)
+
+    def prune(self, namespace: str, max_entries: int):
+        """만료된 항목과 최대 항목 수를 넘는 오래된 항목 삭제"""
+        with self._connection() as conn:
+            conn.execute("DELETE FROM cache_entries WHERE namespace = ? AND expires_at <= ?",
+                         (namespace, time.time()))
+            conn.execute('''
+                DELETE FROM cache_entries
+                WHERE namespace = ? AND cache_key IN (
+                    SELECT cache_key FROM cache_entries
+                    WHERE namespace = ?
+                    ORDER BY stored_at DESC
+                    LIMIT -1 OFFSET ?
+                )
+            ''', (namespace, namespace, max_entries))
+            conn.execute("DELETE FROM cache_leases WHERE expires_at <= ?", (time.time(),))
+
+    def delete(self, namespace: str, key: str):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM cache_entries WHERE namespace = ? AND cache_key = ?", (namespace, key))
+
+    def clear(self, namespace: str):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (namespace,))
+
+    def acquire_lease(self, name: str, lease_seconds: float) -> Optional[str]:
+        # 프로세스마다 시계(monotonic)가 다르므로 임대 만료는 벽시계 기준
+        now = time.time()
+        token = uuid.uuid4().hex
+        with self._connection() as conn:
+            cursor = conn.execute('''
+                INSERT INTO cache_leases (name, token, expires_at) VALUES (?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET token = excluded.token, expires_at = excluded.expires_at
+                WHERE cache_leases.expires_at <= ?
+            ''', (name, token, now + lease_seconds, now))
+            acquired = cursor.rowcount == 1
+        return token if acquired else None
+
+    def release_lease(self, name: str, token: str):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM cache_leases WHERE name = ? AND token = ?", (name, token))
+
+
+_default_backend: Optional[CacheBackend] = None
+_default_lock = threading.Lock()
+
+
+def open_cache_backend() -> CacheBackend:
+    """
+    환경변수로 저장소 생성
+    CACHE_BACKEND(memory/sqlite, 기본: WEB_CONCURRENCY가 2 이상이면 sqlite), CACHE_DB_PATH(기본 shared_cache.db)
+    """
+    kind = os.getenv("CACHE_BACKEND")
+    if not kind:
+        kind = "sqlite" if int(os.getenv("WEB_CONCURRENCY", "1") or 1) > 1 else "memory"
+
+    if kind == "sqlite":
+        path = os.getenv("CACHE_DB_PATH", SHARED_CACHE_PATH)
+        logger.info("🗄️ 워커 공유 캐시 사용: %s", path)
+        return SQLiteCacheBackend(path)
+    if kind != "memory":
+        logger.warning("⚠️ 알 수 없는 CACHE_BACKEND=%s, 메모리 캐시를 사용합니다", kind)
+    return MemoryCacheBackend()
+
+
+def default_cache_backend() -> CacheBackend:
+    """프로세스 전체에서 함께 쓰는 저장소 (처음 호출할 때 생성)"""
+    global _default_backend
+    if _default_backend is None:
+        with _default_lock:
+            if _default_backend is None:
+                _default_backend = open_cache_backend()
+    return _default_backend
@@ -0,0 +1,885 @@
+// 페이지 로드시 초기 데이터 로드
+document.addEventListener('DOMContentLoaded', function() {
+    loadFinancialData();
+});
+
+// 재무데이터 로드 (회사 페이지 번들을 스트리밍으로 받아 준비된 섹션부터 표시)
+async function loadFinancialData() {
+    const startYear = document.getElementById('startYear').value;
+    const endYear = document.getElementById('endYear').value;
+    const baseYear = document.getElementById('baseYear').value;
+    const reportType = document.getElementById('reportType').value;
+    const freq = document.getElementById('chartFreq').value;
+    const chartTypes = ['revenue', 'profit', 'assets'];
+
+    hideError();
+    ['metrics', ...chartTypes, 'pie', 'balanceBox'].forEach(type => showLoading(type));
+    showGlobalLoadingMessage('재무데이터를 불러오는 중...');
+
+    // 회사 섹션이 도착하면 차트 템플릿을 DART 조회와 동시에 준비
+    let templatesRequest = null;
+    const received = new Set();
+    const rendering = [];
+
+    const handlers = {
+        company: data => {
+            templatesRequest = getChartTemplates(data.chart_template_version);
+            templatesRequest.catch(() => {});  // 오류는 차트 섹션에서 표시
+        },
+        metrics: data => {
+            hideLoading('metrics');
+            if (data.error) {
+                showError('재무데이터를 불러오는데 실패했습니다: ' + data.error);
+                return;
+            }
+            displayMetrics(data.metrics);
+        },
+        charts: async data => {
+            if (data.error) {
+                showChartsFailure(freq === 'A' ? [...chartTypes, 'pie'] : ['pie'], data.error);
+                return;
+            }
+            renderChartBatch(await templatesRequest, data, freq === 'A' ? chartTypes : []);
+        },
+        series: async data => {
+            const seriesData = data.error ? Promise.reject(new Error(data.error)) : Promise.resolve(data);
+            await renderSeriesCharts(await templatesRequest, chartTypes, seriesData, freq);
+        },
+        balance_box: async data => {
+            if (data.error) {
+                showBalanceSheetBoxFailure(data.error);
+                return;
+            }
+            renderBalanceSheetBox(await templatesRequest, data);
+        }
+    };
+
+    const onSection = (section, data) => {
+        received.add(section);
+        showStaleNotice(data.stale);
+        const handler = handlers[section];
+        if (handler) {
+            rendering.push(Promise.resolve()
+                .then(() => handler(data))
+                .catch(error => console.error(`❌ ${section} 섹션 표시 오류:`, error)));
+        }
+    };
+
+    try {
+        const params = `start_year=${startYear}&end_year=${endYear}&base_year=${baseYear}&report_type=${reportType}&freq=${freq}`;
+        const inlineSections = takeInlineBundle(params);
+        if (inlineSections) {
+            inlineSections.forEach(([section, data]) => onSection(section, data));
+        } else {
+            const response = await fetch(`/api/company_bundle/${corpCode}?${params}`, {
+                headers: { Accept: 'application/x-ndjson' }
+            });
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+            }
+            await readBundleStream(response, onSection);
+        }
+    } catch (error) {
+        console.error('❌ 번들 로드 실패, 개별 API로 재시도:', error);
+    }
+
+    await Promise.all(rendering);
+    hideGlobalLoadingMessage();
+
+    // 번들에서 받지 못한 섹션은 개별 API로 로드
+    if (!received.has('metrics')) {
+        loadMetrics();
+    }
+    if (!received.has('charts') || (freq !== 'A' && !received.has('series'))) {
+        loadCharts();
+    }
+    if (!received.has('balance_box')) {
+        loadBalanceSheetBox();
+    }
+}
+
+// 정적 생성 페이지에 함께 렌더링된 번들 섹션 (조회 조건이 같을 때 처음 한 번만 사용)
+function takeInlineBundle(params) {
+    const element = document.getElementById('companyBundle');
+    if (!element) return null;
+    element.remove();
+
+    const bundle = JSON.parse(element.textContent);
+    return bundle.params === params ? bundle.sections : null;
+}
+
+// NDJSON 스트림을 한 줄(섹션)씩 읽어 콜백 호출
+async function readBundleStream(response, onSection) {
+    const handleLine = line => {
+        if (line.trim()) {
+            const message = JSON.parse(line);
+            onSection(message.section, message.data);
+        }
+    };
+
+    // 스트림 읽기를 지원하지 않는 브라우저는 전체 응답을 받은 뒤 처리
+    if (!response.body || !window.TextDecoder) {
+        (await response.text()).split('\n').forEach(handleLine);
+        return;
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        let newline;
+        while ((newline = buffer.indexOf('\n')) >= 0) {
+            handleLine(buffer.slice(0, newline));
+            buffer = buffer.slice(newline + 1);
+        }
+    }
+    handleLine(buffer + decoder.decode());
+}
+
+// 주요 지표 로드 (개별 API)
+async function loadMetrics() {
+    const baseYear = document.getElementById('baseYear').value;
+    const reportType = document.getElementById('reportType').value;
+
+    try {
+        showLoading('metrics');
+        const metricsResponse = await fetch(`/api/financial/${corpCode}?year=${baseYear}&report_type=${reportType}`);
+        const metricsData = await metricsResponse.json();
+
+        if (metricsData.status === 'success') {
+            displayMetrics(metricsData.metrics);
+            showStaleNotice(metricsData.stale);
+        } else {
+            throw new Error('메트릭 데이터 로드 실패');
+        }
+        hideLoading('metrics');
+
+    } catch (error) {
+        console.error('재무데이터 로드 오류:', error);
+        showError('재무데이터를 불러오는데 실패했습니다: ' + error.message);
+        hideLoading('metrics');
+    }
+}
+
+// 차트들 로드 (배치 API)
+async function loadCharts() {
+    const startYear = document.getElementById('startYear').value;
+    const endYear = document.getElementById('endYear').value;
+    const baseYear = document.getElementById('baseYear').value;
+    const freq = document.getElementById('chartFreq').value;
+
+    // 모든 차트에 로딩 표시
+    const chartTypes = ['revenue', 'profit', 'assets'];
+    chartTypes.forEach(chartType => showLoading(chartType));
+    showLoading('pie');
+
+    try {
+        console.log('📊 배치 차트 로딩 시작...');
+
+        // 전체 로딩 상태 표시
+        showGlobalLoadingMessage('모든 차트 데이터를 불러오는 중...');
+
+        // 분기/TTM이면 라인 차트용 시계열을 배치 API와 동시에 요청
+        const seriesRequest = freq === 'A' ? null : fetchFinancialSeries(startYear, endYear, freq);
+        seriesRequest?.catch(() => {});  // 오류는 renderSeriesCharts에서 표시
+
+        // 배치 API 호출 (compact: 숫자 시리즈만 받고 차트는 템플릿으로 조립)
+        const response = await fetch(
+            `/api/financial_charts_batch/${corpCode}?start_year=${startYear}&end_year=${endYear}&base_year=${baseYear}&format=compact`
+        );
+
+        if (!response.ok) {
+            throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+        }
+
+        const data = await response.json();
+        console.log('📊 배치 데이터 수신:', data);
+        showStaleNotice(data.stale);
+
+        const templates = await getChartTemplates(data.version);
+
+        if (seriesRequest) {
+            await renderSeriesCharts(templates, chartTypes, seriesRequest, freq);
+        }
+        renderChartBatch(templates, data, seriesRequest ? [] : chartTypes);
+
+        console.log('✅ 모든 차트 로딩 완료!');
+        hideGlobalLoadingMessage();
+
+    } catch (error) {
+        console.error('❌ 배치 차트 로드 전체 실패:', error);
+        showChartsFailure([...chartTypes, 'pie'], error.message);
+        hideGlobalLoadingMessage();
+    }
+}
+
+// 배치 응답으로 라인 차트(lineChartTypes)와 파이 차트 렌더링
+function renderChartBatch(templates, data, lineChartTypes) {
+    // 라인 차트들 처리
+    for (const chartType of lineChartTypes) {
+        try {
+            const chartData = data.line_charts[chartType];
+
+            if (chartData && chartData.template) {
+                const chart = buildLineChart(templates, chartType, chartData.years, chartData.values);
+                Plotly.newPlot(`${chartType}Chart`, chart.data, chart.layout, {
+                    responsive: true,
+                    displayModeBar: false
+                });
+                console.log(`✅ ${chartType} 차트 렌더링 완료`);
+            } else {
+                // 차트가 없는 경우 메시지 표시
+                const chartContainer = document.getElementById(`${chartType}Chart`);
+                chartContainer.innerHTML = `
+                    <div class="alert alert-warning text-center">
+                        <i class="fas fa-exclamation-triangle"></i>
+                        ${chartData?.message || `${chartType} 데이터를 찾을 수 없습니다.`}
+                    </div>
+                `;
+                console.log(`⚠️ ${chartType} 차트 데이터 없음`);
+            }
+
+            hideLoading(chartType);
+        } catch (error) {
+            console.error(`❌ ${chartType} 차트 렌더링 오류:`, error);
+            hideLoading(chartType);
+
+            // 에러 메시지 표시
+            const chartContainer = document.getElementById(`${chartType}Chart`);
+            chartContainer.innerHTML = `
+                <div class="alert alert-danger text-center">
+                    <i class="fas fa-times-circle"></i>
+                    ${chartType} 차트 로드 실패
+                </div>
+            `;
+        }
+    }
+
+    // 파이 차트 처리
+    try {
+        const pieData = data.pie_chart;
+
+        if (pieData && pieData.template) {
+            const chart = buildPieChart(templates, pieData.values);
+            Plotly.newPlot('assetsPieChart', chart.data, chart.layout, {
+                responsive: true,
+                displayModeBar: false
+            });
+            console.log('✅ 파이 차트 렌더링 완료');
+        } else {
+            // 파이 차트가 없는 경우 메시지 표시
+            const pieContainer = document.getElementById('assetsPieChart');
+            pieContainer.innerHTML = `
+                <div class="alert alert-warning text-center">
+                    <i class="fas fa-exclamation-triangle"></i>
+                    ${pieData?.message || '자산 구성 데이터를 찾을 수 없습니다.'}
+                </div>
+            `;
+            console.log('⚠️ 파이 차트 데이터 없음');
+        }
+
+        hideLoading('pie');
+    } catch (error) {
+        console.error('❌ 파이 차트 렌더링 오류:', error);
+        hideLoading('pie');
+
+        // 에러 메시지 표시
+        const pieContainer = document.getElementById('assetsPieChart');
+        pieContainer.innerHTML = `
+            <div class="alert alert-danger text-center">
+                <i class="fas fa-times-circle"></i>
+                자산 구성 차트 로드 실패
+            </div>
+        `;
+    }
+}
+
+// 차트 로드 실패 메시지 표시
+function showChartsFailure(types, message) {
+    types.forEach(type => {
+        hideLoading(type);
+        const containerId = type === 'pie' ? 'assetsPieChart' : `${type}Chart`;
+        const container = document.getElementById(containerId);
+        container.innerHTML = `
+            <div class="alert alert-danger text-center">
+                <i class="fas fa-times-circle"></i>
+                차트 로드 실패: ${message}
+            </div>
+        `;
+    });
+}
+
+
+// 분기/TTM 시계열 (라인 차트 종류별 지표)
+const SERIES_METRICS = { revenue: 'revenue', profit: 'net_income', assets: 'total_assets' };
+
+async function fetchFinancialSeries(startYear, endYear, freq) {
+    const response = await fetch(
+        `/api/financial_series/${corpCode}?freq=${freq}&start_year=${startYear}&end_year=${endYear}`
+    );
+    if (!response.ok) {
+        throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+    }
+    return response.json();
+}
+
+async function renderSeriesCharts(templates, chartTypes, seriesRequest, freq) {
+    let data = null;
+    let failure = null;
+    try {
+        data = await seriesRequest;
+        showStaleNotice(data.stale);
+    } catch (error) {
+        console.error('❌ 분기 시계열 로드 실패:', error);
+        failure = error;
+    }
+
+    for (const chartType of chartTypes) {
+        hideLoading(chartType);
+        const chartContainer = document.getElementById(`${chartType}Chart`);
+        const values = data ? data.series[SERIES_METRICS[chartType]] : [];
+
+        if (failure || !values.some(value => value !== null)) {
+            chartContainer.innerHTML = `
+                <div class="alert ${failure ? 'alert-danger' : 'alert-warning'} text-center">
+                    <i class="fas ${failure ? 'fa-times-circle' : 'fa-exclamation-triangle'}"></i>
+                    ${failure ? `차트 로드 실패: ${failure.message}` : '해당 기간의 분기 재무데이터를 찾을 수 없습니다.'}
+                </div>
+            `;
+            continue;
+        }
+
+        const chart = buildLineChart(templates, chartType, data.periods, values, freq);
+        Plotly.newPlot(`${chartType}Chart`, chart.data, chart.layout, {
+            responsive: true,
+            displayModeBar: false
+        });
+    }
+}
+
+// 차트 레이아웃 템플릿 (버전별로 localStorage에 캐시)
+let chartTemplates = null;
+
+async function getChartTemplates(version) {
+    if (chartTemplates && chartTemplates.version === version) {
+        return chartTemplates;
+    }
+
+    const storageKey = `chartTemplates:v${version}`;
+    try {
+        const stored = localStorage.getItem(storageKey);
+        if (stored) {
+            chartTemplates = JSON.parse(stored);
+            return chartTemplates;
+        }
+    } catch (error) {
+        console.warn('차트 템플릿 캐시 읽기 실패:', error);
+    }
+
+    const response = await fetch(`/api/chart_templates?v=${version}`);
+    if (!response.ok) {
+        throw new Error(`차트 템플릿 로드 실패: HTTP ${response.status}`);
+    }
+    chartTemplates = await response.json();
+
+    try {
+        localStorage.setItem(storageKey, JSON.stringify(chartTemplates));
+    } catch (error) {
+        console.warn('차트 템플릿 캐시 저장 실패:', error);
+    }
+    return chartTemplates;
+}
+
+// 템플릿 레이아웃 복사 (Plotly가 레이아웃 객체를 수정하므로 차트마다 새로 복사)
+function cloneLayout(layout) {
+    return JSON.parse(JSON.stringify(layout));
+}
+
+// 서버의 '{:,.0f}' 포맷과 동일한 금액 표시
+function formatAmount(value) {
+    return Math.round(value).toLocaleString('en-US');
+}
+
+// 라인 차트 조립 (chart_specs.financial_chart_spec과 동일한 구조, freq가 Q/TTM이면 분기 축)
+function buildLineChart(templates, chartType, years, values, freq = 'A') {
+    const template = templates.templates.line;
+    const config = template.configs[chartType] || template.configs.revenue;
+    const layout = cloneLayout(template.layout);
+    layout.title.text = config.title;
+    layout.yaxis.title.text = `${config.title} (${config.unit})`;
+    if (freq !== 'A') {
+        // 자산은 기간 합계가 아닌 분기 말 잔액
+        layout.title.text += freq === 'TTM' && chartType !== 'assets' ? ' (최근 4분기 합계)' : ' (분기)';
+        layout.xaxis.title.text = '분기';
+        layout.xaxis.type = 'category';
+    }
+
+    return {
+        data: [{
+            hovertemplate: `<b>%{x}${freq === 'A' ? '년' : ''}</b><br>${config.title}: %{y:,.0f}${config.unit}<extra></extra>`,
+            line: { color: config.color, width: 3 },
+            marker: { color: config.color, size: 8 },
+            mode: 'lines+markers',
+            name: config.title,
+            x: years,
+            y: values,
+            type: 'scatter'
+        }],
+        layout: layout
+    };
+}
+
+// 파이 차트 조립 (chart_specs.financial_pie_chart_spec과 동일한 구조)
+function buildPieChart(templates, values) {
+    const template = templates.templates.pie;
+    const trace = cloneLayout(template.trace);
+    trace.values = values;
+    return { data: [trace], layout: cloneLayout(template.layout) };
+}
+
+// 재무상태표 박스 차트 조립 (chart_specs.balance_sheet_box_chart_spec과 동일한 구조)
+function buildBalanceSheetBoxChart(templates, metrics, year) {
+    const template = templates.templates.balance_box;
+    const toBillions = key => (metrics[key] || 0) / 100000000;
+
+    const totalAssets = toBillions('total_assets');
+    const totalLiabilities = toBillions('total_liabilities');
+    const totalEquity = toBillions('total_equity');
+    const currentAssets = toBillions('current_assets');
+    const nonCurrentAssets = toBillions('non_current_assets');
+    const currentLiabilities = toBillions('current_liabilities');
+    const nonCurrentLiabilities = toBillions('non_current_liabilities');
+
+    const pct = amount => `${(totalAssets > 0 ? amount / totalAssets * 100 : 0).toFixed(1)}%`;
+
+    const bar = (category, label, amount, pctText, base) => {
+        const style = template.segments[label];
+        const trace = {
+            hovertemplate: `${label}<br>%{y:,.0f}억원 (${pctText})<extra></extra>`,
+            marker: { color: style.color },
+            name: `${label} (${pctText})`,
+            showlegend: true,
+            text: [`${label}<br>${formatAmount(amount)}억원<br>(${pctText})`],
+            textfont: { color: style.text_color, size: style.text_size },
+            textposition: 'inside',
+            width: 0.8,
+            x: [category],
+            y: [amount],
+            type: 'bar'
+        };
+        if (base !== undefined) {
+            trace.base = [base];
+        }
+        return trace;
+    };
+
+    const data = [];
+    let liabilityBase = 0;
+
+    // 좌측: 자산
+    if (currentAssets > 0 && nonCurrentAssets > 0) {
+        data.push(bar('자산', '유동자산', currentAssets, pct(currentAssets)));
+        data.push(bar('자산', '비유동자산', nonCurrentAssets, pct(nonCurrentAssets), currentAssets));
+    } else {
+        data.push(bar('자산', '총자산', totalAssets, '100%'));
+    }
+
+    // 우측: 부채 + 자본
+    if (currentLiabilities > 0 && nonCurrentLiabilities > 0) {
+        data.push(bar('부채 + 자본', '유동부채', currentLiabilities, pct(currentLiabilities)));
+        data.push(bar('부채 + 자본', '비유동부채', nonCurrentLiabilities, pct(nonCurrentLiabilities), currentLiabilities));
+        liabilityBase = currentLiabilities + nonCurrentLiabilities;
+    } else if (totalLiabilities > 0) {
+        data.push(bar('부채 + 자본', '총부채', totalLiabilities, pct(totalLiabilities)));
+        liabilityBase = totalLiabilities;
+    }
+
+    if (totalEquity > 0) {
+        data.push(bar('부채 + 자본', '자본', totalEquity, pct(totalEquity), liabilityBase));
+    }
+
+    const layout = cloneLayout(template.layout);
+    layout.title.text = `${year}년 재무상태표 구조 (자산 = 부채 + 자본)`;
+    layout.annotations[0].text =
+        `<b>${formatAmount(totalAssets)}억원 = ${formatAmount(totalLiabilities)}억원 + ${formatAmount(totalEquity)}억원</b>`;
+
+    return { data: data, layout: layout };
+}
+
+// 메트릭 표시
+function displayMetrics(metrics) {
+    const container = document.getElementById('metricsContainer');
+
+    const metricItems = [
+        { key: 'revenue', label: '매출액', unit: '조원', icon: 'fa-chart-line', color: 'primary' },
+        { key: 'operating_profit', label: '영업이익', unit: '조원', icon: 'fa-coins', color: 'success' },
+        { key: 'net_income', label: '순이익', unit: '조원', icon: 'fa-money-bill-wave', color: 'info' },
+        { key: 'total_assets', label: '총자산', unit: '조원', icon: 'fa-building', color: 'warning' },
+        { key: 'operating_margin', label: '영업이익률', unit: '%', icon: 'fa-percentage', color: 'secondary' },
+        { key: 'net_margin', label: '순이익률', unit: '%', icon: 'fa-percent', color: 'dark' }
+    ];
+
+    const html = metricItems.map(item => {
+        const value = metrics[item.key] || 0;
+        const formattedValue = item.unit === '%' ? 
+            value.toFixed(1) : 
+            (value / 10000000000000).toLocaleString(undefined, { maximumFractionDigits: 1 });
+
+        return `
+            <div class="col-lg-2 col-md-4 col-sm-6">
+                <div class="metric-card">
+                    <div class="text-${item.color} mb-2">
+                        <i class="fas ${item.icon} fa-2x"></i>
+                    </div>
+                    <div class="metric-value">${formattedValue}</div>
+                    <div class="metric-label">${item.label} (${item.unit})</div>
+                </div>
+            </div>
+        `;
+    }).join('');
+
+    container.innerHTML = html;
+}
+
+// 로딩 표시
+function showLoading(type) {
+    const loadingElement = document.getElementById(`${type}Loading`);
+    if (loadingElement) {
+        loadingElement.style.display = 'flex';
+    }
+}
+
+// 로딩 숨기기
+function hideLoading(type) {
+    const loadingElement = document.getElementById(`${type}Loading`);
+    if (loadingElement) {
+        loadingElement.style.display = 'none';
+    }
+}
+
+// 에러 표시
+function showError(message) {
+    const errorElement = document.getElementById('errorMessage');
+    const errorText = document.getElementById('errorText');
+    errorText.textContent = message;
+    errorElement.style.display = 'block';
+
+    // 5초 후 자동 숨김
+    setTimeout(() => {
+        hideError();
+    }, 5000);
+}
+
+// 에러 숨기기
+function hideError() {
+    document.getElementById('errorMessage').style.display = 'none';
+}
+
+// 지난 데이터 안내 (한 번 표시하면 페이지를 새로 불러올 때까지 유지)
+function showStaleNotice(stale) {
+    if (stale) {
+        document.getElementById('staleNotice').style.display = 'block';
+    }
+}
+
+// 전역 로딩 메시지 표시
+function showGlobalLoadingMessage(message) {
+    // 기존 전역 메시지가 있으면 제거
+    const existingMessage = document.getElementById('globalLoadingMessage');
+    if (existingMessage) {
+        existingMessage.remove();
+    }
+
+    // 새 메시지 생성
+    const messageDiv = document.createElement('div');
+    messageDiv.id = 'globalLoadingMessage';
+    messageDiv.className = 'alert alert-info text-center mb-4';
+    messageDiv.innerHTML = `
+        <div class="d-flex align-items-center justify-content-center">
+            <div class="spinner-border spinner-border-sm me-2" role="status">
+                <span class="visually-hidden">Loading...</span>
+            </div>
+            <span>${message}</span>
+        </div>
+    `;
+
+    // 차트 섹션 앞에 삽입
+    const chartsSection = document.querySelector('.charts-section');
+    if (chartsSection) {
+        chartsSection.parentNode.insertBefore(messageDiv, chartsSection);
+    }
+}
+
+// 전역 로딩 메시지 숨기기
+function hideGlobalLoadingMessage() {
+    const messageDiv = document.getElementById('globalLoadingMessage');
+    if (messageDiv) {
+        messageDiv.remove();
+    }
+}
+
+// 재무상태표 박스 차트 로드 (개별 API)
+async function loadBalanceSheetBox() {
+    const baseYear = document.getElementById('baseYear').value;
+
+    try {
+        showLoading('balanceBox');
+        console.log('📊 재무상태표 박스 차트 로딩 시작...');
+
+        const response = await fetch(`/api/balance_sheet_box/${corpCode}?year=${baseYear}&format=compact`);
+
+        if (!response.ok) {
+            throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+        }
+
+        const data = await response.json();
+        console.log('📊 재무상태표 박스 데이터 수신:', data);
+
+        renderBalanceSheetBox(data.template ? await getChartTemplates(data.version) : null, data);
+
+    } catch (error) {
+        console.error('❌ 재무상태표 박스 차트 로드 오류:', error);
+        showBalanceSheetBoxFailure(error.message);
+    }
+}
+
+// 재무상태표 박스 차트 렌더링
+function renderBalanceSheetBox(templates, data) {
+    if (data.template) {
+        const chart = buildBalanceSheetBoxChart(templates, data.metrics, data.year);
+        Plotly.newPlot('balanceSheetBoxChart', chart.data, chart.layout, {
+            responsive: true,
+            displayModeBar: false
+        });
+        console.log('✅ 재무상태표 박스 차트 렌더링 완료');
+    } else {
+        // 차트가 없는 경우 메시지 표시
+        const chartContainer = document.getElementById('balanceSheetBoxChart');
+        chartContainer.innerHTML = `
+            <div class="alert alert-warning text-center">
+                <i class="fas fa-exclamation-triangle"></i>
+                재무상태표 데이터를 찾을 수 없습니다.
+            </div>
+        `;
+        console.log('⚠️ 재무상태표 박스 차트 데이터 없음');
+    }
+
+    hideLoading('balanceBox');
+}
+
+// 재무상태표 박스 차트 로드 실패 메시지 표시
+function showBalanceSheetBoxFailure(message) {
+    hideLoading('balanceBox');
+
+    const chartContainer = document.getElementById('balanceSheetBoxChart');
+    chartContainer.innerHTML = `
+        <div class="alert alert-danger text-center">
+            <i class="fas fa-times-circle"></i>
+            재무상태표 박스 차트 로드 실패: ${message}
+        </div>
+    `;
+}
+
+
+// AI 분석 로드 (가능하면 스트리밍으로 섹션별 점진 표시)
+function loadAIAnalysis() {
+    if (window.EventSource) {
+        loadAIAnalysisStream();
+    } else {
+        loadAIAnalysisOnce();
+    }
+}
+
+// AI 분석 스트리밍 로드 (Server-Sent Events)
+function loadAIAnalysisStream() {
+    const baseYear = document.getElementById('baseYear').value;
+    const source = new EventSource(`/api/ai_analysis_stream/${corpCode}?year=${baseYear}`);
+    let started = false;
+
+    showLoading('ai');
+
+    // 첫 이벤트에서 빈 분석 카드를 그리고 이후 내용은 섹션별로 채움
+    const ensureStarted = () => {
+        if (started) return;
+        started = true;
+        hideLoading('ai');
+        displayAIAnalysis({ analysis: { summary: '', strengths: '', concerns: '', recommendation: '' } });
+        document.getElementById('aiAnalysisStatus').textContent = 'AI가 분석을 작성하고 있습니다...';
+    };
+
+    source.addEventListener('section', event => {
+        ensureStarted();
+    });
+
+    source.addEventListener('delta', event => {
+        ensureStarted();
+        const data = JSON.parse(event.data);
+        const element = document.getElementById(`aiSection-${data.section}`);
+        if (element) {
+            element.textContent += (element.textContent ? ' ' : '') + data.text;
+        }
+    });
+
+    source.addEventListener('done', event => {
+        source.close();
+        const data = JSON.parse(event.data);
+        displayAIAnalysis({ analysis: data.analysis });
+        hideLoading('ai');
+    });
+
+    source.addEventListener('error', event => {
+        source.close();
+        hideLoading('ai');
+
+        // 서버가 보낸 오류 이벤트
+        if (event.data) {
+            showError(JSON.parse(event.data).error);
+            return;
+        }
+        // 연결 자체가 실패했고 아직 아무것도 받지 못했으면 일반 요청으로 재시도
+        if (!started) {
+            loadAIAnalysisOnce();
+        } else {
+            showError('AI 분석 스트리밍 연결이 끊어졌습니다.');
+        }
+    });
+}
+
+// AI 분석 일괄 로드
+async function loadAIAnalysisOnce() {
+    const baseYear = document.getElementById('baseYear').value;
+
+    try {
+        showLoading('ai');
+
+        const response = await fetch(`/api/ai_analysis/${corpCode}?year=${baseYear}`);
+        const data = await response.json();
+
+        if (data.status === 'success') {
+            displayAIAnalysis(data);
+        } else {
+            throw new Error(data.detail || 'AI 분석 실패');
+        }
+
+        hideLoading('ai');
+    } catch (error) {
+        console.error('AI 분석 오류:', error);
+        showError('AI 분석 중 오류가 발생했습니다: ' + error.message);
+        hideLoading('ai');
+    }
+}
+
+// AI 분석 결과 표시
+function displayAIAnalysis(data) {
+    const container = document.getElementById('aiAnalysisContent');
+
+    const analysis = data.analysis;
+    const metrics = data.metrics;
+
+    const html = `
+        <!-- AI 분석 요약 -->
+        <div class="row mb-4">
+            <div class="col-12">
+                <div class="alert alert-primary alert-custom">
+                    <div class="d-flex align-items-center">
+                        <div class="me-3">
+                            <i class="fas fa-robot fa-2x text-primary"></i>
+                        </div>
+                        <div>
+                            <h5 class="alert-heading mb-2">
+                                <i class="fas fa-lightbulb"></i> AI 재무분석 요약
+                            </h5>
+                            <p class="mb-0 fs-6" id="aiSection-summary">${analysis.summary}</p>
+                        </div>
+                    </div>
+                </div>
+            </div>
+        </div>
+
+        <!-- 3개 컬럼 분석 카드 -->
+        <div class="row mb-4">
+            <div class="col-lg-4 mb-3">
+                <div class="card h-100 border-success shadow-sm">
+                    <div class="card-header bg-success text-white">
+                        <h6 class="mb-0">
+                            <i class="fas fa-thumbs-up me-2"></i>재무적 강점
+                        </h6>
+                    </div>
+                    <div class="card-body">
+                        <div class="text-success mb-2">
+                            <i class="fas fa-check-circle fa-lg"></i>
+                        </div>
+                        <p class="card-text" id="aiSection-strengths">${analysis.strengths}</p>
+                    </div>
+                </div>
+            </div>
+
+            <div class="col-lg-4 mb-3">
+                <div class="card h-100 border-warning shadow-sm">
+                    <div class="card-header bg-warning text-dark">
+                        <h6 class="mb-0">
+                            <i class="fas fa-exclamation-triangle me-2"></i>주의사항
+                        </h6>
+                    </div>
+                    <div class="card-body">
+                        <div class="text-warning mb-2">
+                            <i class="fas fa-shield-alt fa-lg"></i>
+                        </div>
+                        <p class="card-text" id="aiSection-concerns">${analysis.concerns}</p>
+                    </div>
+                </div>
+            </div>
+
+            <div class="col-lg-4 mb-3">
+                <div class="card h-100 border-primary shadow-sm">
+                    <div class="card-header bg-primary text-white">
+                        <h6 class="mb-0">
+                            <i class="fas fa-chart-line me-2"></i>투자 의견
+                        </h6>
+                    </div>
+                    <div class="card-body">
+                        <div class="text-primary mb-2">
+                            <i class="fas fa-bullseye fa-lg"></i>
+                        </div>
+                        <p class="card-text" id="aiSection-recommendation">${analysis.recommendation}</p>
+                    </div>
+                </div>
+            </div>
+        </div>
+
+
+
+        <!-- 분석 완료 시간 표시 -->
+        <div class="row mt-3">
+            <div class="col-12 text-end">
+                <small class="text-muted">
+                    <i class="fas fa-clock me-1"></i>
+                    <span id="aiAnalysisStatus">분석 완료: ${new Date().toLocaleString('ko-KR')}</span>
+                </small>
+            </div>
+        </div>
+
+        <div class="row mt-3">
+            <div class="col-12">
+                <small class="text-muted">
+                    <i class="fas fa-robot"></i> 이 분석은 Gemini AI가 재무제표 데이터를 바탕으로 생성한 것입니다. 
+                    투자 결정시에는 추가적인 정보와 전문가의 조언을 참고하시기 바랍니다.
+                </small>
+            </div>
+        </div>
+    `;
+
+    container.innerHTML = html;
+}
+
+// 숫자 포맷팅
+function formatNumber(num, unit = '') {
+    if (unit === '%') {
+        return num.toFixed(1);
+    }
+    return (num / 10000000000000).toLocaleString(undefined, { maximumFractionDigits: 1 });
+}
@@ -0,0 +1,115 @@
+let searchTimeout;
+// 자동완성 요청 순번: 새 입력이 오면 이전 요청은 취소하고 서버도 처리하지 않음
+const searchClientId = Math.random().toString(36).slice(2) + Date.now().toString(36);
+let searchSeq = 0;
+let searchController = null;
+const searchInput = document.getElementById('companySearch');
+const searchResults = document.getElementById('searchResults');
+const loadingSpinner = document.querySelector('.loading-spinner');
+
+// 회사 검색
+searchInput.addEventListener('input', function() {
+    const query = this.value.trim();
+
+    clearTimeout(searchTimeout);
+
+    if (query.length < 1) {
+        hideSearchResults();
+        return;
+    }
+
+    showLoading();
+
+    searchTimeout = setTimeout(() => {
+        searchCompanies(query);
+    }, 300);
+});
+
+// 검색 실행
+async function searchCompanies(query) {
+    const seq = ++searchSeq;
+    if (searchController) {
+        searchController.abort();
+    }
+    searchController = new AbortController();
+
+    try {
+        const response = await fetch(
+            `/api/search_companies?q=${encodeURIComponent(query)}&client=${searchClientId}&seq=${seq}`,
+            { signal: searchController.signal }
+        );
+        // 204: 서버가 더 새로운 입력을 먼저 받아 처리하지 않은 요청
+        if (response.status === 204 || seq !== searchSeq) {
+            return;
+        }
+        const data = await response.json();
+
+        hideLoading();
+        displaySearchResults(data.companies);
+    } catch (error) {
+        if (error.name === 'AbortError') {
+            return;
+        }
+        console.error('검색 오류:', error);
+        hideLoading();
+        hideSearchResults();
+    }
+}
+
+// 검색 결과 표시
+function displaySearchResults(companies) {
+    if (companies.length === 0) {
+        hideSearchResults();
+        return;
+    }
+
+    const resultsHtml = companies.map(company => `
+        <div class="search-result-item" onclick="goToCompany('${company.corp_code}')">
+            <div class="company-name">${company.corp_name}</div>
+            <div class="company-code">
+                ${company.stock_code ? `<span class="stock-code">${company.stock_code}</span>` : '<span class="text-muted">비상장</span>'}
+                <span class="text-muted">${company.corp_code}</span>
+            </div>
+        </div>
+    `).join('');
+
+    searchResults.innerHTML = resultsHtml;
+    searchResults.style.display = 'block';
+}
+
+// 회사 페이지로 이동
+function goToCompany(corpCode) {
+    window.location.href = `/company/${corpCode}`;
+}
+
+// 검색 결과 숨기기
+function hideSearchResults() {
+    searchResults.style.display = 'none';
+}
+
+// 로딩 표시
+function showLoading() {
+    loadingSpinner.style.display = 'block';
+}
+
+// 로딩 숨기기
+function hideLoading() {
+    loadingSpinner.style.display = 'none';
+}
+
+// 검색 결과 외부 클릭시 숨기기
+document.addEventListener('click', function(event) {
+    if (!event.target.closest('.search-container')) {
+        hideSearchResults();
+    }
+});
+
+// 엔터키로 첫 번째 결과 선택
+searchInput.addEventListener('keydown', function(event) {
+    if (event.key === 'Enter') {
+        const firstResult = searchResults.querySelector('.search-result-item');
+        if (firstResult) {
+            firstResult.click();
+        }
+    }
+});
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+정적 파일 배포 모듈
+static/ 파일마다 내용 해시가 붙은 주소(/assets/js/app.{해시}.js)를 템플릿에 제공하고,
+미리 압축해 둔 .br/.gz 파일을 Accept-Encoding에 맞춰 응답 (해시 주소는 1년 immutable 캐시)
+
+실행 (빌드 단계, 압축할 형식의 파일마다 .gz와 brotli 패키지가 있으면 .br 생성):
+    python static_assets.py [--dir static]
+"""
+import argparse
+import gzip
+import hashlib
+import mimetypes
+import os
+from typing import Dict, List, Optional, Tuple
+
+from fastapi.responses import FileResponse
+
+from compression import accepted_encodings, brotli, is_compressible, weak_etag
+from logging_utils import get_logger
+
+logger = get_logger("static_assets")
+
+# 해시 주소는 내용이 바뀌면 주소도 바뀌므로 1년 immutable, 해시 없는 /static 주소는 하루
+ASSET_CACHE_CONTROL = "public, max-age=31536000, immutable"
+STATIC_CACHE_CONTROL = "public, max-age=86400"
+
+# 미리 압축한 파일 (선호 순서)
+PRECOMPRESSED_VARIANTS = (("br", ".br"), ("gzip", ".gz"))
+
+# 이 크기(바이트) 미만의 파일은 미리 압축하지 않음
+PRECOMPRESS_MIN_SIZE = 256
+
+
+def content_type_of(path: str) -> str:
+    return mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+
+def precompress_file(path: str) -> List[str]:
+    """
+    파일의 .gz(.br) 압축본 생성 (원본보다 새 압축본이 있거나 압축해도 작아지지 않으면 건너뜀)
+
+    Returns:
+        새로 쓴 압축본 경로 목록
+    """
+    if not is_compressible(content_type_of(path)) or os.path.getsize(path) < PRECOMPRESS_MIN_SIZE:
+        return []
+
+    with open(path, "rb") as f:
+        data = f.read()
+    source_mtime = os.path.getmtime(path)
+
+    written = []
+    for encoding, suffix in PRECOMPRESSED_VARIANTS:
+        if encoding == "br" and brotli is None:
+            continue
+        variant = path + suffix
+        if os.path.exists(variant) and os.path.getmtime(variant) >= source_mtime:
+            continue
+        # 빌드마다 같은 결과가 나오도록 gzip 헤더의 시간은 0
+        compressed = brotli.compress(data, quality=11) if encoding == "br" else gzip.compress(data, 9, mtime=0)
+        if len(compressed) >= len(data):
+            continue
+        tmp_path = f"{variant}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(compressed)
+        os.replace(tmp_path, variant)
+        written.append(variant)
+    return written
+
+
+def precompress_directory(directory: str) -> List[str]:
+    """디렉토리 아래 모든 파일의 압축본 생성"""
+    written = []
+    for dirpath, _, filenames in os.walk(directory):
+        for name in filenames:
+            if not name.endswith((".gz", ".br", ".tmp")):
+                written.extend(precompress_file(os.path.join(dirpath, name)))
+    return written
+
+
+def precompressed_response(path: str, accept_encoding: str, headers: Dict[str, str],
+                           media_type: Optional[str] = None) -> FileResponse:
+    """
+    파일 응답 (브라우저가 받을 수 있는 최신 압축본이 있으면 그 파일을 Content-Encoding과 함께 응답)
+
+    Args:
+        path: 원본 파일 경로
+        accept_encoding: 요청의 Accept-Encoding 헤더
+        headers: 추가할 응답 헤더 (Cache-Control, ETag 등)
+        media_type: Content-Type (없으면 확장자로 추정)
+    """
+    media_type = media_type or content_type_of(path)
+    headers = dict(headers)
+    if is_compressible(media_type):
+        headers["Vary"] = "Accept-Encoding"
+
+    encodings = accepted_encodings(accept_encoding)
+    for encoding, suffix in PRECOMPRESSED_VARIANTS:
+        variant = path + suffix
+        if encoding in encodings and os.path.exists(variant) and os.path.getmtime(variant) >= os.path.getmtime(path):
+            headers["Content-Encoding"] = encoding
+            # 인코딩별로 본문이 다르므로 약한 ETag
+            if "ETag" in headers and not headers["ETag"].startswith("W/"):
+                headers["ETag"] = weak_etag(headers["ETag"])
+            return FileResponse(variant, media_type=media_type, headers=headers)
+    return FileResponse(path, media_type=media_type, headers=headers)
+
+
+class StaticAssets:
+    """static/ 파일의 내용 해시 (시작할 때 한 번 계산, 템플릿의 static_url로 사용)"""
+
+    def __init__(self, directory: str = "static"):
+        """
+        Args:
+            directory: 정적 파일 디렉토리
+        """
+        self.directory = directory
+        self.hashes: Dict[str, str] = {}
+        if not os.path.isdir(directory):
+            return
+        for dirpath, _, filenames in os.walk(directory):
+            for name in filenames:
+                if name.endswith((".gz", ".br", ".tmp")):
+                    continue
+                path = os.path.join(dirpath, name)
+                with open(path, "rb") as f:
+                    digest = hashlib.sha256(f.read()).hexdigest()[:12]
+                self.hashes[os.path.relpath(path, directory).replace(os.sep, "/")] = digest
+
+    @property
+    def version(self) -> str:
+        """전체 파일 해시 (정적 페이지가 참조하는 주소가 바뀌었는지 확인용)"""
+        joined = ",".join(f"{path}={digest}" for path, digest in sorted(self.hashes.items()))
+        return hashlib.sha256(joined.encode()).hexdigest()[:16]
+
+    def url(self, path: str) -> str:
+        """
+        정적 파일 주소 (css/app.css → /assets/css/app.{해시}.css, 모르는 파일은 /static 주소)
+        """
+        digest = self.hashes.get(path)
+        if digest is None:
+            return f"/static/{path}"
+        stem, ext = os.path.splitext(path)
+        return f"/assets/{stem}.{digest}{ext}"
+
+    def resolve(self, asset_path: str) -> Optional[Tuple[str, str, bool]]:
+        """
+        해시 주소를 원본 파일로 변환
+
+        Returns:
+            (파일 경로, 현재 내용 해시, 주소의 해시가 현재 내용과 같은지) 또는 None (모르는 파일)
+            배포 직후 이전 페이지가 요청한 옛 해시는 현재 파일을 짧은 캐시로 응답
+        """
+        stem, ext = os.path.splitext(asset_path)
+        stem, _, digest = stem.rpartition(".")
+        path = stem + ext
+        if not stem or path not in self.hashes:
+            return None
+        return os.path.join(self.directory, path), self.hashes[path], digest == self.hashes[path]
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="정적 파일 압축본 생성")
+    parser.add_argument("--dir", default="static", help="정적 파일 디렉토리")
+    args = parser.parse_args(argv)
+
+    written = precompress_directory(args.dir)
+    print(f"✅ 압축본 {len(written)}개 생성 ({'br, gzip' if brotli is not None else 'gzip'})")
+    for path in written:
+        print(f"  - {path} ({os.path.getsize(path):,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+정적 회사 페이지 생성 모듈
+인기 회사와 조회가 많은 회사의 상세 페이지를 첫 화면 데이터(주요 지표, 차트, 재무상태표)까지 채워 HTML로 미리 렌더링
+(요청 시 Jinja 렌더링, DART 조회, API 왕복 없이 파일 그대로 응답)
+
+- 페이지는 내용 해시가 붙은 파일(company/{고유번호}.{해시}.html)로 쓰고 manifest.json을 원자적으로 교체
+- 프록시/CDN이 바로 서빙할 수 있도록 company/{고유번호}.html에도 같은 내용을 원자적으로 교체해 둠
+- 페이지마다 .gz/.br 압축본을 함께 써서 요청 시 압축하지 않음
+- 재무데이터와 템플릿이 그대로면 파일을 다시 쓰지 않음 (내용 해시가 같으면 ETag도 같음)
+- refresh는 마지막 확인 이후 사업보고서(정정 포함)가 공시된 회사만 다시 생성
+
+실행:
+    python static_pages.py build --popular 20 --corp-codes-file top_companies.txt
+    python static_pages.py refresh
+"""
+import argparse
+import contextvars
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import orjson
+from fastapi.staticfiles import StaticFiles
+
+from logging_utils import get_logger
+from static_assets import precompress_file
+
+logger = get_logger("static_pages")
+
+STATIC_PAGES_DIR = os.getenv("STATIC_PAGES_DIR", "static_pages")
+MANIFEST_NAME = "manifest.json"
+PAGE_TEMPLATE = "company_detail.html"
+
+# company_detail.html 조회 설정의 기본값 (페이지를 처음 열 때의 번들 요청과 같아야 인라인 데이터를 사용)
+PAGE_PARAMS = (("start_year", 2020), ("end_year", 2023), ("base_year", 2023), ("report_type", "11011"), ("freq", "A"))
+
+# 정적 페이지 응답 캐시 (고유번호 URL은 짧게 두고 ETag로 재검증, 해시 파일은 바뀌지 않으므로 1년)
+PAGE_CACHE_CONTROL = "public, max-age=300, stale-while-revalidate=86400"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# manifest.json 변경 확인 간격(초)
+MANIFEST_CHECK_SECONDS = 1.0
+
+# 사업보고서 공시 상세유형 (refresh에서 다시 생성할 회사를 찾을 때 사용)
+ANNUAL_REPORT_DETAIL_TYPE = "A001"
+
+
+def page_query() -> str:
+    """정적 페이지가 담는 번들의 조회 조건 (템플릿의 번들 요청 쿼리 문자열과 같은 형식)"""
+    return "&".join(f"{key}={value}" for key, value in PAGE_PARAMS)
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def write_atomic(path: str, data: bytes):
+    """임시 파일에 쓴 뒤 교체하여 읽는 쪽이 쓰다 만 파일을 보지 않도록 저장"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """내용 해시가 붙은 파일 (한 번 쓰면 바뀌지 않으므로 immutable 캐시 헤더 추가)"""
+
+    async def get_response(self, path: str, scope):
+        response = await super().get_response(path, scope)
+        if response.status_code in (200, 304):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
+
+
+class StaticPageStore:
+    """생성된 정적 페이지 목록 (manifest.json, 생성 작업이 교체하면 다시 읽음)"""
+
+    def __init__(self, root: str = STATIC_PAGES_DIR):
+        """
+        Args:
+            root: 정적 페이지 디렉토리 (manifest.json과 company/ 하위 디렉토리)
+        """
+        self.root = root
+        self.manifest_path = os.path.join(root, MANIFEST_NAME)
+        self._pages: Dict[str, Dict[str, Any]] = {}
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _refresh(self):
+        now = time.monotonic()
+        if now - self._checked_at < MANIFEST_CHECK_SECONDS:
+            return
+        with self._lock:
+            if now - self._checked_at < MANIFEST_CHECK_SECONDS:
+                return
+            self._checked_at = now
+            try:
+                mtime = os.stat(self.manifest_path).st_mtime
+            except FileNotFoundError:
+                self._pages, self._mtime = {}, None
+                return
+            if mtime == self._mtime:
+                return
+            try:
+                with open(self.manifest_path, "rb") as f:
+                    self._pages = orjson.loads(f.read()).get("pages", {})
+                self._mtime = mtime
+                logger.info("📄 정적 페이지 목록 로드: %s개", len(self._pages))
+            except (OSError, ValueError) as e:
+                logger.warning("⚠️ 정적 페이지 목록을 읽을 수 없습니다: %s", e)
+
+    def lookup(self, corp_code: str) -> Optional[Dict[str, str]]:
+        """
+        회사의 정적 페이지 조회
+
+        Returns:
+            {"path": 파일 경로, "etag": ETag, "url": 내용 해시 주소(/pages/company/...)} 또는 None
+            (생성되지 않았거나 파일이 없는 경우)
+        """
+        self._refresh()
+        page = self._pages.get(corp_code)
+        if not page:
+            return None
+        path = os.path.join(self.root, "company", page["file"])
+        if not os.path.exists(path):
+            return None
+        return {"path": path, "etag": f'"{page["hash"]}"', "url": f"/pages/company/{page['file']}"}
+
+
+class StaticPageGenerator:
+    """회사 상세 페이지를 데이터와 함께 렌더링해 디렉토리에 기록"""
+
+    def __init__(self, root: str = STATIC_PAGES_DIR):
+        # 웹 앱의 서비스, 템플릿, 번들 섹션 생성 함수를 그대로 사용 (요청 경로와 같은 결과)
+        import app as web_app
+
+        self.web_app = web_app
+        self.root = root
+        self.page_dir = os.path.join(root, "company")
+        os.makedirs(self.page_dir, exist_ok=True)
+        self.manifest_path = os.path.join(root, MANIFEST_NAME)
+        self.manifest = self._load_manifest()
+        self.template_hash = self._template_hash()
+        self._lock = threading.Lock()
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        if not os.path.exists(self.manifest_path):
+            return {"pages": {}}
+        with open(self.manifest_path, "rb") as f:
+            return orjson.loads(f.read())
+
+    def _save_manifest(self):
+        self.manifest["updated_at"] = datetime.now().isoformat(timespec="seconds")
+        write_atomic(self.manifest_path, orjson.dumps(self.manifest, option=orjson.OPT_INDENT_2))
+
+    def _template_hash(self) -> str:
+        """템플릿 파일, 정적 파일 해시 주소, 차트 템플릿 버전 (바뀌면 데이터가 같아도 다시 렌더링)"""
+        with open(os.path.join("templates", PAGE_TEMPLATE), "rb") as f:
+            source = f.read()
+        versions = f"{self.web_app.static_assets.version}:{self.web_app.chart_specs.CHART_TEMPLATE_VERSION}"
+        return content_hash(source + versions.encode())
+
+    def page_sections(self, company) -> Optional[List[List[Any]]]:
+        """
+        페이지 첫 화면의 번들 섹션 (company, metrics, charts, balance_box)
+
+        Returns:
+            [[섹션 이름, 데이터], ...] 또는 None (DART 조회 오류가 있었거나 기준연도 데이터가 없는 경우)
+        """
+        web_app = self.web_app
+        params = dict(PAGE_PARAMS)
+        start_year, end_year, base_year = params["start_year"], params["end_year"], params["base_year"]
+        dart_api = web_app.services.dart_api
+        industry_store = web_app.services.industry_store
+
+        yearly_metrics, complete = web_app.load_yearly_metrics(
+            dart_api, company.corp_code, set(range(start_year, end_year + 1)) | {base_year}
+        )
+        charts, charts_complete = web_app.build_charts_batch(
+            company.corp_code, yearly_metrics, start_year, end_year, base_year, True
+        )
+        if not (complete and charts_complete) or base_year not in yearly_metrics:
+            return None
+
+        metrics = yearly_metrics[base_year]
+        overview = industry_store.get_overview(company.corp_code) if industry_store else None
+        sections = ["metrics", "charts", "balance_box"]
+        return [
+            ["company", web_app.bundle_company_section(company, overview, sections)],
+            ["metrics", {"metrics": metrics, "year": base_year, "report_type": params["report_type"]}],
+            ["charts", charts],
+            ["balance_box", web_app.balance_box_payload(metrics, base_year, True)]
+        ]
+
+    def render(self, company, sections: List[List[Any]]) -> bytes:
+        """데이터를 인라인한 상세 페이지 HTML"""
+        bundle = orjson.dumps({"params": page_query(), "sections": sections},
+                              option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+        # <script> 안에 넣으므로 "</script>"로 끝나지 않도록 <를 이스케이프 (JSON으로는 같은 값)
+        page_bundle = bundle.replace(b"<", b"\\u003c").decode("utf-8")
+        html = self.web_app.templates.get_template(PAGE_TEMPLATE).render(company=company, page_bundle=page_bundle)
+        return html.encode("utf-8")
+
+    def generate(self, corp_code: str, force: bool = False) -> str:
+        """
+        회사 한 곳의 정적 페이지 생성
+
+        Args:
+            corp_code: 고유번호
+            force: 데이터와 템플릿이 그대로여도 다시 기록
+
+        Returns:
+            결과 (written / unchanged / skipped)
+        """
+        company = self.web_app.services.company_db.get_company_by_code(corp_code)
+        if not company:
+            logger.warning("❌ 회사를 찾을 수 없습니다: %s", corp_code)
+            return "skipped"
+
+        sections = self.page_sections(company)
+        checked_at = datetime.now().isoformat(timespec="seconds")
+        if sections is None:
+            logger.warning("⚠️ %s 재무데이터를 모두 조회하지 못해 기존 페이지를 유지합니다", corp_code)
+            return "skipped"
+
+        source_hash = content_hash(orjson.dumps(sections, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+                                   + self.template_hash.encode())
+        with self._lock:
+            previous = self.manifest["pages"].get(corp_code)
+        if previous and previous.get("source_hash") == source_hash and not force:
+            with self._lock:
+                previous["checked_at"] = checked_at
+            return "unchanged"
+
+        html = self.render(company, sections)
+        page_hash = content_hash(html)
+        filename = f"{corp_code}.{page_hash}.html"
+        for name in (filename, f"{corp_code}.html"):
+            write_atomic(os.path.join(self.page_dir, name), html)
+            # 앱과 프록시(gzip_static 등)가 그대로 보낼 수 있는 .gz/.br 압축본
+            precompress_file(os.path.join(self.page_dir, name))
+
+        with self._lock:
+            self.manifest["pages"][corp_code] = {
+                "file": filename,
+                "hash": page_hash,
+                "source_hash": source_hash,
+                "previous_file": previous["file"] if previous and previous["file"] != filename else None,
+                "generated_at": checked_at,
+                "checked_at": checked_at
+            }
+        logger.info("📄 %s 정적 페이지 생성: %s (%.1fKB)", company.corp_name, filename, len(html) / 1024)
+        return "written"
+
+    def generate_many(self, corp_codes: List[str], concurrency: int = 4, force: bool = False) -> Dict[str, int]:
+        """
+        여러 회사의 정적 페이지를 동시에 생성하고 manifest.json 교체 후 이전 버전 파일 정리
+
+        Returns:
+            결과별 회사 수
+        """
+        started = time.perf_counter()
+        counts = {"written": 0, "unchanged": 0, "skipped": 0}
+
+        def generate_one(corp_code: str) -> str:
+            try:
+                return self.generate(corp_code, force)
+            except Exception as e:
+                logger.warning("❌ %s 정적 페이지 생성 실패: %s", corp_code, e)
+                return "skipped"
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [executor.submit(contextvars.copy_context().run, generate_one, corp_code)
+                       for corp_code in dict.fromkeys(corp_codes)]
+            for future in futures:
+                counts[future.result()] += 1
+
+        self.manifest["template_hash"] = self.template_hash
+        self._save_manifest()
+        self.remove_old_files()
+
+        logger.info("✅ 정적 페이지 %s개 생성, %s개 변경 없음, %s개 건너뜀 (%.1f초)",
+                    counts["written"], counts["unchanged"], counts["skipped"], time.perf_counter() - started)
+        return counts
+
+    def remove_old_files(self):
+        """manifest의 현재/직전 파일과 고유번호 파일을 제외한 페이지와 압축본 삭제 (직전 파일은 교체 중인 요청을 위해 유지)"""
+        keep = set()
+        for corp_code, page in self.manifest["pages"].items():
+            keep.update((page["file"], page.get("previous_file"), f"{corp_code}.html"))
+        for name in os.listdir(self.page_dir):
+            page_name = name[:-3] if name.endswith((".gz", ".br")) else name
+            if page_name.endswith(".html") and page_name not in keep:
+                os.remove(os.path.join(self.page_dir, name))
+
+    def changed_companies(self) -> List[str]:
+        """
+        마지막 확인 이후 사업보고서가 공시된 회사 (템플릿이 바뀌었으면 전체)
+
+        Returns:
+            다시 생성할 고유번호 목록
+        """
+        pages = self.manifest["pages"]
+        if self.manifest.get("template_hash") != self.template_hash:
+            logger.info("📄 템플릿이 바뀌어 정적 페이지 %s개를 모두 다시 생성합니다", len(pages))
+            return list(pages)
+
+        dart_api = self.web_app.services.dart_api
+        today = datetime.now().strftime("%Y%m%d")
+        changed = []
+        for corp_code, page in pages.items():
+            # 공시일 단위로 조회하므로 마지막 확인일 하루 전부터 확인
+            since = (datetime.fromisoformat(page["checked_at"]) - timedelta(days=1)).strftime("%Y%m%d")
+            try:
+                result = dart_api.search_disclosure(corp_code=corp_code, bgn_de=since, end_de=today,
+                                                    pblntf_detail_ty=ANNUAL_REPORT_DETAIL_TYPE)
+            except Exception as e:
+                logger.warning("⚠️ %s 공시 조회 실패, 다시 생성합니다: %s", corp_code, e)
+                changed.append(corp_code)
+                continue
+            if result.get("status") == "000" and result.get("list"):
+                changed.append(corp_code)
+            else:
+                page["checked_at"] = datetime.now().isoformat(timespec="seconds")
+        return changed
+
+
+def read_corp_codes_file(path: str) -> List[str]:
+    """한 줄에 고유번호 하나인 파일 (조회 상위 목록 등, #으로 시작하는 줄은 무시)"""
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.split()[0] for line in f if line.strip() and not line.startswith("#")]
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="정적 회사 페이지 생성")
+    parser.add_argument("--out", default=STATIC_PAGES_DIR, help="정적 페이지 디렉토리")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시 생성 회사 수")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build = subparsers.add_parser("build", help="지정한 회사의 정적 페이지 생성")
+    build.add_argument("--popular", type=int, default=20, help="인기 회사 중 앞에서부터 N개")
+    build.add_argument("--corp-codes", nargs="*", default=[], help="생성할 기업 고유번호 목록")
+    build.add_argument("--corp-codes-file", help="생성할 기업 고유번호 파일 (조회 상위 목록 등)")
+    build.add_argument("--force", action="store_true", help="데이터가 그대로여도 다시 생성")
+
+    subparsers.add_parser("refresh", help="사업보고서가 새로 공시된 회사만 다시 생성")
+    args = parser.parse_args(argv)
+
+    generator = StaticPageGenerator(args.out)
+    services = generator.web_app.services
+    services.load_company_data()
+    if services.company_db is None or services.dart_api is None:
+        parser.error("회사 DB 또는 DART API를 초기화할 수 없습니다.")
+
+    if args.command == "build":
+        corp_codes = list(args.corp_codes)
+        if args.corp_codes_file:
+            corp_codes.extend(read_corp_codes_file(args.corp_codes_file))
+        if args.popular:
+            corp_codes.extend(company.corp_code for company in services.company_db.get_popular_companies(args.popular))
+        if not corp_codes:
+            parser.error("--popular, --corp-codes, --corp-codes-file 중 하나를 지정해주세요.")
+        generator.generate_many(corp_codes, args.concurrency, args.force)
+    else:
+        corp_codes = generator.changed_companies()
+        logger.info("📄 다시 생성할 회사: %s개 / %s개", len(corp_codes), len(generator.manifest["pages"]))
+        generator.generate_many(corp_codes, args.concurrency)
+
+
+if __name__ == "__main__":
+    main()